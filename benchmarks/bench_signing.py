@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Signing throughput benchmark for Lighter Exchange batches.
+
+Signs create-order transactions for 1/10/100-order batches inline, in a
+thread pool and in a process pool, using a throwaway API key. Nothing is
+sent to the exchange.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_signing.py [--rounds 5] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import time
+
+import lighter
+
+from lighter_agno.execution.signing_pool import SigningPool
+
+BATCH_SIZES = [1, 10, 100]
+API_KEY_INDEX = 3
+
+
+def _requests(batch_size: int, nonce_start: int):
+    """Build create-order sign requests with explicit nonces."""
+    return [
+        ("sign_create_order", {
+            "market_index": 0,
+            "client_order_index": nonce_start + i,
+            "base_amount": 1000,
+            "price": 300000,
+            "is_ask": i % 2,
+            "order_type": 0,
+            "time_in_force": 1,
+            "nonce": nonce_start + i,
+            "api_key_index": API_KEY_INDEX,
+        })
+        for i in range(batch_size)
+    ]
+
+
+async def _bench(label, sign, batch_size, rounds):
+    """Time `rounds` batches and print orders signed per second."""
+    await sign(_requests(batch_size, 0))  # warm up workers
+    start = time.perf_counter()
+    for r in range(rounds):
+        results = await sign(_requests(batch_size, (r + 1) * batch_size))
+        assert all(err is None for _, _, _, err in results)
+    elapsed = time.perf_counter() - start
+    per_batch_ms = elapsed / rounds * 1e3
+    throughput = batch_size * rounds / elapsed
+    print(f"{label:<8} {batch_size:>6} {per_batch_ms:>12.2f} {throughput:>14.0f}")
+
+
+async def main(rounds: int, workers: int):
+    private_key, _, err = lighter.create_api_key()
+    if err:
+        raise SystemExit(f"Could not generate a throwaway key: {err}")
+    config = {
+        "base_url": "https://testnet.zklighter.elliot.ai",
+        "account_index": 1,
+        "private_keys": {API_KEY_INDEX: private_key},
+    }
+    client = lighter.SignerClient(
+        url=config["base_url"],
+        account_index=config["account_index"],
+        api_private_keys=dict(config["private_keys"]),
+    )
+    thread_pool = SigningPool(config, "thread", workers)
+    process_pool = SigningPool(config, "process", workers)
+
+    async def inline(requests):
+        return [getattr(client, method)(**kwargs) for method, kwargs in requests]
+
+    async def threaded(requests):
+        return await thread_pool.sign(client, requests)
+
+    async def processes(requests):
+        return await process_pool.sign(client, requests)
+
+    print(f"{'mode':<8} {'batch':>6} {'ms/batch':>12} {'orders/sec':>14}")
+    try:
+        for batch_size in BATCH_SIZES:
+            await _bench("inline", inline, batch_size, rounds)
+            await _bench("thread", threaded, batch_size, rounds)
+            await _bench("process", processes, batch_size, rounds)
+    finally:
+        thread_pool.close()
+        process_pool.close()
+        await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.workers))
@@ -2,7 +2,7 @@
 Lighter Exchange Agno Toolkit
 
 A Python toolkit for integrating Lighter Exchange with Agno AI agents.
-Provides 40 tools for trading, account management, and market data.
+Provides 45 tools for trading, account management, and market data.
 """
 
 from lighter_agno.client import LighterClient
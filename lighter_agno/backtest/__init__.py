@@ -0,0 +1,20 @@
+"""
+Offline backtesting for Lighter Exchange.
+
+Replays market data from the local stores through a strategy that trades
+with the same calls as the live order tools.
+"""
+
+from lighter_agno.backtest.engine import (
+    FILL_MODELS,
+    BacktestContext,
+    Backtester,
+)
+from lighter_agno.backtest.strategy import Strategy
+
+__all__ = [
+    "FILL_MODELS",
+    "BacktestContext",
+    "Backtester",
+    "Strategy",
+]
@@ -0,0 +1,590 @@
+"""
+Event-driven backtester over the local market data stores.
+
+Replays stored candles, archived trades and funding through a Strategy
+that trades with the same calls as the live order tools. All data is
+loaded into NumPy matrices on one bar timeline shared by every market, and
+the replay loop runs once per bar timestamp (not per market or trade),
+touching only the orders that are open. That keeps a year of 1m bars across
+many markets in the seconds range.
+
+No order book history is recorded, so fills are modeled from prints:
+    candles: a resting limit order fills when the bar trades through its
+             price, up to a participation share of the bar's volume
+    trades:  the same, counting only the archived trades through the price
+Market orders, and limit orders that are marketable when they arrive, fill
+as taker at the next bar open plus slippage.
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lighter_agno.backtest.strategy import Strategy
+from lighter_agno.constants import (
+    BACKTEST_PARTICIPATION,
+    BACKTEST_SLIPPAGE_BPS,
+    BACKTEST_TIER_FEES,
+    DATA_DIR,
+    RESOLUTION_SECONDS,
+)
+from lighter_agno.data.candles import (
+    CANDLE_COLUMNS,
+    get_candle_store,
+    stored_coverage,
+    subtract_ranges,
+)
+from lighter_agno.data.funding import get_funding_store
+from lighter_agno.data.indicators import SECONDS_PER_YEAR
+from lighter_agno.data.resample import (
+    resample,
+    resolution_origin,
+    resolution_seconds,
+    source_resolutions,
+)
+from lighter_agno.data.trades import TradeArchive
+
+FILL_MODELS = ("candles", "trades")
+
+_BAR_FIELDS = ("o", "h", "l", "c", "v")
+
+# Remaining size below this share of the order counts as filled
+_SIZE_EPSILON = 1e-9
+
+
+def _forward_fill(n: int, indices: List[int], values: List[float], initial: float) -> np.ndarray:
+    """Per-bar series from (bar index, value) changes in bar order; a bar's last change wins."""
+    if not indices:
+        return np.full(n, initial)
+    position = np.searchsorted(np.array(indices), np.arange(n), side="right") - 1
+    series = np.array(values)[np.maximum(position, 0)]
+    series[position < 0] = initial
+    return series
+
+
+class BacktestContext:
+    """
+    What a strategy sees and trades with during a backtest.
+
+    Order calls take the arguments of the live order tools and return the
+    order's client_order_id. Orders placed on a bar can fill from the next
+    bar on, and market data is only exposed up to the current bar.
+    """
+
+    def __init__(self, engine: "Backtester"):
+        self._engine = engine
+        self.index = -1
+
+    # === market data ===
+
+    @property
+    def time(self) -> int:
+        """Open time (ms) of the current bar."""
+        return int(self._engine.t[self.index])
+
+    def close(self, market_index: int) -> float:
+        """Last close of a market (carried over bars it did not trade in)."""
+        engine = self._engine
+        return float(engine.mark[self.index, engine.column(market_index)])
+
+    def history(
+        self, market_index: int, field: str = "c", length: Optional[int] = None
+    ) -> np.ndarray:
+        """Bar field (o, h, l, c, v) of a market up to the current bar, NaN where it had no bar."""
+        engine = self._engine
+        values = engine.data[field][:self.index + 1, engine.column(market_index)]
+        return values if length is None else values[-length:]
+
+    def trades(self, market_index: int) -> Dict[str, np.ndarray]:
+        """Archived trades of a market inside the current bar (trades fill model only)."""
+        engine = self._engine
+        j = engine.column(market_index)
+        columns = engine.trades[j]
+        lo, hi = engine.trade_bounds[j][self.index]
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+    # === account ===
+
+    @property
+    def cash(self) -> float:
+        """Cash balance: starting cash net of traded notional, fees and funding."""
+        return self._engine.cash
+
+    def position(self, market_index: int) -> float:
+        """Signed position size (positive long)."""
+        engine = self._engine
+        return float(engine.positions[engine.column(market_index)])
+
+    def equity(self) -> float:
+        """Cash plus positions marked at the current closes."""
+        engine = self._engine
+        return engine.cash + float(np.dot(engine.positions, np.nan_to_num(engine.mark[self.index])))
+
+    def open_orders(self, market_index: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Resting orders, optionally of one market."""
+        return [
+            dict(order) for order in self._engine.orders.values()
+            if market_index is None or order["market_index"] == market_index
+        ]
+
+    # === orders ===
+
+    def place_limit_order(
+        self,
+        market_index: int,
+        side: str,
+        size: float,
+        price: float,
+        client_order_id: Optional[int] = None,
+        reduce_only: bool = False,
+    ) -> int:
+        """Rest a limit order; returns its client_order_id."""
+        if price <= 0:
+            raise ValueError(f"Invalid price: {price}")
+        return self._engine.submit(
+            market_index, "limit", side, size, price, client_order_id, reduce_only
+        )
+
+    def place_market_order(
+        self,
+        market_index: int,
+        side: str,
+        size: float,
+        max_slippage_price: Optional[float] = None,
+        client_order_id: Optional[int] = None,
+        reduce_only: bool = False,
+    ) -> int:
+        """
+        Send a market order, filled at the next bar open plus slippage;
+        returns its client_order_id. It is canceled instead if that price is
+        worse than `max_slippage_price`.
+        """
+        return self._engine.submit(
+            market_index, "market", side, size, max_slippage_price, client_order_id, reduce_only
+        )
+
+    def cancel_order(self, market_index: int, order_id: int) -> bool:
+        """Cancel an open order by client_order_id; returns whether it was open."""
+        order = self._engine.orders.get(order_id)
+        if order is None or order["market_index"] != market_index:
+            return False
+        del self._engine.orders[order_id]
+        return True
+
+    def cancel_all_orders(self, market_index: Optional[int] = None) -> int:
+        """Cancel all open orders (of one market, if given); returns how many."""
+        orders = self._engine.orders
+        ids = [
+            oid for oid, order in orders.items()
+            if market_index is None or order["market_index"] == market_index
+        ]
+        for oid in ids:
+            del orders[oid]
+        return len(ids)
+
+
+class Backtester:
+    """
+    Replays stored market data of several markets through a Strategy.
+
+    Candles must already be in the candle store (e.g. via backfill_history);
+    a resolution that is not native is resampled from a stored finer one.
+    Funding is charged on the positions held at each stored funding time,
+    priced at that bar's open: positive rates are paid by longs.
+    """
+
+    def __init__(
+        self,
+        market_ids: List[int],
+        start: int,
+        end: int,
+        resolution: str = "1m",
+        tier: str = "standard",
+        initial_cash: float = 10_000.0,
+        fill_model: str = "candles",
+        participation: float = BACKTEST_PARTICIPATION,
+        slippage_bps: float = BACKTEST_SLIPPAGE_BPS,
+        fees: Optional[Tuple[float, float]] = None,
+        root: str = DATA_DIR,
+    ):
+        """
+        Args:
+            market_ids: Markets to replay
+            start: Start timestamp in ms
+            end: End timestamp in ms
+            resolution: Bar resolution, native or resampled (e.g. '1m', '2h')
+            tier: Account tier whose fees apply (standard or premium)
+            initial_cash: Starting collateral in quote currency
+            fill_model: 'candles' or 'trades' (needs archived trades)
+            participation: Share of the volume through a limit price it may fill
+            slippage_bps: Market order slippage beyond the bar open
+            fees: (maker, taker) fee rates overriding the tier's
+            root: Data directory
+
+        Raises:
+            ValueError: If the tier or fill model is unknown
+        """
+        if fees is None:
+            if tier.lower() not in BACKTEST_TIER_FEES:
+                raise ValueError(
+                    f"Unknown account tier: {tier} "
+                    f"(expected one of {', '.join(BACKTEST_TIER_FEES)})"
+                )
+            fees = BACKTEST_TIER_FEES[tier.lower()]
+        if fill_model not in FILL_MODELS:
+            raise ValueError(
+                f"Unknown fill model: {fill_model} (expected one of {', '.join(FILL_MODELS)})"
+            )
+
+        self.market_ids = list(market_ids)
+        self._columns = {market_id: j for j, market_id in enumerate(self.market_ids)}
+        self.resolution = resolution
+        self.step_ms = resolution_seconds(resolution) * 1000
+        origin_ms = resolution_origin(resolution)
+        self.start = (start - origin_ms) // self.step_ms * self.step_ms + origin_ms
+        self.end = end
+        self.tier = tier.lower()
+        self.maker_fee, self.taker_fee = fees
+        self.initial_cash = initial_cash
+        self.fill_model = fill_model
+        self.participation = participation
+        self.slippage = slippage_bps / 10_000
+        self.root = root
+
+        self.t = np.empty(0, np.int64)
+        self.data: Dict[str, Any] = {}
+        self.mark = np.empty((0, len(self.market_ids)))
+        self.funding = np.empty((0, len(self.market_ids)))
+        self.trades: List[Dict[str, np.ndarray]] = []
+        self.trade_bounds: List[np.ndarray] = []
+        self.equity = np.empty(0)
+        self._loaded = False
+        self._reset(Strategy())
+
+    def column(self, market_index: int) -> int:
+        """Data column of a market, as used by the (bars, markets) matrices."""
+        try:
+            return self._columns[market_index]
+        except KeyError:
+            raise ValueError(f"Market {market_index} is not part of this backtest") from None
+
+    # === loading ===
+
+    def _candles(self, market_id: int) -> Dict[str, np.ndarray]:
+        # Only stores that already exist are read; a backtest never creates one
+        if self.resolution in RESOLUTION_SECONDS:
+            sources = [self.resolution]
+        else:
+            sources = source_resolutions(self.resolution)
+            if not sources:
+                raise ValueError(f"No native resolution tiles {self.resolution}")
+        coverage = {r: stored_coverage(market_id, r, self.root) for r in sources}
+        stored = [r for r in sources if coverage[r]]
+        if not stored:
+            return {name: np.empty(0, dtype) for name, dtype in CANDLE_COLUMNS.items()}
+
+        def missing_ms(resolution: str) -> int:
+            gaps = subtract_ranges(coverage[resolution], self.start, self.end)
+            return sum(e - s for s, e in gaps)
+
+        source = min(stored, key=missing_ms)
+        columns = get_candle_store(market_id, source, self.root).read(self.start, self.end)
+        if source == self.resolution:
+            return columns
+        return resample(columns, self.step_ms, resolution_origin(self.resolution))
+
+    def load(self) -> None:
+        """
+        Load candles, funding and (for the trades fill model) trades of every
+        market onto one bar timeline.
+
+        Raises:
+            ValueError: If no candles are stored for the range
+        """
+        candles = [self._candles(market_id) for market_id in self.market_ids]
+        if not any(len(c["t"]) for c in candles):
+            raise ValueError("No stored candles for these markets and range; backfill them first")
+        # Bar times are aligned to the step, so the union is a mask over the grid (no sort needed)
+        first = min(int(c["t"][0]) for c in candles if len(c["t"]))
+        last = max(int(c["t"][-1]) for c in candles if len(c["t"]))
+        present = np.zeros((last - first) // self.step_ms + 1, bool)
+        for c in candles:
+            present[(c["t"] - first) // self.step_ms] = True
+        t = first + np.flatnonzero(present).astype(np.int64) * self.step_ms
+        n, m = len(t), len(self.market_ids)
+
+        data: Dict[str, Any] = {"t": t, "market_ids": self.market_ids}
+        for field in _BAR_FIELDS:
+            data[field] = np.full((n, m), 0.0 if field == "v" else np.nan)
+        for j, columns in enumerate(candles):
+            rows = np.searchsorted(t, columns["t"])
+            for field in _BAR_FIELDS:
+                data[field][rows, j] = columns[field]
+
+        # Close carried forward over bars a market did not trade in
+        has_bar = ~np.isnan(data["c"])
+        last = np.maximum.accumulate(np.where(has_bar, np.arange(n)[:, None], 0), axis=0)
+        mark = data["c"][last, np.arange(m)]
+
+        # Funding charged on the bar its timestamp falls in
+        funding = np.zeros((n, m))
+        store = get_funding_store(self.root)
+        for j, market_id in enumerate(self.market_ids):
+            series = store.series(market_id)
+            series = series[(series["t"] >= t[0]) & (series["t"] < t[-1] + self.step_ms)]
+            rows = np.searchsorted(t, series["t"], side="right") - 1
+            np.add.at(funding[:, j], rows, series["rate"])
+
+        trades, bounds = [], []
+        if self.fill_model == "trades":
+            archive = TradeArchive(self.root)
+            for market_id in self.market_ids:
+                columns = archive.load(market_id, int(t[0]), int(t[-1]) + self.step_ms)
+                order = np.argsort(columns["timestamp"], kind="stable")
+                columns = {name: column[order] for name, column in columns.items()}
+                timestamps = columns["timestamp"]
+                starts = np.searchsorted(timestamps, t)
+                ends = np.searchsorted(timestamps, t + self.step_ms)
+                bounds.append(np.stack((starts, ends), axis=1))
+                trades.append(columns)
+
+        self.t, self.data, self.mark, self.funding = t, data, mark, funding
+        self.trades, self.trade_bounds = trades, bounds
+        self._loaded = True
+
+    # === orders ===
+
+    def submit(
+        self,
+        market_index: int,
+        order_type: str,
+        side: str,
+        size: float,
+        price: Optional[float],
+        client_order_id: Optional[int],
+        reduce_only: bool,
+    ) -> int:
+        """Register an order placed on the current bar; `price` bounds slippage on market orders."""
+        if side not in ("buy", "sell"):
+            raise ValueError(f"Invalid side: {side} (expected 'buy' or 'sell')")
+        if not size > 0:
+            raise ValueError(f"Invalid size: {size}")
+        if client_order_id is None:
+            client_order_id = self._next_id
+        elif client_order_id in self.orders:
+            raise ValueError(f"Order {client_order_id} is already open")
+        self._next_id = max(self._next_id, client_order_id + 1)
+
+        self.orders[client_order_id] = {
+            "client_order_id": client_order_id,
+            "market_index": market_index,
+            "column": self.column(market_index),
+            "type": order_type,
+            "side": side,
+            "sign": 1 if side == "buy" else -1,
+            "size": size,
+            "remaining": size,
+            "price": price,
+            "reduce_only": reduce_only,
+            "placed_at": self._index,
+        }
+        self.order_count += 1
+        return client_order_id
+
+    def _fill(self, order: Dict[str, Any], size: float, price: float, liquidity: str) -> None:
+        j, sign = order["column"], order["sign"]
+        if order["reduce_only"]:
+            # Only what closes the current position, and nothing when there is none
+            size = min(size, max(-sign * self.positions[j], 0.0))
+            if size <= 0:
+                order["remaining"] = 0.0
+                return
+
+        size, price = float(size), float(price)
+        notional = size * price
+        fee = notional * (self.maker_fee if liquidity == "maker" else self.taker_fee)
+        self.cash -= sign * notional + fee
+        self.positions[j] += sign * size
+        self.fees[j] += fee
+        self.volume[j] += notional
+        self.fill_counts[j] += 1
+        order["remaining"] -= size
+
+        i = self._index
+        self._cash_events[0].append(i)
+        self._cash_events[1].append(self.cash)
+        self._position_events[j][0].append(i)
+        self._position_events[j][1].append(float(self.positions[j]))
+
+        fill = {
+            "timestamp": int(self.t[i]),
+            "market_index": order["market_index"],
+            "client_order_id": order["client_order_id"],
+            "side": order["side"],
+            "size": size,
+            "price": price,
+            "fee": fee,
+            "liquidity": liquidity,
+        }
+        self.fills.append(fill)
+        self._strategy.on_fill(self._ctx, fill)
+
+    def _match(self, i: int) -> None:
+        """Fill the open orders placed before bar `i` against it."""
+        data = self.data
+        opens, highs, lows, volumes = data["o"][i], data["h"][i], data["l"][i], data["v"][i]
+        for oid, order in list(self.orders.items()):
+            if order["placed_at"] >= i or oid not in self.orders:
+                continue
+            j, sign, price = order["column"], order["sign"], order["price"]
+            bar_open = opens[j]
+            if math.isnan(bar_open):
+                continue
+
+            if order["type"] == "market":
+                fill_price = bar_open * (1 + sign * self.slippage)
+                if price is None or sign * (price - fill_price) >= 0:
+                    self._fill(order, order["remaining"], fill_price, "taker")
+                order["remaining"] = 0.0
+            elif order["placed_at"] == i - 1 and sign * (price - bar_open) >= 0:
+                # Marketable on arrival: takes liquidity at the open
+                self._fill(order, order["remaining"], bar_open, "taker")
+            elif (lows[j] < price) if sign > 0 else (highs[j] > price):
+                if self.fill_model == "trades":
+                    lo, hi = self.trade_bounds[j][i]
+                    prices = self.trades[j]["price"][lo:hi]
+                    through = prices < price if sign > 0 else prices > price
+                    available = float(self.trades[j]["size"][lo:hi][through].sum())
+                else:
+                    available = volumes[j]
+                size = min(order["remaining"], available * self.participation)
+                if size > 0:
+                    self._fill(order, size, price, "maker")
+
+            done = order["remaining"] <= order["size"] * _SIZE_EPSILON
+            if done and self.orders.get(oid) is order:
+                del self.orders[oid]
+
+    def _pay_funding(self, i: int) -> None:
+        """Charge funding due on bar `i` on the positions held coming into it."""
+        price = self.data["o"][i]
+        price = np.nan_to_num(np.where(np.isnan(price), self.mark[max(i - 1, 0)], price))
+        payments = self.positions * price * self.funding[i]
+        total = float(payments.sum())
+        if total:
+            self.funding_paid += payments
+            self.cash -= total
+            self._cash_events[0].append(i)
+            self._cash_events[1].append(self.cash)
+
+    # === replay ===
+
+    def _reset(self, strategy: Strategy) -> None:
+        m = len(self.market_ids)
+        self._strategy = strategy
+        self._ctx = BacktestContext(self)
+        self._index = -1
+        self._next_id = 1
+        self.cash = self.initial_cash
+        self.positions = np.zeros(m)
+        self.fees = np.zeros(m)
+        self.volume = np.zeros(m)
+        self.funding_paid = np.zeros(m)
+        self.fill_counts = np.zeros(m, np.int64)
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.order_count = 0
+        self.fills: List[Dict[str, Any]] = []
+        self._cash_events: Tuple[List[int], List[float]] = ([], [])
+        self._position_events = [([], []) for _ in range(m)]
+
+    def run(self, strategy: Strategy) -> Dict[str, Any]:
+        """
+        Replay every bar through `strategy`.
+
+        Each bar: funding due on it is charged, open orders placed before it
+        are matched, then strategy.on_bar() sees the closed bar. The equity
+        curve is left in self.equity (aligned with self.t) and the fills in
+        self.fills.
+
+        Returns:
+            Report with PnL, return, max drawdown, Sharpe ratio, fees,
+            funding, traded volume, fills, and per-market totals
+        """
+        if not self._loaded:
+            self.load()
+        started = time.perf_counter()
+        self._reset(strategy)
+        ctx = self._ctx
+
+        strategy.prepare(self.data)
+        strategy.on_start(ctx)
+        funding_rows = self.funding.any(axis=1).tolist()
+        on_bar = strategy.on_bar
+        for i in range(len(self.t)):
+            self._index = ctx.index = i
+            if funding_rows[i]:
+                self._pay_funding(i)
+            if self.orders:
+                self._match(i)
+            on_bar(ctx)
+        strategy.on_end(ctx)
+
+        self.equity = self._equity_curve()
+        report = self._report()
+        report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return report
+
+    def _equity_curve(self) -> np.ndarray:
+        n = len(self.t)
+        equity = _forward_fill(n, *self._cash_events, self.initial_cash)
+        for j, (indices, values) in enumerate(self._position_events):
+            if indices:
+                held = _forward_fill(n, indices, values, 0.0)
+                equity += held * np.nan_to_num(self.mark[:, j])
+        return equity
+
+    def _report(self) -> Dict[str, Any]:
+        equity = self.equity
+        peak = np.maximum.accumulate(equity)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(peak > 0, (peak - equity) / peak, 0.0)
+            returns = np.diff(equity) / equity[:-1]
+        returns = returns[np.isfinite(returns)]
+        std = returns.std() if len(returns) > 1 else 0.0
+        bars_per_year = SECONDS_PER_YEAR * 1000 / self.step_ms
+        sharpe = returns.mean() / std * math.sqrt(bars_per_year) if std > 0 else None
+
+        final = float(equity[-1])
+        return {
+            "markets": self.market_ids,
+            "resolution": self.resolution,
+            "start": int(self.t[0]),
+            "end": int(self.t[-1]) + self.step_ms,
+            "bars": len(self.t),
+            "tier": self.tier,
+            "fill_model": self.fill_model,
+            "initial_equity": self.initial_cash,
+            "final_equity": round(final, 6),
+            "pnl": round(final - self.initial_cash, 6),
+            "return_pct": round((final / self.initial_cash - 1) * 100, 4),
+            "max_drawdown_pct": round(float(drawdown.max()) * 100, 4),
+            "sharpe": round(float(sharpe), 4) if sharpe is not None else None,
+            "fees": round(float(self.fees.sum()), 6),
+            "funding": round(float(self.funding_paid.sum()), 6),
+            "volume": round(float(self.volume.sum()), 6),
+            "orders": self.order_count,
+            "fills": len(self.fills),
+            "open_orders": len(self.orders),
+            "by_market": {
+                market_id: {
+                    "position": float(self.positions[j]),
+                    "fills": int(self.fill_counts[j]),
+                    "volume": round(float(self.volume[j]), 6),
+                    "fees": round(float(self.fees[j]), 6),
+                    "funding": round(float(self.funding_paid[j]), 6),
+                }
+                for j, market_id in enumerate(self.market_ids)
+            },
+        }
@@ -0,0 +1,37 @@
+"""
+Strategy interface for the offline backtester.
+"""
+
+from typing import Any, Dict
+
+
+class Strategy:
+    """
+    Base class for backtest strategies; override the hooks you need.
+
+    prepare() receives the whole loaded data set once, for vectorized
+    precomputation of indicators or signals. The other hooks run in time
+    order and trade through the context, which mirrors the live order tools
+    (place_limit_order, place_market_order, cancel_order).
+    """
+
+    def prepare(self, data: Dict[str, Any]) -> None:
+        """
+        Called once before the replay.
+
+        Args:
+            data: t (bar open times, ms), market_ids, and o/h/l/c/v matrices
+                of shape (bars, markets), NaN where a market has no bar
+        """
+
+    def on_start(self, ctx) -> None:
+        """Called before the first bar."""
+
+    def on_bar(self, ctx) -> None:
+        """Called after each bar (all markets) has closed and its fills are done."""
+
+    def on_fill(self, ctx, fill: Dict[str, Any]) -> None:
+        """Called for every fill, while the bar it happened in is replayed."""
+
+    def on_end(self, ctx) -> None:
+        """Called after the last bar."""
@@ -4,8 +4,9 @@ Lighter Exchange API Client
 Handles all HTTP requests to the Lighter Exchange APIs.
 """
 
+import asyncio
 import httpx
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 from lighter_agno.constants import BASE_URL, EXPLORER_URL, TIMEOUT
 
 
@@ -36,6 +37,8 @@ class LighterClient:
         self.explorer_url = explorer_url
         self.authorization = authorization
         self.timeout = timeout
+        # Async clients are bound to the event loop that created them
+        self._async_clients: Dict[int, httpx.AsyncClient] = {}
 
     def _filter_params(self, params: dict) -> dict:
         """Remove None and empty string values from params."""
@@ -152,6 +155,92 @@ class LighterClient:
 
             return response.json()
 
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the pooled async HTTP client for the running event loop."""
+        key = id(asyncio.get_running_loop())
+        client = self._async_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=self.timeout)
+            self._async_clients[key] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close and drop the pooled async HTTP client of the running event loop."""
+        client = self._async_clients.pop(id(asyncio.get_running_loop()), None)
+        if client is not None:
+            await client.aclose()
+
+    async def async_get(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None
+    ) -> Any:
+        """
+        Make an asynchronous GET request to the main API.
+
+        Connections are pooled per event loop, so concurrent requests issued
+        with asyncio.gather share keep-alive connections.
+
+        Args:
+            endpoint: API endpoint (e.g., "/markets")
+            params: Query parameters
+            headers: Additional headers
+
+        Returns:
+            JSON response data
+        """
+        url = f"{self.base_url}{endpoint}"
+        filtered_params = self._filter_params(params or {})
+        request_headers = self._get_headers(headers)
+
+        response = await self._get_async_client().get(
+            url, params=filtered_params, headers=request_headers
+        )
+
+        if not response.is_success:
+            raise LighterApiError(
+                f"API request failed: {response.status_code} - {response.text}",
+                response.status_code,
+                endpoint
+            )
+
+        return response.json()
+
+    async def async_post(
+        self,
+        endpoint: str,
+        body: dict,
+        headers: Optional[dict] = None
+    ) -> Any:
+        """
+        Make an asynchronous POST request to the main API.
+
+        Args:
+            endpoint: API endpoint
+            body: Request body (JSON)
+            headers: Additional headers
+
+        Returns:
+            JSON response data
+        """
+        url = f"{self.base_url}{endpoint}"
+        request_headers = self._get_headers(headers)
+        request_headers["Content-Type"] = "application/json"
+
+        response = await self._get_async_client().post(
+            url, json=body, headers=request_headers
+        )
+
+        if not response.is_success:
+            raise LighterApiError(
+                f"API request failed: {response.status_code} - {response.text}",
+                response.status_code,
+                endpoint
+            )
+
+        return response.json()
+
     def get_explorer(
         self,
         endpoint: str,
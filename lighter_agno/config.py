@@ -0,0 +1,297 @@
+"""
+Execution configuration for Lighter Exchange.
+
+Loads api_key_config.json (or LIGHTER_* environment variables) once,
+validates it, and hot-reloads the file when its mtime changes. A background
+thread does the polling, so get_config() never touches the filesystem.
+
+The file may configure one account:
+
+    {"baseUrl": "...", "accountIndex": 0, "privateKeys": {"0": "0x..."}}
+
+or several, the first (or "accountIndex", if given) being the default:
+
+    {"baseUrl": "...", "accounts": [
+        {"accountIndex": 1, "privateKeys": {"3": "0x..."}},
+        {"accountIndex": 2, "privateKeys": {"4": "0x..."}, "baseUrl": "..."}
+    ]}
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from lighter_agno.constants import CONFIG_FILE, CONFIG_RELOAD_INTERVAL
+from lighter_agno.metrics import metrics
+
+_PRIVATE_KEY = re.compile(r"^[0-9a-fA-F]{80}$")
+MAX_API_KEY_INDEX = 254
+
+
+class ConfigError(Exception):
+    """Raised when the execution configuration is missing or invalid."""
+
+
+def _parse_account(raw: Dict[str, Any], base_url: Optional[str], version: int) -> Dict[str, Any]:
+    """Validate one account entry and normalize it to the execution config shape."""
+    account_index = raw.get("accountIndex")
+    if not isinstance(account_index, int) or isinstance(account_index, bool) or account_index < 0:
+        raise ConfigError(f"accountIndex must be a non-negative integer, got {account_index!r}")
+
+    base_url = raw.get("baseUrl", base_url)
+    if not isinstance(base_url, str) or not base_url.startswith(("http://", "https://")):
+        raise ConfigError(f"Account {account_index}: baseUrl must be an http(s) URL")
+
+    keys = raw.get("privateKeys")
+    if not isinstance(keys, dict) or not keys:
+        raise ConfigError(f"Account {account_index}: privateKeys must be a non-empty object")
+
+    private_keys = {}
+    for key_index, private_key in keys.items():
+        try:
+            api_key_index = int(key_index)
+        except (TypeError, ValueError):
+            raise ConfigError(
+                f"Account {account_index}: invalid API key index {key_index!r}"
+            ) from None
+        if not 0 <= api_key_index <= MAX_API_KEY_INDEX:
+            raise ConfigError(
+                f"Account {account_index}: API key index {api_key_index} "
+                f"is outside 0-{MAX_API_KEY_INDEX}"
+            )
+        if not isinstance(private_key, str):
+            raise ConfigError(f"Account {account_index}: API key {api_key_index} is not a string")
+        # The SDK strips 0x itself (mutating the dict), so store keys pre-trimmed
+        if private_key.startswith("0x"):
+            private_key = private_key[2:]
+        if not _PRIVATE_KEY.match(private_key):
+            raise ConfigError(
+                f"Account {account_index}: API key {api_key_index} is not a 40-byte hex key"
+            )
+        private_keys[api_key_index] = private_key
+
+    return {
+        "base_url": base_url.rstrip("/"),
+        "account_index": account_index,
+        "private_keys": private_keys,
+        "version": version,
+    }
+
+
+def parse_config(raw: Dict[str, Any], version: int = 0) -> Dict[int, Dict[str, Any]]:
+    """
+    Validate a raw config file and return execution configs by account index.
+
+    The default account comes first.
+
+    Args:
+        raw: Parsed api_key_config.json contents
+        version: Load counter stamped on every account config
+
+    Returns:
+        Dict mapping account index to {"base_url", "account_index",
+        "private_keys", "version"}
+
+    Raises:
+        ConfigError: If the config is malformed or a key is invalid
+    """
+    if not isinstance(raw, dict):
+        raise ConfigError("Config must be a JSON object")
+    base_url = raw.get("baseUrl")
+
+    entries = raw.get("accounts")
+    if entries is None:
+        entries = [raw]
+    elif not isinstance(entries, list) or not entries:
+        raise ConfigError("accounts must be a non-empty list")
+
+    accounts: Dict[int, Dict[str, Any]] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ConfigError("Every accounts entry must be an object")
+        account = _parse_account(entry, base_url, version)
+        if account["account_index"] in accounts:
+            raise ConfigError(f"Account {account['account_index']} is configured twice")
+        accounts[account["account_index"]] = account
+
+    default = raw.get("accountIndex")
+    if default is not None and "accounts" in raw:
+        if default not in accounts:
+            raise ConfigError(f"Default accountIndex {default} is not in accounts")
+        accounts = {default: accounts.pop(default), **accounts}
+    return accounts
+
+
+def _env_config() -> Optional[Dict[str, Any]]:
+    """Build a raw single-account config from LIGHTER_* environment variables."""
+    private_key = os.getenv("LIGHTER_PRIVATE_KEY")
+    if not private_key:
+        return None
+    try:
+        account_index = int(os.getenv("LIGHTER_ACCOUNT_INDEX", 0))
+    except ValueError:
+        raise ConfigError("LIGHTER_ACCOUNT_INDEX must be an integer") from None
+    return {
+        "baseUrl": os.getenv("LIGHTER_BASE_URL", "https://mainnet.zklighter.elliot.ai"),
+        "accountIndex": account_index,
+        "privateKeys": {os.getenv("LIGHTER_API_KEY_INDEX", "0"): private_key},
+    }
+
+
+class ConfigStore:
+    """
+    Validated execution configs, reloaded in the background on file changes.
+
+    An invalid edit never replaces a working config: the previous one stays
+    in use and the error is kept in status().
+    """
+
+    def __init__(self, path: str = CONFIG_FILE, reload_interval: float = CONFIG_RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._accounts: Optional[Dict[int, Dict[str, Any]]] = None
+        self._mtime: Optional[float] = None
+        self._version = 0
+        self._loaded_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            return None
+
+    def reload(self) -> None:
+        """
+        Load the config file (or environment) now.
+
+        Raises:
+            ConfigError: If nothing is configured or the config is invalid
+        """
+        with metrics.span("order.config_load"):
+            mtime = self._file_mtime()
+            if mtime is not None:
+                try:
+                    with open(self.path) as f:
+                        raw = json.load(f)
+                except (OSError, ValueError) as e:
+                    raise ConfigError(f"Could not read {self.path}: {e}") from e
+            else:
+                raw = _env_config()
+                if raw is None:
+                    raise ConfigError(
+                        f"No Lighter configuration: create {self.path} "
+                        "or set LIGHTER_PRIVATE_KEY"
+                    )
+
+            with self._lock:
+                accounts = parse_config(raw, self._version + 1)
+                self._version += 1
+                self._accounts = accounts
+                self._mtime = mtime
+                self._loaded_at = time.time()
+                self._last_error = None
+
+    def _ensure_loaded(self) -> Dict[int, Dict[str, Any]]:
+        accounts = self._accounts
+        if accounts is None:
+            self.reload()
+            self._start_watcher()
+            accounts = self._accounts
+        return accounts
+
+    def _start_watcher(self) -> None:
+        with self._lock:
+            if self._watcher is not None or self.reload_interval <= 0:
+                return
+            self._watcher = threading.Thread(
+                target=self._watch, name="lighter-config-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def _watch(self) -> None:
+        """Reload whenever the file's mtime changes (or it appears / disappears)."""
+        while not self._stop.wait(self.reload_interval):
+            if self._file_mtime() == self._mtime:
+                continue
+            try:
+                self.reload()
+                metrics.incr("config.reloaded")
+            except ConfigError as e:
+                metrics.incr("config.reload_failed")
+                with self._lock:
+                    self._last_error = str(e)
+                    # Don't retry the same broken file every tick
+                    self._mtime = self._file_mtime()
+
+    def get(self, account_index: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get the execution config for an account (default: the default account).
+
+        Raises:
+            ConfigError: If nothing is configured or the account is unknown
+        """
+        accounts = self._ensure_loaded()
+        if account_index is None:
+            return next(iter(accounts.values()))
+        config = accounts.get(account_index)
+        if config is None:
+            raise ConfigError(f"Account {account_index} is not configured")
+        return config
+
+    def accounts(self) -> List[int]:
+        """Configured account indices, default account first."""
+        return list(self._ensure_loaded())
+
+    def status(self) -> Dict[str, Any]:
+        """Where the config came from, when it was loaded and the last reload error."""
+        with self._lock:
+            return {
+                "path": self.path,
+                "source": "file" if self._mtime is not None else "environment",
+                "version": self._version,
+                "loaded_at": self._loaded_at,
+                "accounts": list(self._accounts or {}),
+                "last_error": self._last_error,
+            }
+
+    def close(self) -> None:
+        """Stop the reload watcher."""
+        self._stop.set()
+
+
+_store: Optional[ConfigStore] = None
+_store_lock = threading.Lock()
+
+
+def get_config_store() -> ConfigStore:
+    """Get the process-wide config store."""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ConfigStore()
+    return _store
+
+
+def get_config(account_index: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get the cached execution config for an account.
+
+    Args:
+        account_index: Configured account (default: the default account)
+
+    Returns:
+        Dict with base_url, account_index, private_keys and version
+
+    Raises:
+        ConfigError: If nothing is configured or the account is unknown
+    """
+    return get_config_store().get(account_index)
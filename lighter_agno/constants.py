@@ -2,10 +2,14 @@
 Lighter Exchange API Constants
 """
 
+import os
+
 # API Configuration
 BASE_URL = "https://mainnet.zklighter.elliot.ai/api/v1"
 EXPLORER_URL = "https://explorer.elliot.ai/api"
 TIMEOUT = 30  # seconds
+MAX_TX_BATCH_SIZE = 50  # transactions per /sendTxBatch request
+SIGNING_POOL_MIN_BATCH = 8  # smaller batches are signed inline, not in the pool
 
 # API Key Index Reference
 API_KEY_INDICES = {
@@ -49,3 +53,93 @@ ORDER_STATUSES = ["open", "filled", "cancelled", "all"]
 
 # Order side options
 ORDER_SIDES = ["buy", "sell", "all"]
+
+# Local state (client order index watermarks, journals, caches)
+STATE_DIR = os.getenv("LIGHTER_STATE_DIR", os.path.expanduser("~/.lighter_agno"))
+
+# Client order index allocation
+CLIENT_ORDER_INDEX_BLOCK = 1000        # indices reserved per watermark write
+MAX_CLIENT_ORDER_INDEX = 2**48 - 1     # largest client_order_index accepted by the exchange
+MAX_TRACKED_INTENTS = 100_000          # order intents kept in memory per account
+
+# Cached reference data used by pre-trade validation
+MARKET_CACHE_TTL = 300   # seconds; /orderBookDetails precision and margin fields
+ACCOUNT_CACHE_TTL = 30   # seconds; /account snapshot for reduce-only and leverage checks
+                         # (refreshed by the position watcher and position reads)
+ACCOUNT_RECHECK_AGE = 1  # seconds; account-based rejections on an older snapshot are rechecked
+
+# Execution algorithms (TWAP / iceberg)
+ALGO_DEPTH_LEVELS = 50         # resting orders per side read from /orderBookOrders
+ALGO_DEPTH_TTL = 0.25          # seconds a book snapshot is shared between parent orders
+ALGO_DEPTH_FRACTION = 0.25     # max share of in-limit liquidity taken by one child order
+ALGO_PROGRESS_EVENTS = 100     # progress events kept per parent order
+ALGO_INACTIVE_ORDERS = 100     # recent inactive orders read to reconcile a child's fill
+ALGO_FILL_POLL_INTERVAL = 0.5  # seconds between inactive-order reads for a finished child
+ALGO_FILL_POLL_ATTEMPTS = 10   # reads before a child's fill counts as unknown
+ALGO_FINISHED_PARENTS = 100    # finished parent orders kept for status queries
+
+# Order path tracing: NDJSON file every latency span is appended to (unset = off)
+TRACE_FILE = os.getenv("LIGHTER_TRACE_FILE")
+
+# Execution config (api_key_config.json), reloaded when its mtime changes
+CONFIG_FILE = os.getenv(
+    "LIGHTER_CONFIG_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_key_config.json"),
+)
+CONFIG_RELOAD_INTERVAL = 1.0   # seconds between mtime checks (0 disables hot reload)
+
+# Shared price feed and local stop-loss / take-profit triggers
+PRICE_FEED_INTERVAL = 0.25     # seconds between /orderBookDetails price polls
+TRIGGER_EVENTS = 1000          # fired / cancelled triggers kept for status queries
+
+# Position watcher
+POSITION_WATCH_INTERVAL = 1.0   # seconds between /account refreshes
+POSITION_CHANGE_EVENTS = 1000   # position / balance deltas kept for get_position_changes
+
+# Transaction confirmation tracker
+TX_CONFIRM_INTERVAL = 1.0       # seconds between sweeps over pending transactions
+TX_CONFIRM_RATE = 8.0           # status requests per second across all sweeps
+TX_CONFIRM_TIMEOUT = 120.0      # seconds before an unseen transaction resolves as "timeout"
+TX_CONFIRM_RESULTS = 10_000     # resolved transactions kept for status queries
+TX_STATUS_EXECUTED = 2          # /tx status of a transaction included in a block
+TX_STATUS_FAILED = 3            # /tx status of a transaction that failed execution
+
+# Idempotent submission: journal of submitted transactions by fingerprint
+TX_SUBMIT_TIMEOUT = 3.0         # seconds to wait for /sendTx(Batch) before reconciling
+TX_RECONCILE_ATTEMPTS = 3       # /tx lookups before a timed-out submission counts as lost
+TX_RECONCILE_DELAY = 0.5        # seconds between reconciliation lookups
+TX_JOURNAL_SIZE = 10_000        # submissions kept in memory and in the journal file
+
+# Bulk submission: /sendTxBatch chunks in flight at once (one API key each)
+TX_BATCH_IN_FLIGHT = 4
+
+# Local market data store (candles, trades, funding)
+DATA_DIR = os.getenv("LIGHTER_DATA_DIR", os.path.join(STATE_DIR, "data"))
+RESOLUTION_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "4h": 14400, "1d": 86400}
+CANDLES_PER_REQUEST = 500       # /candles page size (the exchange maximum)
+CANDLE_STORE_INITIAL = 4096     # rows allocated when a candle store is created
+TRADE_TAPE_CAPACITY = 100_000   # trades kept in memory per market
+RECENT_TRADES_LIMIT = 100       # /recentTrades page size (the exchange maximum)
+BAR_HISTORY = 10_000            # finished bars kept per aggregator
+FUNDING_INTERVAL_MS = 3_600_000     # funding is paid hourly
+FUNDING_PERIODS_PER_YEAR = 24 * 365
+FUNDINGS_PER_REQUEST = 500          # /fundings page size
+FUNDING_BACKFILL_HOURS = 24 * 30    # history fetched for a market seen for the first time
+FUNDING_FETCH_WORKERS = 8           # markets backfilled concurrently
+FUNDING_FETCH_RATE = 10.0           # /fundings requests per second across workers
+TRADES_PER_REQUEST = 100            # /trades page size (the exchange maximum)
+
+# Historical backfill orchestrator
+BACKFILL_CONCURRENCY = 8            # chunks fetched at once
+BACKFILL_RATE = 10.0                # requests per second across all chunks
+BACKFILL_TRADE_CHUNK_MS = 3_600_000 # trades are archived in hourly chunks
+BACKFILL_CHECKPOINT = os.path.join(STATE_DIR, "backfill.json")
+BACKFILL_CHECKPOINT_INTERVAL = 2.0  # seconds between checkpoint writes while running
+
+# Offline backtester
+BACKTEST_TIER_FEES = {              # (maker, taker) fee as a fraction of notional, by account tier
+    "standard": (0.0, 0.0),
+    "premium": (0.00002, 0.0002),
+}
+BACKTEST_PARTICIPATION = 0.1        # share of the volume through a resting order it may fill
+BACKTEST_SLIPPAGE_BPS = 2.0         # market orders fill this far beyond the bar open
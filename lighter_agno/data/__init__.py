@@ -0,0 +1,74 @@
+"""
+Local market data for Lighter Exchange.
+
+Stores fetched market history on disk so repeated lookbacks are served
+locally and only missing ranges are requested from the exchange.
+"""
+
+from lighter_agno.data.backfill import (
+    DATASETS,
+    BackfillOrchestrator,
+)
+from lighter_agno.data.bars import (
+    BAR_COLUMNS,
+    BarAggregator,
+    get_bar_aggregator,
+    parse_bar_spec,
+)
+from lighter_agno.data.candles import (
+    CANDLE_COLUMNS,
+    CandleStore,
+    candles_to_dicts,
+    get_candle_store,
+    stored_coverage,
+)
+from lighter_agno.data.funding import (
+    FUNDING_DTYPE,
+    FundingStore,
+    get_funding_store,
+)
+from lighter_agno.data.indicators import (
+    INDICATORS,
+    IndicatorEngine,
+    get_indicator_engine,
+    parse_indicator,
+)
+from lighter_agno.data.resample import (
+    get_resampled_candles,
+    resample,
+    resolution_seconds,
+)
+from lighter_agno.data.trades import (
+    TRADE_COLUMNS,
+    TradeArchive,
+    TradeTape,
+    get_trade_tape,
+)
+
+__all__ = [
+    "DATASETS",
+    "BackfillOrchestrator",
+    "BAR_COLUMNS",
+    "BarAggregator",
+    "get_bar_aggregator",
+    "parse_bar_spec",
+    "CANDLE_COLUMNS",
+    "CandleStore",
+    "candles_to_dicts",
+    "get_candle_store",
+    "stored_coverage",
+    "FUNDING_DTYPE",
+    "FundingStore",
+    "get_funding_store",
+    "INDICATORS",
+    "IndicatorEngine",
+    "get_indicator_engine",
+    "parse_indicator",
+    "get_resampled_candles",
+    "resample",
+    "resolution_seconds",
+    "TRADE_COLUMNS",
+    "TradeArchive",
+    "TradeTape",
+    "get_trade_tape",
+]
@@ -0,0 +1,283 @@
+"""
+Historical backfill orchestrator for Lighter Exchange.
+
+Plans chunked time ranges for every (market, dataset) pair, then fetches
+them with bounded async concurrency under one shared rate limiter. Finished
+chunks are checkpointed, so an interrupted backfill resumes where it
+stopped: funding chunks in a checkpoint file, candle chunks by the candle
+store's covered ranges and trade chunks by their archive files.
+
+Datasets:
+    candles: /candles pages into the candle store (one request per chunk)
+    funding: /fundings pages into the funding store (one request per chunk)
+    trades:  /trades pages (cursor-chained within a chunk) into the trade archive
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from lighter_agno.client import LighterClient
+from lighter_agno.constants import (
+    BACKFILL_CHECKPOINT,
+    BACKFILL_CHECKPOINT_INTERVAL,
+    BACKFILL_CONCURRENCY,
+    BACKFILL_RATE,
+    BACKFILL_TRADE_CHUNK_MS,
+    DATA_DIR,
+    FUNDING_INTERVAL_MS,
+    FUNDINGS_PER_REQUEST,
+    TRADES_PER_REQUEST,
+)
+from lighter_agno.data.candles import get_candle_store
+from lighter_agno.data.funding import get_funding_store, parse_fundings
+from lighter_agno.data.trades import TradeArchive, parse_trades
+from lighter_agno.metrics import metrics
+from lighter_agno.rate_limit import RateLimiter
+
+DATASETS = ("candles", "funding", "trades")
+
+# Errors kept in the report
+_MAX_ERRORS = 20
+
+# Funding pages lie on a fixed grid of this length, so their keys match across runs
+_FUNDING_PAGE_MS = FUNDINGS_PER_REQUEST * FUNDING_INTERVAL_MS
+
+
+def _task_key(task: Dict[str, Any]) -> str:
+    return ":".join(str(task[k]) for k in ("dataset", "market_id", "resolution", "start", "end"))
+
+
+def _on_funding_grid(key: str) -> bool:
+    parts = key.split(":")
+    try:
+        start, end = int(parts[3]), int(parts[4])
+    except (IndexError, ValueError):
+        return False
+    if parts[0] != "funding":
+        return False
+    return start % _FUNDING_PAGE_MS == 0 and end - start == _FUNDING_PAGE_MS
+
+
+class BackfillOrchestrator:
+    """
+    Fetches planned backfill chunks concurrently and records progress.
+
+    A task is a dict with dataset, market_id, resolution (candles only),
+    start and end (ms, half-open). The checkpoint file holds the keys of
+    finished funding tasks whose page had ended when it was fetched.
+    """
+
+    def __init__(
+        self,
+        client: LighterClient,
+        concurrency: int = BACKFILL_CONCURRENCY,
+        rate: float = BACKFILL_RATE,
+        checkpoint_path: str = BACKFILL_CHECKPOINT,
+        root: str = DATA_DIR,
+    ):
+        self.client = client
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate, burst=max(int(rate), 1))
+        self.checkpoint_path = checkpoint_path
+        self.root = root
+        self.archive = TradeArchive(root)
+        self.done = self._load_checkpoint()
+        self._saved_at = time.monotonic()
+
+    # === checkpoint ===
+
+    def _load_checkpoint(self) -> set:
+        try:
+            with open(self.checkpoint_path) as f:
+                keys = json.load(f).get("done", [])
+        except (OSError, ValueError):
+            return set()
+        # Drop keys of pages off the grid (written by older versions); they never match again
+        return {key for key in keys if _on_funding_grid(key)}
+
+    def save_checkpoint(self) -> None:
+        """Write the finished task keys atomically."""
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"done": sorted(self.done)}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+        self._saved_at = time.monotonic()
+
+    # === planning ===
+
+    def plan(
+        self,
+        market_ids: List[int],
+        start: int,
+        end: int,
+        datasets: List[str] = ("candles", "funding"),
+        resolutions: List[str] = ("1m",),
+    ) -> List[Dict[str, Any]]:
+        """
+        Split [start, end) into request-sized chunks for every market and dataset.
+
+        Chunks already finished are left out. Trade chunks are only planned
+        once they have ended, since an archived chunk is never refetched.
+        Funding pages are aligned to a fixed grid, so a page keeps its key
+        from one run to the next.
+
+        Raises:
+            ValueError: If a dataset is unknown
+        """
+        unknown = set(datasets) - set(DATASETS)
+        if unknown:
+            raise ValueError(f"Unknown datasets: {sorted(unknown)}")
+
+        tasks = []
+        for market_id in market_ids:
+            if "candles" in datasets:
+                for resolution in resolutions:
+                    store = get_candle_store(market_id, resolution, self.root)
+                    tasks.extend(
+                        {"dataset": "candles", "market_id": market_id, "resolution": resolution,
+                         "start": page_start, "end": page_end}
+                        for page_start, page_end in store.pages(start, end)
+                    )
+            if "funding" in datasets:
+                first = start // _FUNDING_PAGE_MS * _FUNDING_PAGE_MS
+                tasks.extend(
+                    {"dataset": "funding", "market_id": market_id, "resolution": None,
+                     "start": page_start, "end": page_start + _FUNDING_PAGE_MS}
+                    for page_start in range(first, end, _FUNDING_PAGE_MS)
+                )
+            if "trades" in datasets:
+                first = start // BACKFILL_TRADE_CHUNK_MS * BACKFILL_TRADE_CHUNK_MS
+                last = min(end, int(time.time() * 1000)) - BACKFILL_TRADE_CHUNK_MS
+                tasks.extend(
+                    {"dataset": "trades", "market_id": market_id, "resolution": None,
+                     "start": chunk_start, "end": chunk_start + BACKFILL_TRADE_CHUNK_MS}
+                    for chunk_start in range(first, last + 1, BACKFILL_TRADE_CHUNK_MS)
+                    if not self.archive.has(
+                        market_id, chunk_start, chunk_start + BACKFILL_TRADE_CHUNK_MS
+                    )
+                )
+        return [task for task in tasks if _task_key(task) not in self.done]
+
+    # === fetching ===
+
+    async def _get(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        await self.limiter.acquire()
+        return await self.client.async_get(endpoint, params)
+
+    async def _fetch(self, task: Dict[str, Any]) -> Dict[str, int]:
+        """Fetch and store one chunk; returns its request and row counts."""
+        market_id, start, end = task["market_id"], task["start"], task["end"]
+
+        # Store writes flush and fsync files, so they run off the event loop
+        loop = asyncio.get_running_loop()
+
+        if task["dataset"] == "candles":
+            store = get_candle_store(market_id, task["resolution"], self.root)
+            data = await self._get("/candles", store.page_params(start, end))
+            rows = await loop.run_in_executor(None, store.ingest_page, data, start, end)
+            return {"requests": 1, "rows": rows}
+
+        if task["dataset"] == "funding":
+            store = get_funding_store(self.root)
+            data = await self._get("/fundings", store.page_params(market_id, start, end))
+            rows = parse_fundings(data)
+            rows = rows[(rows["t"] >= start) & (rows["t"] < end)]
+            await loop.run_in_executor(None, store.merge, market_id, rows)
+            return {"requests": 1, "rows": len(rows)}
+
+        # Trades: page forward from the chunk start until past its end
+        pages, requests, cursor = [], 0, None
+        while True:
+            data = await self._get("/trades", {
+                "market_id": market_id,
+                "sort_by": "timestamp",
+                "sort_dir": "asc",
+                "from": start,
+                "limit": TRADES_PER_REQUEST,
+                "cursor": cursor,
+            })
+            requests += 1
+            trades = data.get("trades") or []
+            pages.append(parse_trades(trades))
+            cursor = data.get("next_cursor")
+            if not trades or not cursor or trades[-1]["timestamp"] >= end:
+                break
+        columns = {name: np.concatenate([p[name] for p in pages]) for name in pages[0]}
+        in_chunk = (columns["timestamp"] >= start) & (columns["timestamp"] < end)
+        columns = {name: column[in_chunk] for name, column in columns.items()}
+        await loop.run_in_executor(None, self.archive.save, market_id, start, end, columns)
+        return {"requests": requests, "rows": len(columns["trade_id"])}
+
+    async def run(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Fetch tasks with at most `concurrency` in flight and report throughput.
+
+        Failed tasks are reported and left unfinished, so the next run retries them.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        totals = {"completed": 0, "failed": 0, "requests": 0, "rows": 0}
+        by_dataset: Dict[str, Dict[str, int]] = {}
+        errors: List[Dict[str, Any]] = []
+
+        async def run_task(task: Dict[str, Any]) -> None:
+            async with semaphore:
+                stats = by_dataset.setdefault(
+                    task["dataset"], {"tasks": 0, "failed": 0, "requests": 0, "rows": 0}
+                )
+                try:
+                    result = await self._fetch(task)
+                except Exception as e:
+                    totals["failed"] += 1
+                    stats["failed"] += 1
+                    metrics.incr("backfill.errors")
+                    if len(errors) < _MAX_ERRORS:
+                        errors.append({**task, "error": str(e)})
+                    return
+                totals["completed"] += 1
+                stats["tasks"] += 1
+                for name in ("requests", "rows"):
+                    totals[name] += result[name]
+                    stats[name] += result[name]
+                # A page still open gets new fundings, so it is fetched again next run
+                if task["dataset"] == "funding" and task["end"] <= time.time() * 1000:
+                    self.done.add(_task_key(task))
+                if time.monotonic() - self._saved_at > BACKFILL_CHECKPOINT_INTERVAL:
+                    self.save_checkpoint()
+
+        started = time.perf_counter()
+        try:
+            with metrics.span("backfill.run", tasks=len(tasks)):
+                await asyncio.gather(*(run_task(task) for task in tasks))
+        finally:
+            self.save_checkpoint()
+        elapsed = time.perf_counter() - started
+
+        return {
+            "tasks": len(tasks),
+            **totals,
+            "elapsed_seconds": round(elapsed, 3),
+            "requests_per_second": round(totals["requests"] / elapsed, 2) if elapsed else None,
+            "rows_per_second": round(totals["rows"] / elapsed, 2) if elapsed else None,
+            "by_dataset": by_dataset,
+            "errors": errors,
+        }
+
+    async def backfill(
+        self,
+        market_ids: List[int],
+        start: int,
+        end: Optional[int] = None,
+        datasets: List[str] = ("candles", "funding"),
+        resolutions: List[str] = ("1m",),
+    ) -> Dict[str, Any]:
+        """Plan and run a backfill of [start, end) (end defaults to now)."""
+        if end is None:
+            end = int(time.time() * 1000)
+        tasks = self.plan(market_ids, start, end, datasets, resolutions)
+        return await self.run(tasks)
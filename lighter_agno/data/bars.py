@@ -0,0 +1,260 @@
+"""
+Streaming tick-to-bar aggregation for Lighter Exchange.
+
+Builds bars the exchange does not serve (1s/10s time bars, volume bars,
+notional bars) incrementally from the trades already arriving on the trade
+tape, so they cost no extra API requests. Each aggregator holds only its
+open bar; finished bars go to subscribers and to a fixed-size ring of
+NumPy columns.
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lighter_agno.constants import BAR_HISTORY
+from lighter_agno.data.trades import get_trade_tape
+from lighter_agno.metrics import metrics
+
+BAR_COLUMNS: Dict[str, Any] = {
+    "start": np.int64,          # ms: bucket start (time bars) or first trade
+    "end": np.int64,            # ms: bucket end (time bars) or last trade
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "buy_volume": np.float64,
+    "notional": np.float64,
+    "trades": np.int64,
+    "last_trade_id": np.int64,
+}
+
+BAR_KINDS = ("time", "volume", "notional")
+
+_TIME_UNITS_MS = {"s": 1000, "m": 60_000, "h": 3_600_000}
+
+# Relative tolerance when deciding that a volume / notional bar is full
+_FILL_TOLERANCE = 1e-9
+
+BarCallback = Callable[[Dict[str, Any]], None]
+
+
+def parse_bar_spec(spec: str) -> Tuple[str, float]:
+    """
+    Parse a bar spec into (kind, size).
+
+    '10s', '1m', '1h' are time bars (size in ms); 'volume:5' closes a bar
+    every 5 base units traded; 'notional:100000' every 100k quote traded.
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    match = re.fullmatch(r"(\d+)([smh])", spec)
+    if match is not None:
+        size = int(match.group(1)) * _TIME_UNITS_MS[match.group(2)]
+        kind = "time"
+    else:
+        kind, _, value = spec.partition(":")
+        try:
+            size = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid bar spec: {spec}") from None
+    if kind not in BAR_KINDS or size <= 0:
+        raise ValueError(f"Invalid bar spec: {spec}")
+    return kind, size
+
+
+class BarAggregator:
+    """
+    Aggregates one market's trades into bars of a single spec.
+
+    Time bars close when a trade of a later bucket arrives (or on flush());
+    buckets without trades produce no bar. Volume and notional bars close
+    exactly at their size: a trade that overfills a bar is split, and its
+    remainder opens the next bar, so every split piece counts as a trade.
+    """
+
+    def __init__(self, market_id: int, spec: str, capacity: int = BAR_HISTORY):
+        self.market_id = market_id
+        self.spec = spec
+        self.kind, self.size = parse_bar_spec(spec)
+        self.capacity = capacity
+        self.last_trade_id = -1
+
+        self._bar: Optional[Dict[str, Any]] = None
+        self._columns = {name: np.zeros(capacity, dtype) for name, dtype in BAR_COLUMNS.items()}
+        self._head = 0
+        self.count = 0
+        self._subscribers: List[BarCallback] = []
+        self._lock = threading.Lock()
+
+    # === bar state ===
+
+    def _add(self, timestamp: int, price: float, size: float, side: int, trade_id: int) -> None:
+        bar = self._bar
+        if bar is None:
+            if self.kind == "time":
+                start = timestamp // self.size * self.size
+                end = start + self.size
+            else:
+                start = end = timestamp
+            bar = self._bar = {
+                "start": start, "end": end,
+                "open": price, "high": price, "low": price, "close": price,
+                "volume": 0.0, "buy_volume": 0.0, "notional": 0.0, "trades": 0,
+                "last_trade_id": trade_id,
+            }
+        bar["high"] = max(bar["high"], price)
+        bar["low"] = min(bar["low"], price)
+        bar["close"] = price
+        bar["volume"] += size
+        if side > 0:
+            bar["buy_volume"] += size
+        bar["notional"] += price * size
+        bar["trades"] += 1
+        bar["last_trade_id"] = trade_id
+        if self.kind != "time":
+            bar["end"] = timestamp
+
+    def _close(self) -> Dict[str, Any]:
+        bar, self._bar = self._bar, None
+        position = self._head
+        for name, column in self._columns.items():
+            column[position] = bar[name]
+        self._head = (self._head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        return bar
+
+    def _room(self, price: float) -> float:
+        """Base size the open bar can still take at `price`."""
+        if self._bar is None:
+            filled = 0.0
+        else:
+            filled = self._bar["volume" if self.kind == "volume" else "notional"]
+        room = self.size - filled
+        return room if self.kind == "volume" else room / price
+
+    # === ingestion ===
+
+    def update(self, trades: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """
+        Feed trades (trade tape columns, ordered by trade ID); returns the bars they finished.
+
+        Trades at or below the last seen trade ID are ignored.
+        """
+        finished = []
+        with self._lock:
+            fields = ("trade_id", "timestamp", "price", "size", "side")
+            rows = zip(*(trades[name].tolist() for name in fields))
+            for trade_id, timestamp, price, size, side in rows:
+                if trade_id <= self.last_trade_id:
+                    continue
+                self.last_trade_id = trade_id
+
+                if self.kind == "time":
+                    if self._bar is not None and timestamp >= self._bar["end"]:
+                        finished.append(self._close())
+                    self._add(timestamp, price, size, side, trade_id)
+                    continue
+
+                remaining = size
+                while True:
+                    room = self._room(price)
+                    if remaining <= room * (1 + _FILL_TOLERANCE):
+                        self._add(timestamp, price, remaining, side, trade_id)
+                        if remaining >= room * (1 - _FILL_TOLERANCE):
+                            finished.append(self._close())
+                        break
+                    self._add(timestamp, price, room, side, trade_id)
+                    finished.append(self._close())
+                    remaining -= room
+            subscribers = list(self._subscribers)
+
+        self._publish(finished, subscribers)
+        return finished
+
+    def flush(self, now_ms: int) -> Optional[Dict[str, Any]]:
+        """Close the open time bar if its bucket ended before `now_ms`; returns it."""
+        with self._lock:
+            if self.kind != "time" or self._bar is None or now_ms < self._bar["end"]:
+                return None
+            bar = self._close()
+            subscribers = list(self._subscribers)
+        self._publish([bar], subscribers)
+        return bar
+
+    def _publish(self, bars: List[Dict[str, Any]], subscribers: List[BarCallback]) -> None:
+        if bars:
+            metrics.incr("bars.finished", len(bars))
+        for bar in bars:
+            for callback in subscribers:
+                try:
+                    callback(bar)
+                except Exception:
+                    metrics.incr("bars.callback_errors")
+
+    # === subscribers / queries ===
+
+    def subscribe(self, callback: BarCallback) -> None:
+        """Call `callback` with every finished bar."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: BarCallback) -> None:
+        """Stop delivering finished bars to `callback`."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def columns(self, limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Copies of the last `limit` finished bars (all kept bars by default), oldest first."""
+        with self._lock:
+            n = self.count if limit is None else min(limit, self.count)
+            positions = (self._head - n + np.arange(n)) % self.capacity
+            return {name: column[positions] for name, column in self._columns.items()}
+
+    def bars(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The last `limit` finished bars as dicts, oldest first."""
+        columns = self.columns(limit)
+        return [
+            dict(zip(columns, (value.item() for value in row)))
+            for row in zip(*columns.values())
+        ]
+
+    def open_bar(self) -> Optional[Dict[str, Any]]:
+        """Snapshot of the bar currently being built, if any."""
+        with self._lock:
+            return dict(self._bar) if self._bar is not None else None
+
+
+# Aggregators keyed by (market_id, spec); each is fed by its market's trade tape
+_aggregators: Dict[Tuple[int, str], BarAggregator] = {}
+_aggregators_lock = threading.Lock()
+
+
+def get_bar_aggregator(market_id: int, spec: str) -> BarAggregator:
+    """
+    Get or create the bar aggregator for a market and bar spec.
+
+    A new aggregator is seeded with the trades already on the market's trade
+    tape and then receives every trade the tape appends.
+
+    Args:
+        market_id: Market ID
+        spec: Bar spec, e.g. '1s', '10s', 'volume:5', 'notional:100000'
+
+    Returns:
+        BarAggregator instance
+    """
+    key = (market_id, spec)
+    with _aggregators_lock:
+        aggregator = _aggregators.get(key)
+        if aggregator is None:
+            aggregator = BarAggregator(market_id, spec)
+            get_trade_tape(market_id).subscribe(aggregator.update, replay=True)
+            _aggregators[key] = aggregator
+        return aggregator
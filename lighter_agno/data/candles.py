@@ -0,0 +1,358 @@
+"""
+Local OHLCV store for Lighter Exchange candles.
+
+One store per (market_id, resolution) keeps its candles as NumPy columns
+(one memory-mapped .npy file per field, sorted by timestamp) together with
+the time ranges it already covers. Reads are served from the columns; only
+the gaps between covered ranges are fetched from /candles, so long
+lookbacks become local reads instead of repeated downloads.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from lighter_agno.client import LighterClient
+from lighter_agno.constants import (
+    CANDLE_STORE_INITIAL,
+    CANDLES_PER_REQUEST,
+    DATA_DIR,
+    RESOLUTION_SECONDS,
+)
+
+# Columns and dtypes, named after the /candles wire format
+CANDLE_COLUMNS: Dict[str, Any] = {
+    "t": np.int64,    # open time, ms
+    "o": np.float64,
+    "h": np.float64,
+    "l": np.float64,
+    "c": np.float64,
+    "v": np.float64,  # base volume
+    "V": np.float64,  # quote volume
+    "i": np.int64,    # last trade ID
+}
+
+# Older /candlesticks field names, accepted when parsing responses
+_LEGACY_FIELDS = {
+    "timestamp": "t", "open": "o", "high": "h", "low": "l", "close": "c",
+    "volume0": "v", "volume1": "V", "last_trade_id": "i",
+}
+_WIRE_TO_LEGACY = {wire: legacy for legacy, wire in _LEGACY_FIELDS.items()}
+
+Range = Tuple[int, int]
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """Sort half-open [start, end) ranges and merge overlapping or touching ones."""
+    merged: List[Range] = []
+    for start, end in sorted(r for r in ranges if r[1] > r[0]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(covered: List[Range], start: int, end: int) -> List[Range]:
+    """Return the parts of [start, end) not inside any of the (merged) covered ranges."""
+    gaps, cursor = [], start
+    for c_start, c_end in covered:
+        if c_end <= cursor:
+            continue
+        if c_start >= end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def parse_candles(data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Turn a /candles (or legacy /candlesticks) response into column arrays."""
+    rows = data.get("c")
+    if rows is None:
+        rows = [
+            {_LEGACY_FIELDS.get(k, k): v for k, v in row.items()}
+            for row in data.get("candlesticks") or []
+        ]
+    # The exchange omits zero values
+    return {
+        name: np.fromiter((row.get(name) or 0 for row in rows), dtype=dtype, count=len(rows))
+        for name, dtype in CANDLE_COLUMNS.items()
+    }
+
+
+def _store_path(market_id: int, resolution: str, root: str) -> str:
+    return os.path.join(root, "candles", f"{market_id}_{resolution}")
+
+
+class CandleStore:
+    """
+    Candles of one market and resolution, persisted under `root`.
+
+    Layout: `<root>/candles/<market_id>_<resolution>/` holds one .npy file per
+    column (with spare capacity, doubled as needed) and meta.json, which
+    records the row count and covered ranges. meta.json is rewritten
+    atomically after the columns are flushed, so it is the commit point.
+    """
+
+    def __init__(self, market_id: int, resolution: str, root: str = DATA_DIR):
+        if resolution not in RESOLUTION_SECONDS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        self.market_id = market_id
+        self.resolution = resolution
+        self.step_ms = RESOLUTION_SECONDS[resolution] * 1000
+        self.path = _store_path(market_id, resolution, root)
+
+        self._lock = threading.Lock()
+        self._columns: Dict[str, np.memmap] = {}
+        self.count = 0
+        self.covered: List[Range] = []
+        self._open()
+
+    # === files ===
+
+    def _column_path(self, name: str) -> str:
+        # "v" and "V" would collide on case-insensitive filesystems
+        return os.path.join(self.path, f"{name}{'_' if name.isupper() else ''}.npy")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    @property
+    def capacity(self) -> int:
+        """Rows allocated in the column files."""
+        return len(self._columns["t"])
+
+    def _open(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        try:
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            self._columns = {
+                name: open_memmap(self._column_path(name), mode="r+")
+                for name in CANDLE_COLUMNS
+            }
+            self.count = meta["count"]
+            self.covered = [tuple(r) for r in meta["covered"]]
+        except (OSError, ValueError, KeyError):
+            # New (or unreadable) store: start empty
+            self.count, self.covered = 0, []
+            self._allocate(CANDLE_STORE_INITIAL)
+            self._write_meta()
+
+    def _allocate(self, capacity: int) -> None:
+        """(Re)create every column file with `capacity` rows, keeping existing rows."""
+        columns = {}
+        for name, dtype in CANDLE_COLUMNS.items():
+            path = self._column_path(name)
+            tmp_path = f"{path}.tmp"
+            column = open_memmap(tmp_path, mode="w+", dtype=dtype, shape=(capacity,))
+            if name in self._columns:
+                column[:self.count] = self._columns[name][:self.count]
+            column.flush()
+            os.replace(tmp_path, path)
+            columns[name] = column
+        self._columns = columns
+
+    def _write_meta(self) -> None:
+        tmp_path = f"{self._meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "market_id": self.market_id,
+                "resolution": self.resolution,
+                "count": self.count,
+                "covered": self.covered,
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._meta_path)
+
+    # === ranges ===
+
+    def align(self, start: int, end: int) -> Range:
+        """Widen [start, end) in ms to whole candles."""
+        return (start // self.step_ms * self.step_ms, -(-end // self.step_ms) * self.step_ms)
+
+    def missing(self, start: int, end: int) -> List[Range]:
+        """Candle-aligned sub-ranges of [start, end) the store does not cover yet."""
+        start, end = self.align(start, end)
+        return subtract_ranges(self.covered, start, end)
+
+    # === read / write ===
+
+    def insert(self, rows: Dict[str, np.ndarray], covered: Optional[Range] = None) -> None:
+        """
+        Merge candles into the store (newer values win on equal timestamps)
+        and mark `covered` as fully fetched.
+        """
+        with self._lock:
+            new_t = rows["t"]
+            old_t = self._columns["t"][:self.count]
+            if len(new_t):
+                if self.count == 0 or new_t.min() > old_t[-1]:
+                    # Appending after the last candle: no need to rewrite history
+                    order = np.argsort(new_t, kind="stable")
+                    merged = {name: rows[name][order] for name in CANDLE_COLUMNS}
+                    offset = self.count
+                else:
+                    keep = ~np.isin(old_t, new_t)
+                    merged = {
+                        name: np.concatenate([self._columns[name][:self.count][keep], rows[name]])
+                        for name in CANDLE_COLUMNS
+                    }
+                    order = np.argsort(merged["t"], kind="stable")
+                    merged = {name: column[order] for name, column in merged.items()}
+                    offset = 0
+
+                total = offset + len(merged["t"])
+                if total > self.capacity:
+                    capacity = self.capacity
+                    while capacity < total:
+                        capacity *= 2
+                    self._allocate(capacity)
+                for name, column in self._columns.items():
+                    column[offset:total] = merged[name]
+                    column.flush()
+                self.count = total
+
+            if covered is not None:
+                self.covered = merge_ranges(self.covered + [covered])
+            self._write_meta()
+
+    def read(self, start: int, end: int) -> Dict[str, np.ndarray]:
+        """Return copies of the columns for candles opening in [start, end)."""
+        with self._lock:
+            t = self._columns["t"][:self.count]
+            lo = int(np.searchsorted(t, start, side="left"))
+            hi = int(np.searchsorted(t, end, side="left"))
+            return {name: np.array(column[lo:hi]) for name, column in self._columns.items()}
+
+    def pages(self, start: int, end: int) -> List[Range]:
+        """Missing parts of [start, end) split into /candles page ranges."""
+        page_ms = CANDLES_PER_REQUEST * self.step_ms
+        return [
+            (page_start, min(page_start + page_ms, gap_end))
+            for gap_start, gap_end in self.missing(start, end)
+            for page_start in range(gap_start, gap_end, page_ms)
+        ]
+
+    def page_params(self, page_start: int, page_end: int) -> Dict[str, Any]:
+        """/candles query parameters for one page."""
+        return {
+            "market_id": self.market_id,
+            "resolution": self.resolution,
+            "start_timestamp": page_start,
+            "end_timestamp": page_end,
+            "count_back": CANDLES_PER_REQUEST,
+        }
+
+    def ingest_page(self, data: Dict[str, Any], page_start: int, page_end: int) -> int:
+        """
+        Store one /candles page and mark its range covered; returns the candle count.
+
+        Candles that may still change (the one currently forming) are stored
+        but not marked covered, so they are refetched next time.
+        """
+        closed_until = int(time.time() * 1000) // self.step_ms * self.step_ms
+        rows = parse_candles(data)
+        in_page = (rows["t"] >= page_start) & (rows["t"] < page_end)
+        rows = {name: column[in_page] for name, column in rows.items()}
+        self.insert(rows, (page_start, min(page_end, closed_until)))
+        return len(rows["t"])
+
+    def fill(self, client: LighterClient, start: int, end: int) -> Dict[str, int]:
+        """
+        Fetch only the missing parts of [start, end) from /candles.
+
+        Returns:
+            {"requests": /candles calls made, "fetched": candles received}
+        """
+        requests = fetched = 0
+        for page_start, page_end in self.pages(start, end):
+            data = client.get("/candles", self.page_params(page_start, page_end))
+            fetched += self.ingest_page(data, page_start, page_end)
+            requests += 1
+        return {"requests": requests, "fetched": fetched}
+
+    def get(self, client: LighterClient, start: int, end: int) -> Dict[str, np.ndarray]:
+        """Backfill any gaps in [start, end) and return the candles in it."""
+        self.fill(client, start, end)
+        return self.read(start, end)
+
+    def stats(self) -> Dict[str, Any]:
+        """Row count, capacity and covered ranges of the store."""
+        return {
+            "market_id": self.market_id,
+            "resolution": self.resolution,
+            "candles": self.count,
+            "capacity": self.capacity,
+            "covered": self.covered,
+        }
+
+
+def candles_to_dicts(columns: Dict[str, np.ndarray], legacy: bool = False) -> List[Dict[str, Any]]:
+    """
+    Convert column arrays to a list of candle dicts.
+
+    Keys are the /candles wire names (t, o, h, ...), or with `legacy` the
+    /candlesticks field names (timestamp, open, high, ...).
+    """
+    names = list(columns)
+    keys = [_WIRE_TO_LEGACY.get(name, name) for name in names] if legacy else names
+    return [
+        {key: value.item() for key, value in zip(keys, row)}
+        for row in zip(*(columns[name] for name in names))
+    ]
+
+
+# Stores keyed by (root, market_id, resolution); each is shared by all threads
+_stores: Dict[Tuple[str, int, str], CandleStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_candle_store(market_id: int, resolution: str, root: str = DATA_DIR) -> CandleStore:
+    """
+    Get or open the candle store for a market and resolution.
+
+    Args:
+        market_id: Market ID
+        resolution: Candle resolution (1m, 5m, 15m, 1h, 4h, 1d)
+        root: Data directory
+
+    Returns:
+        CandleStore instance
+    """
+    key = (root, market_id, resolution)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = CandleStore(market_id, resolution, root)
+            _stores[key] = store
+        return store
+
+
+def stored_coverage(market_id: int, resolution: str, root: str = DATA_DIR) -> List[Range]:
+    """
+    Covered ranges of a candle store, without opening or creating it.
+
+    Lets callers compare sources cheaply; a store that does not exist yet
+    covers nothing.
+    """
+    with _stores_lock:
+        store = _stores.get((root, market_id, resolution))
+    if store is not None:
+        return store.covered
+    try:
+        with open(os.path.join(_store_path(market_id, resolution, root), "meta.json")) as f:
+            return [tuple(r) for r in json.load(f)["covered"]]
+    except (OSError, ValueError, KeyError):
+        return []
@@ -0,0 +1,225 @@
+"""
+Funding rate history store for Lighter Exchange.
+
+Keeps each perp market's hourly funding as a sorted (timestamp, rate) NumPy
+array on disk. Backfills and incremental updates for all markets run
+concurrently under a shared rate limit, and scan() ranks every market by
+current, average, annualized and cumulative funding in a single vectorized
+pass instead of one /funding call per market.
+"""
+
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import numpy as np
+
+from lighter_agno.client import LighterClient
+from lighter_agno.constants import (
+    DATA_DIR,
+    FUNDING_BACKFILL_HOURS,
+    FUNDING_FETCH_RATE,
+    FUNDING_FETCH_WORKERS,
+    FUNDING_INTERVAL_MS,
+    FUNDING_PERIODS_PER_YEAR,
+    FUNDINGS_PER_REQUEST,
+)
+from lighter_agno.metrics import metrics
+from lighter_agno.rate_limit import RateLimiter
+
+# Signed rate: positive when longs pay shorts
+FUNDING_DTYPE = np.dtype([("t", np.int64), ("rate", np.float64)])
+
+
+def parse_fundings(data: Dict[str, Any]) -> np.ndarray:
+    """Turn a /fundings response into a FUNDING_DTYPE array sorted by time."""
+    fundings = data.get("fundings") or []
+    rows = np.empty(len(fundings), FUNDING_DTYPE)
+    for i, funding in enumerate(fundings):
+        t = int(funding["timestamp"])
+        rate = float(funding["rate"])
+        if funding.get("direction") == "short":
+            rate = -rate
+        # Timestamps may come in seconds; the store uses ms like the candle store
+        rows[i] = (t * 1000 if t < 10**11 else t, rate)
+    return np.sort(rows, order="t")
+
+
+class FundingStore:
+    """
+    Funding histories of all markets, persisted as one .npy file per market
+    under `<root>/funding/`.
+    """
+
+    def __init__(self, root: str = DATA_DIR, rate: float = FUNDING_FETCH_RATE):
+        self.path = os.path.join(root, "funding")
+        os.makedirs(self.path, exist_ok=True)
+        self.limiter = RateLimiter(rate, burst=max(int(rate), 1))
+        self._series: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _file(self, market_id: int) -> str:
+        return os.path.join(self.path, f"{market_id}.npy")
+
+    def series(self, market_id: int) -> np.ndarray:
+        """Stored funding of a market (FUNDING_DTYPE, sorted by time)."""
+        with self._lock:
+            series = self._series.get(market_id)
+            if series is None:
+                try:
+                    series = np.load(self._file(market_id))
+                except (OSError, ValueError):
+                    series = np.empty(0, FUNDING_DTYPE)
+                self._series[market_id] = series
+            return series
+
+    def merge(self, market_id: int, rows: np.ndarray) -> int:
+        """Merge rows into a market's history (newer values win); returns how many were new."""
+        if not len(rows):
+            return 0
+        with self._write_lock:
+            old = self.series(market_id)
+            combined = np.concatenate((old, rows))
+            # Unique timestamps, keeping the last occurrence (rows come after old)
+            _, first = np.unique(combined["t"][::-1], return_index=True)
+            merged = combined[len(combined) - 1 - first]
+
+            buffer = io.BytesIO()
+            np.save(buffer, merged)
+            tmp_path = f"{self._file(market_id)}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(buffer.getvalue())
+            os.replace(tmp_path, self._file(market_id))
+            with self._lock:
+                self._series[market_id] = merged
+            return len(merged) - len(old)
+
+    @staticmethod
+    def page_params(market_id: int, page_start: int, page_end: int) -> Dict[str, Any]:
+        """/fundings query parameters for one page."""
+        return {
+            "market_id": market_id,
+            "resolution": "1h",
+            "start_timestamp": page_start,
+            "end_timestamp": page_end,
+            "count_back": FUNDINGS_PER_REQUEST,
+        }
+
+    # === fetching ===
+
+    def update(self, client: LighterClient, market_id: int) -> int:
+        """
+        Fetch funding newer than what is stored (or FUNDING_BACKFILL_HOURS of
+        history for a new market); returns how many rows were added.
+        """
+        now = int(time.time() * 1000)
+        series = self.series(market_id)
+        if len(series):
+            start = int(series["t"][-1]) + 1
+            if now < start - 1 + FUNDING_INTERVAL_MS:
+                return 0  # next funding not due yet
+        else:
+            start = now - FUNDING_BACKFILL_HOURS * FUNDING_INTERVAL_MS
+
+        page_ms = FUNDINGS_PER_REQUEST * FUNDING_INTERVAL_MS
+        pages = []
+        for page_start in range(start, now, page_ms):
+            self.limiter.acquire_sync()
+            data = client.get(
+                "/fundings", self.page_params(market_id, page_start, min(page_start + page_ms, now))
+            )
+            pages.append(parse_fundings(data))
+        return self.merge(market_id, np.concatenate(pages)) if pages else 0
+
+    def update_all(
+        self,
+        client: LighterClient,
+        market_ids: List[int],
+        workers: int = FUNDING_FETCH_WORKERS,
+    ) -> Dict[int, Any]:
+        """
+        Update many markets concurrently (bounded by `workers` and the rate limit).
+
+        Returns:
+            Rows added per market, or the error message for markets that failed
+        """
+        def run(market_id: int) -> Any:
+            try:
+                return self.update(client, market_id)
+            except Exception as e:
+                metrics.incr("funding.errors")
+                return str(e)
+
+        if not market_ids:
+            return {}
+        span = metrics.span("funding.update_all", markets=len(market_ids))
+        with span, ThreadPoolExecutor(max_workers=min(workers, len(market_ids))) as pool:
+            return dict(zip(market_ids, pool.map(run, market_ids)))
+
+    # === scanning ===
+
+    def scan(self, market_ids: List[int], since: int) -> Dict[str, np.ndarray]:
+        """
+        Funding statistics of every market with data since `since` (ms).
+
+        All markets' windows are concatenated and reduced per segment, so
+        the cost is one pass over the rows regardless of market count.
+
+        Returns:
+            Columns market_id, samples, current, average, annualized,
+            cumulative and last_timestamp (one entry per market with data)
+        """
+        windows = []
+        for market_id in market_ids:
+            series = self.series(market_id)
+            window = series[np.searchsorted(series["t"], since, side="left"):]
+            if len(window):
+                windows.append((market_id, window))
+        if not windows:
+            empty_f, empty_i = np.empty(0), np.empty(0, np.int64)
+            return {
+                "market_id": empty_i, "samples": empty_i, "current": empty_f, "average": empty_f,
+                "annualized": empty_f, "cumulative": empty_f, "last_timestamp": empty_i,
+            }
+
+        lengths = np.array([len(w) for _, w in windows])
+        rows = np.concatenate([w for _, w in windows])
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        ends = starts + lengths - 1
+        cumulative = np.add.reduceat(rows["rate"], starts)
+        average = cumulative / lengths
+        return {
+            "market_id": np.array([m for m, _ in windows]),
+            "samples": lengths,
+            "current": rows["rate"][ends],
+            "average": average,
+            "annualized": average * FUNDING_PERIODS_PER_YEAR,
+            "cumulative": cumulative,
+            "last_timestamp": rows["t"][ends],
+        }
+
+
+_stores: Dict[str, FundingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_funding_store(root: str = DATA_DIR) -> FundingStore:
+    """
+    Get or create the funding store for a data directory.
+
+    Args:
+        root: Data directory
+
+    Returns:
+        FundingStore instance
+    """
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = FundingStore(root)
+            _stores[root] = store
+        return store
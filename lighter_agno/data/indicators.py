@@ -0,0 +1,279 @@
+"""
+Technical indicators over stored candles for Lighter Exchange.
+
+Window indicators (SMA, Bollinger bands, VWAP, volatility) are computed
+with vectorized NumPy over the candle columns. Recursive indicators (EMA,
+and Wilder-smoothed RSI and ATR) keep their series and smoothing state per
+market and resolution, so each call only advances them over the bars closed
+since the previous one; the forming bar is evaluated on top of that state
+without being committed.
+"""
+
+import math
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Indicator name -> default parameters
+INDICATORS: Dict[str, Tuple[float, ...]] = {
+    "sma": (20,),
+    "ema": (20,),
+    "rsi": (14,),
+    "atr": (14,),
+    "bb": (20, 2.0),    # period, standard deviations
+    "vwap": (20,),      # period in bars
+    "vol": (20,),       # period in bars, annualized stdev of log returns
+}
+
+# Closed bars kept per recursive indicator series
+_SERIES_LIMIT = 10_000
+
+SECONDS_PER_YEAR = 365 * 86400
+
+
+def parse_indicator(spec: str) -> Tuple[str, Tuple[float, ...]]:
+    """
+    Parse 'name[:param[:param]]' (e.g. 'ema:50', 'bb:20:2') into (name, params).
+
+    Raises:
+        ValueError: If the indicator is unknown or its parameters are invalid
+    """
+    name, *values = spec.split(":")
+    if name not in INDICATORS:
+        raise ValueError(f"Unknown indicator: {name} (expected one of {', '.join(INDICATORS)})")
+    defaults = INDICATORS[name]
+    if len(values) > len(defaults):
+        raise ValueError(f"Too many parameters for {name}: {spec}")
+    try:
+        params = tuple(float(v) for v in values) + defaults[len(values):]
+    except ValueError:
+        raise ValueError(f"Invalid indicator parameters: {spec}") from None
+    if params[0] < 1 or params[0] != int(params[0]):
+        raise ValueError(f"Period must be a positive integer: {spec}")
+    return name, (int(params[0]),) + params[1:]
+
+
+# === window indicators ===
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average (NaN until `period` values are available)."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        out[period - 1:] = (sums[period:] - sums[:-period]) / period
+    return out
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """Population standard deviation over a sliding window."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1:] = sliding_window_view(values, period).std(axis=1)
+    return out
+
+
+def bollinger(close: np.ndarray, period: int, width: float) -> Dict[str, np.ndarray]:
+    """Bollinger bands: middle SMA, upper/lower at `width` standard deviations."""
+    middle = sma(close, period)
+    deviation = rolling_std(close, period) * width
+    return {"middle": middle, "upper": middle + deviation, "lower": middle - deviation}
+
+
+def vwap(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, period: int
+) -> np.ndarray:
+    """Rolling VWAP of the typical price over `period` bars."""
+    typical = (high + low + close) / 3
+    quote = sma(typical * volume, period)
+    base = sma(volume, period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(base > 0, quote / base, np.nan)
+
+
+def volatility(close: np.ndarray, period: int, bars_per_year: float) -> np.ndarray:
+    """Annualized rolling volatility of log returns."""
+    out = np.full(len(close), np.nan)
+    if len(close) > period:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.diff(np.log(close))
+        windows = sliding_window_view(returns, period)
+        out[period:] = windows.std(axis=1, ddof=1) * math.sqrt(bars_per_year)
+    return out
+
+
+# === recursive indicators ===
+
+def _smooth(values: np.ndarray, period: int, alpha: float, state: Optional[Dict[str, float]]):
+    """
+    Exponential smoothing seeded with the SMA of the first `period` values.
+
+    Returns (smoothed values, state after the last value); passing the state
+    back continues the series exactly.
+    """
+    state = dict(state or {"seen": 0, "sum": 0.0, "value": math.nan})
+    seen, total, value = state["seen"], state["sum"], state["value"]
+    out = np.empty(len(values))
+    for i, x in enumerate(values.tolist()):
+        seen += 1
+        if seen < period:
+            total += x
+        elif seen == period:
+            value = (total + x) / period
+        else:
+            value += alpha * (x - value)
+        out[i] = value
+    return out, {"seen": seen, "sum": total, "value": value}
+
+
+def _ema_run(columns: Dict[str, np.ndarray], params: Tuple, state: Optional[Dict]):
+    period = params[0]
+    out, smooth = _smooth(columns["c"], period, 2 / (period + 1), (state or {}).get("ema"))
+    return out, {"ema": smooth}
+
+
+def _changes(close: np.ndarray, state: Optional[Dict]) -> np.ndarray:
+    """Close-to-close changes, continuing from the previous close in `state`."""
+    previous = (state or {}).get("close")
+    if previous is None:
+        return np.diff(close)
+    return np.diff(np.concatenate(([previous], close)))
+
+
+def _rsi_run(columns: Dict[str, np.ndarray], params: Tuple, state: Optional[Dict]):
+    period = params[0]
+    close = columns["c"]
+    state = state or {}
+    changes = _changes(close, state)
+    gains, gain_state = _smooth(np.maximum(changes, 0), period, 1 / period, state.get("gain"))
+    losses, loss_state = _smooth(np.maximum(-changes, 0), period, 1 / period, state.get("loss"))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = np.where(
+            losses > 0, 100 - 100 / (1 + gains / losses), np.where(gains > 0, 100.0, 50.0)
+        )
+    rsi[np.isnan(gains)] = np.nan
+    # The very first bar has no change
+    out = np.concatenate(([np.nan], rsi)) if len(rsi) < len(close) else rsi
+    last_close = float(close[-1]) if len(close) else state.get("close")
+    return out, {"gain": gain_state, "loss": loss_state, "close": last_close}
+
+
+def _atr_run(columns: Dict[str, np.ndarray], params: Tuple, state: Optional[Dict]):
+    period = params[0]
+    high, low, close = columns["h"], columns["l"], columns["c"]
+    state = state or {}
+    previous = state.get("close")
+    prev_close = np.concatenate(([previous if previous is not None else np.nan], close[:-1]))
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    out, smooth = _smooth(true_range, period, 1 / period, state.get("atr"))
+    last_close = float(close[-1]) if len(close) else previous
+    return out, {"atr": smooth, "close": last_close}
+
+
+_RECURSIVE = {"ema": _ema_run, "rsi": _rsi_run, "atr": _atr_run}
+
+
+class IndicatorEngine:
+    """
+    Indicator computation for one market and resolution.
+
+    Recursive indicators cache their closed-bar series and state; when the
+    next call's candles extend the cached series, only the new bars are run.
+    """
+
+    def __init__(self, step_ms: int):
+        self.step_ms = step_ms
+        self._series: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _recursive(
+        self, key: str, name: str, params: Tuple, columns: Dict[str, np.ndarray], closed: int
+    ) -> np.ndarray:
+        run = _RECURSIVE[name]
+        t = columns["t"]
+        cached = self._series.get(key)
+        resume = None
+        if cached is not None and len(cached["t"]) and closed:
+            last = cached["t"][-1]
+            i = int(np.searchsorted(t, last))
+            # Resume only if the cached series covers the start of these candles
+            # and ends on one of them
+            if cached["t"][0] <= t[0] and i < len(t) and t[i] == last and i < closed:
+                resume = i + 1
+
+        if resume is None:
+            out, state = run({k: v[:closed] for k, v in columns.items()}, params, None)
+            series_t = t[:closed]
+        else:
+            window = {k: v[resume:closed] for k, v in columns.items()}
+            new, state = run(window, params, cached["state"])
+            out = np.concatenate((cached["out"], new))
+            series_t = np.concatenate((cached["t"], t[resume:closed]))
+        self._series[key] = {
+            "t": series_t[-_SERIES_LIMIT:], "out": out[-_SERIES_LIMIT:], "state": state,
+        }
+
+        # Forming bars are evaluated on top of the closed state but not committed
+        forming, _ = run({k: v[closed:] for k, v in columns.items()}, params, state)
+        full = np.concatenate((out, forming))
+        return full[np.searchsorted(np.concatenate((series_t, t[closed:])), t)]
+
+    def compute(
+        self, columns: Dict[str, np.ndarray], specs: List[str], now_ms: int
+    ) -> Dict[str, Any]:
+        """
+        Compute indicators over time-sorted candle columns.
+
+        Args:
+            columns: Candle columns (t, o, h, l, c, v, V, i)
+            specs: Indicator specs such as 'sma:20', 'rsi', 'bb:20:2'
+            now_ms: Current time; candles not closed by then count as forming
+
+        Returns:
+            Spec -> array aligned with the candles (dict of arrays for bb)
+        """
+        parsed = [(spec, *parse_indicator(spec)) for spec in specs]
+        closed = int(np.searchsorted(columns["t"], now_ms - self.step_ms, side="right"))
+        close = columns["c"]
+        results: Dict[str, Any] = {}
+        with self._lock:
+            for spec, name, params in parsed:
+                if name in _RECURSIVE:
+                    key = f"{name}:{':'.join(str(p) for p in params)}"
+                    results[spec] = self._recursive(key, name, params, columns, closed)
+                elif name == "sma":
+                    results[spec] = sma(close, params[0])
+                elif name == "bb":
+                    results[spec] = bollinger(close, params[0], params[1])
+                elif name == "vwap":
+                    results[spec] = vwap(columns["h"], columns["l"], close, columns["v"], params[0])
+                elif name == "vol":
+                    bars_per_year = SECONDS_PER_YEAR * 1000 / self.step_ms
+                    results[spec] = volatility(close, params[0], bars_per_year)
+        return results
+
+
+_engines: Dict[Tuple[int, str], IndicatorEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_indicator_engine(market_id: int, resolution: str, step_ms: int) -> IndicatorEngine:
+    """
+    Get or create the indicator engine for a market and resolution.
+
+    Args:
+        market_id: Market ID
+        resolution: Candle resolution
+        step_ms: Candle width in ms
+
+    Returns:
+        IndicatorEngine instance
+    """
+    key = (market_id, resolution)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = IndicatorEngine(step_ms)
+            _engines[key] = engine
+        return engine
@@ -0,0 +1,149 @@
+"""
+Candle resampling for Lighter Exchange.
+
+Derives any coarser resolution (native or not, e.g. 2h or 3d) from stored
+finer candles with vectorized NumPy reductions, so one backfill feeds every
+timeframe without further API calls.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from lighter_agno.client import LighterClient
+from lighter_agno.constants import CANDLES_PER_REQUEST, DATA_DIR, RESOLUTION_SECONDS
+from lighter_agno.data.candles import get_candle_store, stored_coverage, subtract_ranges
+
+_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+# Epoch time is a Thursday; weekly candles open on Monday 00:00 UTC
+WEEK_ORIGIN_MS = 4 * 86400 * 1000
+
+
+def resolution_seconds(resolution: str) -> int:
+    """
+    Parse a resolution such as '1m', '2h', '3d' or '1w' into seconds.
+
+    Raises:
+        ValueError: If the resolution is malformed
+    """
+    match = re.fullmatch(r"(\d+)([mhdw])", resolution)
+    if match is None or int(match.group(1)) <= 0:
+        raise ValueError(f"Invalid resolution: {resolution}")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+def resolution_origin(resolution: str) -> int:
+    """Bucket origin in ms for a resolution (weeks start on Monday)."""
+    return WEEK_ORIGIN_MS if resolution.endswith("w") else 0
+
+
+def resample(
+    columns: Dict[str, np.ndarray], step_ms: int, origin_ms: int = 0
+) -> Dict[str, np.ndarray]:
+    """
+    Aggregate time-sorted candles into buckets of `step_ms`.
+
+    Open is the first open, high/low the max/min, close and last trade ID
+    come from the last candle, volumes are summed. Buckets without any
+    source candle are omitted, as the exchange does.
+
+    Args:
+        columns: Candle columns (see CANDLE_COLUMNS), sorted by "t"
+        step_ms: Target bucket width in ms (a multiple of the source step)
+        origin_ms: Timestamp buckets are aligned to
+
+    Returns:
+        Resampled candle columns
+    """
+    t = columns["t"]
+    if len(t) == 0:
+        return {name: np.array(column[:0]) for name, column in columns.items()}
+
+    buckets = (t - origin_ms) // step_ms * step_ms + origin_ms
+    first = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    last = np.concatenate((first[1:], [len(t)])) - 1
+    return {
+        "t": buckets[first],
+        "o": columns["o"][first],
+        "h": np.maximum.reduceat(columns["h"], first),
+        "l": np.minimum.reduceat(columns["l"], first),
+        "c": columns["c"][last],
+        "v": np.add.reduceat(columns["v"], first),
+        "V": np.add.reduceat(columns["V"], first),
+        "i": columns["i"][last],
+    }
+
+
+def source_resolutions(resolution: str) -> List[str]:
+    """Native resolutions that tile `resolution` exactly, coarsest first."""
+    seconds = resolution_seconds(resolution)
+    origin_s = resolution_origin(resolution) // 1000
+    return sorted(
+        (native for native, native_s in RESOLUTION_SECONDS.items()
+         if seconds % native_s == 0 and origin_s % native_s == 0),
+        key=RESOLUTION_SECONDS.get,
+        reverse=True,
+    )
+
+
+def _fetch_cost(
+    market_id: int, resolution: str, start: int, end: int, root: str
+) -> Tuple[int, int]:
+    """(ms not yet stored, /candles pages needed) for serving [start, end) from `resolution`."""
+    step_ms = RESOLUTION_SECONDS[resolution] * 1000
+    page_ms = CANDLES_PER_REQUEST * step_ms
+    # Read from meta.json, so comparing sources does not create their stores
+    gaps = subtract_ranges(
+        stored_coverage(market_id, resolution, root),
+        start // step_ms * step_ms,
+        -(-end // step_ms) * step_ms,
+    )
+    return (
+        sum(e - s for s, e in gaps),
+        sum(-(-(e - s) // page_ms) for s, e in gaps),
+    )
+
+
+def get_resampled_candles(
+    client: LighterClient,
+    market_id: int,
+    resolution: str,
+    start: int,
+    end: int,
+    root: str = DATA_DIR,
+) -> Dict[str, np.ndarray]:
+    """
+    Candles of any resolution for [start, end), built from stored native candles.
+
+    The source is the native resolution that needs the least fetching for
+    the range (so an existing 1m backfill is reused), falling back to the
+    coarsest one that tiles the target.
+
+    Args:
+        client: Client used to backfill gaps in the source store
+        market_id: Market ID
+        resolution: Target resolution, e.g. '2h', '3d', '1w'
+        start: Start timestamp in ms
+        end: End timestamp in ms
+
+    Returns:
+        Resampled candle columns for buckets opening in [start, end)
+
+    Raises:
+        ValueError: If no native resolution tiles the target
+    """
+    step_ms = resolution_seconds(resolution) * 1000
+    origin_ms = resolution_origin(resolution)
+    start = (start - origin_ms) // step_ms * step_ms + origin_ms
+    end = -(-(end - origin_ms) // step_ms) * step_ms + origin_ms
+
+    candidates = source_resolutions(resolution)
+    if not candidates:
+        raise ValueError(f"No native resolution tiles {resolution}")
+    source = min(candidates, key=lambda r: _fetch_cost(market_id, r, start, end, root))
+    columns = get_candle_store(market_id, source, root).get(client, start, end)
+    if source == resolution:
+        return columns
+    return resample(columns, step_ms, origin_ms)
@@ -0,0 +1,344 @@
+"""
+Trade tape and trade archive for Lighter Exchange.
+
+Keeps the latest trades of each market in a fixed-capacity ring buffer of
+NumPy columns (trade ID, timestamp, price, size, taker side). Trades arrive
+in time order, so the two physical segments of the ring are each sorted by
+timestamp and a time window is found with two binary searches. VWAP,
+volume and trade counts over any window are then computed from memory
+without another API call. Backfilled history is kept on disk in the trade
+archive instead.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lighter_agno.client import LighterClient
+from lighter_agno.constants import DATA_DIR, RECENT_TRADES_LIMIT, TRADE_TAPE_CAPACITY
+from lighter_agno.metrics import metrics
+
+# Column name -> dtype; side is the taker side (1 = buy, -1 = sell)
+TRADE_COLUMNS: Dict[str, Any] = {
+    "trade_id": np.int64,
+    "timestamp": np.int64,  # ms
+    "price": np.float64,
+    "size": np.float64,
+    "side": np.int8,
+}
+
+TRADE_DTYPE = np.dtype(list(TRADE_COLUMNS.items()))
+
+TradeListener = Callable[[Dict[str, np.ndarray]], None]
+
+
+def parse_trades(trades: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Turn /recentTrades or /trades entries into column arrays."""
+    return {
+        "trade_id": np.fromiter((t["trade_id"] for t in trades), np.int64, len(trades)),
+        "timestamp": np.fromiter((t["timestamp"] for t in trades), np.int64, len(trades)),
+        "price": np.fromiter((float(t["price"]) for t in trades), np.float64, len(trades)),
+        "size": np.fromiter((float(t["size"]) for t in trades), np.float64, len(trades)),
+        # A maker ask means the taker bought
+        "side": np.fromiter(
+            (1 if t.get("is_maker_ask") else -1 for t in trades), np.int8, len(trades)
+        ),
+    }
+
+
+class TradeTape:
+    """
+    Ring buffer of one market's most recent trades.
+
+    Trades are deduplicated by trade ID (only IDs above the last stored one
+    are appended), so overlapping polls and a push feed can be mixed freely.
+    """
+
+    def __init__(self, market_id: int, capacity: int = TRADE_TAPE_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.market_id = market_id
+        self.capacity = capacity
+        self._columns = {name: np.zeros(capacity, dtype) for name, dtype in TRADE_COLUMNS.items()}
+        self._head = 0  # next write position
+        self.count = 0
+        self.last_trade_id = -1
+        self._lock = threading.Lock()
+        self._listeners: List[TradeListener] = []
+        # (newest timestamp before, oldest timestamp after) of polls that may have missed trades
+        self._gaps: List[Tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        """Number of trades on the tape."""
+        return self.count
+
+    # === ingestion ===
+
+    def append(self, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Append trades given as column arrays; returns how many were new.
+
+        Trades are ordered by trade ID and those already on the tape dropped;
+        listeners receive exactly the new trades, in that order.
+        """
+        with self._lock:
+            ids = columns["trade_id"]
+            order = np.argsort(ids, kind="stable")
+            ids = ids[order]
+            new = ids > self.last_trade_id
+            if len(ids):
+                # Repeated IDs within one batch: keep the last occurrence
+                new &= np.concatenate((ids[1:] != ids[:-1], [True]))
+            order = order[new]
+            n = len(order)
+            if n == 0:
+                return 0
+            added = {name: columns[name][order] for name in TRADE_COLUMNS}
+
+            written = min(n, self.capacity)
+            positions = (self._head + np.arange(written)) % self.capacity
+            for name, column in self._columns.items():
+                column[positions] = added[name][-written:]
+            self._head = (self._head + written) % self.capacity
+            self.count = min(self.count + written, self.capacity)
+            self.last_trade_id = int(added["trade_id"][-1])
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(added)
+            except Exception:
+                metrics.incr("trade_tape.listener_errors")
+        return n
+
+    def subscribe(self, listener: TradeListener, replay: bool = False) -> None:
+        """
+        Call `listener` with the column arrays of every batch of new trades.
+
+        With replay, the listener first receives every trade already on the
+        tape, atomically with subscribing, so no trade is missed or repeated.
+        """
+        with self._lock:
+            if listener in self._listeners:
+                return
+            self._listeners.append(listener)
+            if replay and self.count:
+                listener(self._copy(self._segments()))
+
+    def unsubscribe(self, listener: TradeListener) -> None:
+        """Stop delivering new trades to `listener`."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def add_trades(self, trades: List[Dict[str, Any]]) -> int:
+        """Append trades in API format (e.g. from a push feed); returns how many were new."""
+        return self.append(parse_trades(trades))
+
+    def _add_page(self, trades: List[Dict[str, Any]], limit: int) -> int:
+        previous = self.span()
+        columns = parse_trades(trades)
+        added = self.append(columns)
+        # A full page of only new trades means some may have been missed between polls
+        if previous is not None and added == len(trades) == limit:
+            metrics.incr("trade_tape.gaps")
+            with self._lock:
+                self._gaps.append((previous[1], int(columns["timestamp"].min())))
+        return added
+
+    def poll(self, client: LighterClient, limit: int = RECENT_TRADES_LIMIT) -> int:
+        """Fetch /recentTrades once and append what is new; returns how many were new."""
+        data = client.get("/recentTrades", {"market_id": self.market_id, "limit": limit})
+        return self._add_page(data.get("trades") or [], limit)
+
+    async def async_poll(self, client: LighterClient, limit: int = RECENT_TRADES_LIMIT) -> int:
+        """Async variant of poll() for the execution loop."""
+        params = {"market_id": self.market_id, "limit": limit}
+        data = await client.async_get("/recentTrades", params)
+        return self._add_page(data.get("trades") or [], limit)
+
+    # === queries ===
+
+    def _segments(self) -> List[Tuple[int, int]]:
+        """Physical [lo, hi) index ranges of the tape, oldest first."""
+        if self.count < self.capacity:
+            return [(0, self.count)]
+        return [(self._head, self.capacity), (0, self._head)]
+
+    def _window(self, start: int, end: int) -> List[slice]:
+        """Slices of trades with start <= timestamp < end (two binary searches per segment)."""
+        timestamps = self._columns["timestamp"]
+        slices = []
+        for lo, hi in self._segments():
+            segment = timestamps[lo:hi]
+            i = lo + int(np.searchsorted(segment, start, side="left"))
+            j = lo + int(np.searchsorted(segment, end, side="left"))
+            if j > i:
+                slices.append(slice(i, j))
+        return slices
+
+    def _copy(self, ranges: List[Tuple[int, int]]) -> Dict[str, np.ndarray]:
+        return {
+            name: (
+                np.concatenate([column[lo:hi] for lo, hi in ranges]) if ranges
+                else column[:0].copy()
+            )
+            for name, column in self._columns.items()
+        }
+
+    def window(self, start: int, end: int) -> Dict[str, np.ndarray]:
+        """Return copies of the trade columns for start <= timestamp < end."""
+        with self._lock:
+            return self._copy([(s.start, s.stop) for s in self._window(start, end)])
+
+    def stats(self, start: int, end: int) -> Dict[str, Any]:
+        """
+        VWAP, volume and trade counts for start <= timestamp < end.
+
+        Returns:
+            Dict with trades, buys, sells, volume, buy_volume, sell_volume,
+            notional, vwap, first/last/high/low price and the window bounds
+        """
+        with self._lock:
+            slices = self._window(start, end)
+            price, size, side = self._columns["price"], self._columns["size"], self._columns["side"]
+            trades = buys = 0
+            volume = buy_volume = notional = 0.0
+            high, low = -np.inf, np.inf
+            for s in slices:
+                p, q, buy = price[s], size[s], side[s] > 0
+                trades += len(p)
+                buys += int(np.count_nonzero(buy))
+                volume += float(q.sum())
+                buy_volume += float(q[buy].sum())
+                notional += float(p @ q)
+                high = max(high, float(p.max()))
+                low = min(low, float(p.min()))
+            first = float(price[slices[0].start]) if slices else None
+            last = float(price[slices[-1].stop - 1]) if slices else None
+
+        return {
+            "market_id": self.market_id,
+            "start": start,
+            "end": end,
+            "trades": trades,
+            "buys": buys,
+            "sells": trades - buys,
+            "volume": volume,
+            "buy_volume": buy_volume,
+            "sell_volume": volume - buy_volume,
+            "notional": notional,
+            "vwap": notional / volume if volume else None,
+            "first_price": first,
+            "last_price": last,
+            "high": high if trades else None,
+            "low": low if trades else None,
+        }
+
+    def gaps(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Holes between polls that overlap start <= timestamp < end.
+
+        Each gap is (newest timestamp before, oldest timestamp after); trades
+        strictly between the two may be missing from the tape.
+        """
+        with self._lock:
+            if self.count:
+                # Gaps older than the tape's oldest trade no longer matter
+                oldest = int(self._columns["timestamp"][self._segments()[0][0]])
+                self._gaps = [gap for gap in self._gaps if gap[1] > oldest]
+            return [gap for gap in self._gaps if gap[0] < end and gap[1] > start]
+
+    def covers(self, start: int, end: int) -> bool:
+        """Whether the tape holds every trade with start <= timestamp < end."""
+        span = self.span()
+        return span is not None and span[0] <= start and not self.gaps(start, end)
+
+    def span(self) -> Optional[Tuple[int, int]]:
+        """(oldest, newest) timestamp on the tape, or None if empty."""
+        with self._lock:
+            segments = self._segments()
+            if not self.count:
+                return None
+            timestamps = self._columns["timestamp"]
+            last = timestamps[(self._head - 1) % self.capacity]
+            return int(timestamps[segments[0][0]]), int(last)
+
+
+# Tapes keyed by market ID; each is shared by all threads
+_tapes: Dict[int, TradeTape] = {}
+_tapes_lock = threading.Lock()
+
+
+def get_trade_tape(market_id: int) -> TradeTape:
+    """
+    Get or create the trade tape for a market.
+
+    Args:
+        market_id: Market ID
+
+    Returns:
+        TradeTape instance
+    """
+    with _tapes_lock:
+        tape = _tapes.get(market_id)
+        if tape is None:
+            tape = TradeTape(market_id)
+            _tapes[market_id] = tape
+        return tape
+
+
+class TradeArchive:
+    """
+    Historical trades on disk, one .npy file per market and backfilled time
+    chunk under `<root>/trades/<market_id>/`. A chunk file is only written
+    once the whole chunk has been fetched, so its presence marks it done.
+    """
+
+    def __init__(self, root: str = DATA_DIR):
+        self.path = os.path.join(root, "trades")
+
+    def _dir(self, market_id: int) -> str:
+        return os.path.join(self.path, str(market_id))
+
+    def chunk_path(self, market_id: int, start: int, end: int) -> str:
+        """File holding the trades of one market in [start, end)."""
+        return os.path.join(self._dir(market_id), f"{start}_{end}.npy")
+
+    def has(self, market_id: int, start: int, end: int) -> bool:
+        """Whether [start, end) has been archived for the market."""
+        return os.path.exists(self.chunk_path(market_id, start, end))
+
+    def save(self, market_id: int, start: int, end: int, columns: Dict[str, np.ndarray]) -> None:
+        """Write one fully fetched chunk (atomically)."""
+        rows = np.empty(len(columns["trade_id"]), TRADE_DTYPE)
+        for name in TRADE_COLUMNS:
+            rows[name] = columns[name]
+        os.makedirs(self._dir(market_id), exist_ok=True)
+        path = self.chunk_path(market_id, start, end)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, rows)
+        os.replace(tmp_path, path)
+
+    def load(self, market_id: int, start: int, end: int) -> Dict[str, np.ndarray]:
+        """Archived trades of a market with start <= timestamp < end, ordered by trade ID."""
+        chunks = []
+        try:
+            names = os.listdir(self._dir(market_id))
+        except OSError:
+            names = []
+        for name in names:
+            if not name.endswith(".npy"):
+                continue
+            chunk_start, chunk_end = (int(x) for x in name[:-4].split("_"))
+            if chunk_start < end and chunk_end > start:
+                chunks.append(np.load(os.path.join(self._dir(market_id), name)))
+
+        rows = np.concatenate(chunks) if chunks else np.empty(0, TRADE_DTYPE)
+        rows = rows[(rows["timestamp"] >= start) & (rows["timestamp"] < end)]
+        _, first = np.unique(rows["trade_id"], return_index=True)
+        rows = rows[first]
+        return {name: rows[name] for name in TRADE_COLUMNS}
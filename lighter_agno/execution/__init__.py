@@ -0,0 +1,91 @@
+"""
+Execution infrastructure for Lighter Exchange.
+
+Shared machinery used by the order execution and position management tools.
+"""
+
+from lighter_agno.execution.confirmations import (
+    TxConfirmationTracker,
+    get_confirmation_tracker,
+)
+from lighter_agno.execution.fanout import (
+    build_allocations,
+    fan_out_order,
+)
+from lighter_agno.execution.order_index import (
+    ClientOrderIndexAllocator,
+    get_allocator,
+    link_orders,
+)
+from lighter_agno.execution.position_watcher import (
+    PositionWatcher,
+    get_position_watcher,
+)
+from lighter_agno.execution.price_feed import (
+    PriceFeed,
+    get_price_feed,
+)
+from lighter_agno.execution.scheduler import (
+    ExecutionScheduler,
+    ParentOrder,
+    get_scheduler,
+)
+from lighter_agno.execution.signer import (
+    get_signer,
+    run_sync,
+    send_signed,
+    send_signed_batch,
+    send_signed_bulk,
+)
+from lighter_agno.execution.signing_pool import (
+    SigningPool,
+    disable_signing_pool,
+    enable_signing_pool,
+    get_signing_pool,
+)
+from lighter_agno.execution.triggers import (
+    Trigger,
+    TriggerEngine,
+    get_trigger_engine,
+)
+from lighter_agno.execution.validation import (
+    OrderValidationError,
+    check_account,
+    check_market,
+    check_order,
+    validate_order,
+)
+
+__all__ = [
+    "ClientOrderIndexAllocator",
+    "get_allocator",
+    "link_orders",
+    "get_signer",
+    "run_sync",
+    "send_signed",
+    "send_signed_batch",
+    "send_signed_bulk",
+    "SigningPool",
+    "enable_signing_pool",
+    "disable_signing_pool",
+    "get_signing_pool",
+    "OrderValidationError",
+    "check_account",
+    "check_market",
+    "check_order",
+    "validate_order",
+    "ExecutionScheduler",
+    "ParentOrder",
+    "get_scheduler",
+    "PositionWatcher",
+    "get_position_watcher",
+    "PriceFeed",
+    "get_price_feed",
+    "Trigger",
+    "TriggerEngine",
+    "get_trigger_engine",
+    "build_allocations",
+    "fan_out_order",
+    "TxConfirmationTracker",
+    "get_confirmation_tracker",
+]
@@ -0,0 +1,290 @@
+"""
+Transaction confirmation tracker for Lighter Exchange.
+
+Collects submitted tx hashes and resolves them in periodic sweeps instead of
+one poll loop per transaction. Each sweep first reads the account's most
+recent transactions in one /accountTxs request (which settles most hashes at
+once), then looks up the remaining hashes individually via /tx, oldest check
+first, under a shared rate limit. Resolution completes an asyncio future and
+runs any callbacks registered for the hash.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from lighter_agno.client import LighterApiError, LighterClient
+from lighter_agno.constants import (
+    TX_CONFIRM_INTERVAL,
+    TX_CONFIRM_RATE,
+    TX_CONFIRM_RESULTS,
+    TX_CONFIRM_TIMEOUT,
+    TX_STATUS_EXECUTED,
+    TX_STATUS_FAILED,
+)
+from lighter_agno.execution.signer import get_signer
+from lighter_agno.metrics import metrics
+from lighter_agno.rate_limit import RateLimiter
+
+# Transactions returned per /accountTxs page (the exchange maximum)
+_RECENT_TXS = 100
+_AUTH_TOKEN_TTL = 300
+
+Callback = Callable[[Dict[str, Any]], None]
+
+
+def _final_status(tx: Dict[str, Any]) -> Optional[str]:
+    """Return 'executed' or 'failed' for a settled transaction, None while pending."""
+    if tx.get("code") not in (None, 200) or tx.get("status") == TX_STATUS_FAILED:
+        return "failed"
+    if tx.get("status") == TX_STATUS_EXECUTED:
+        return "executed"
+    return None
+
+
+class _Pending:
+    """One transaction waiting for confirmation."""
+
+    __slots__ = ("tx_hash", "future", "callbacks", "tracked_at")
+
+    def __init__(self, tx_hash: str, future: asyncio.Future):
+        self.tx_hash = tx_hash
+        self.future = future
+        self.callbacks: List[Callback] = []
+        self.tracked_at = time.monotonic()
+
+
+class TxConfirmationTracker:
+    """
+    Tracks pending transactions of one account until they settle or time out.
+
+    Results are {"tx_hash", "status": "executed" | "failed" | "timeout",
+    "tx_status", "code", "message", "block_height", "confirm_ms"}.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        client: Optional[LighterClient] = None,
+        interval: float = TX_CONFIRM_INTERVAL,
+        rate: float = TX_CONFIRM_RATE,
+        timeout: float = TX_CONFIRM_TIMEOUT,
+        max_results: int = TX_CONFIRM_RESULTS
+    ):
+        self.config = config
+        self.account_index = config["account_index"]
+        self.client = client or LighterClient(base_url=f"{config['base_url']}/api/v1")
+        self.interval = interval
+        self.timeout = timeout
+        self.max_results = max_results
+        self.limiter = RateLimiter(rate, burst=max(int(rate), 1))
+
+        # Oldest-checked first: lookups move a hash to the end
+        self._pending: "OrderedDict[str, _Pending]" = OrderedDict()
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._auth: Tuple[float, Optional[str]] = (0.0, None)
+        self._task: Optional[asyncio.Task] = None
+
+    # === resolution ===
+
+    def _resolve(self, tx_hash: str, status: str, tx: Optional[Dict[str, Any]] = None) -> None:
+        pending = self._pending.pop(tx_hash, None)
+        if pending is None:
+            return
+        tx = tx or {}
+        result = {
+            "tx_hash": tx_hash,
+            "status": status,
+            "tx_status": tx.get("status"),
+            "code": tx.get("code"),
+            "message": tx.get("message"),
+            "block_height": tx.get("block_height"),
+            "confirm_ms": round((time.monotonic() - pending.tracked_at) * 1e3, 2),
+        }
+        self._results[tx_hash] = result
+        if len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+        metrics.incr(f"tx_confirm.{status}")
+        metrics.observe("tx_confirm.latency", result["confirm_ms"] / 1e3)
+
+        if not pending.future.done():
+            pending.future.set_result(result)
+        for callback in pending.callbacks:
+            try:
+                callback(result)
+            except Exception:
+                metrics.incr("tx_confirm.callback_errors")
+
+    # === sweeps ===
+
+    async def _auth_token(self) -> str:
+        issued_at, token = self._auth
+        if token is None or time.monotonic() - issued_at > _AUTH_TOKEN_TTL:
+            signer = await get_signer(self.config)
+            token, err = signer.create_auth_token_with_expiry()
+            if err:
+                raise Exception(f"Auth token error: {err}")
+            self._auth = (time.monotonic(), token)
+        return token
+
+    async def _sweep_recent(self) -> None:
+        """Settle every pending hash that appears in the account's latest transactions."""
+        await self.limiter.acquire()
+        data = await self.client.async_get("/accountTxs", {
+            "by": "account_index",
+            "value": str(self.account_index),
+            "limit": _RECENT_TXS,
+        }, headers={"authorization": await self._auth_token()})
+        for tx in data.get("txs") or []:
+            if tx.get("hash") in self._pending:
+                status = _final_status(tx)
+                if status is not None:
+                    self._resolve(tx["hash"], status, tx)
+
+    async def _lookup(self, tx_hash: str) -> None:
+        await self.limiter.acquire()
+        if tx_hash not in self._pending:
+            return
+        try:
+            tx = await self.client.async_get("/tx", {"by": "hash", "value": tx_hash})
+        except LighterApiError:
+            # Not indexed yet
+            return
+        status = _final_status(tx)
+        if status is not None:
+            self._resolve(tx_hash, status, tx)
+
+    async def sweep(self) -> None:
+        """Run one sweep: recent-page match, per-hash lookups, then timeouts."""
+        with metrics.span("tx_confirm.sweep", pending=len(self._pending)):
+            try:
+                await self._sweep_recent()
+            except Exception:
+                metrics.incr("tx_confirm.errors")
+
+            # Look up at most what the rate budget allows per interval, oldest check first
+            budget = max(int(self.limiter.rate * self.interval), 1)
+            batch = list(itertools.islice(self._pending, budget))
+            for tx_hash in batch:
+                self._pending.move_to_end(tx_hash)
+            results = await asyncio.gather(
+                *(self._lookup(tx_hash) for tx_hash in batch), return_exceptions=True
+            )
+            errors = sum(isinstance(r, Exception) for r in results)
+            if errors:
+                metrics.incr("tx_confirm.errors", errors)
+
+            deadline = time.monotonic() - self.timeout
+            for pending in [p for p in self._pending.values() if p.tracked_at < deadline]:
+                self._resolve(pending.tx_hash, "timeout")
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.interval)
+            await self.sweep()
+
+    def _ensure_running(self) -> None:
+        if self._pending and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._run())
+
+    # === public API ===
+
+    def track(self, tx_hash: str, callback: Optional[Callback] = None) -> asyncio.Future:
+        """
+        Start tracking a submitted transaction (must be called on the execution loop).
+
+        Args:
+            tx_hash: Hash returned by /sendTx or /sendTxBatch
+            callback: Called with the result once the transaction settles
+
+        Returns:
+            Future resolving to the confirmation result
+        """
+        result = self._results.get(tx_hash)
+        if result is not None:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(result)
+            if callback is not None:
+                callback(result)
+            return future
+
+        pending = self._pending.get(tx_hash)
+        if pending is None:
+            pending = _Pending(tx_hash, asyncio.get_running_loop().create_future())
+            self._pending[tx_hash] = pending
+            metrics.incr("tx_confirm.tracked")
+        if callback is not None:
+            pending.callbacks.append(callback)
+        self._ensure_running()
+        return pending.future
+
+    def track_many(
+        self,
+        tx_hashes: Iterable[str],
+        callback: Optional[Callback] = None,
+    ) -> List[asyncio.Future]:
+        """Track several transactions; returns one future per hash, in order."""
+        return [self.track(tx_hash, callback) for tx_hash in tx_hashes]
+
+    async def wait(
+        self, tx_hashes: List[str], timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Track transactions and wait for them to settle.
+
+        Args:
+            tx_hashes: Hashes to confirm
+            timeout: Seconds to wait (None = until every hash settles or times out)
+
+        Returns:
+            One result per hash, in order; hashes still unsettled when the wait
+            ends are reported with status 'pending'
+        """
+        futures = self.track_many(tx_hashes)
+        if futures:
+            await asyncio.wait(futures, timeout=timeout)
+        return [
+            f.result() if f.done() else {"tx_hash": tx_hash, "status": "pending"}
+            for tx_hash, f in zip(tx_hashes, futures)
+        ]
+
+    def get(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the result for a hash, a 'pending' stub while tracked, else None."""
+        if tx_hash in self._pending:
+            return {"tx_hash": tx_hash, "status": "pending"}
+        return self._results.get(tx_hash)
+
+    @property
+    def pending(self) -> int:
+        """Number of transactions still waiting for confirmation."""
+        return len(self._pending)
+
+    def stop(self) -> None:
+        """Stop sweeping; pending futures stay unresolved until tracking resumes."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+# Trackers keyed by (event loop id, account index)
+_trackers: Dict[Tuple[int, int], TxConfirmationTracker] = {}
+
+
+def get_confirmation_tracker(config: dict) -> TxConfirmationTracker:
+    """
+    Get the confirmation tracker for an account on the running loop.
+
+    Args:
+        config: Execution config with base_url, account_index and private_keys
+
+    Returns:
+        TxConfirmationTracker instance
+    """
+    key = (id(asyncio.get_running_loop()), config["account_index"])
+    tracker = _trackers.get(key)
+    if tracker is None:
+        tracker = TxConfirmationTracker(config)
+        _trackers[key] = tracker
+    return tracker
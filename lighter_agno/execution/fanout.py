@@ -0,0 +1,180 @@
+"""
+Copy-trading fan-out for Lighter Exchange.
+
+Turns one order intent into per-account orders sized by weight and sends
+them concurrently. Every account signs with its own SignerClient and nonce
+stream, so the fan-out as a whole costs about one order's latency instead
+of one per account.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from lighter_agno.config import get_config, get_config_store
+from lighter_agno.execution.order_index import get_allocator
+from lighter_agno.execution.signer import get_signer, send_signed
+from lighter_agno.execution.validation import (
+    OrderValidationError,
+    round_size,
+    to_base_amount,
+    to_price,
+    validate_order,
+)
+from lighter_agno.market_cache import get_market_cache
+from lighter_agno.metrics import metrics
+
+ORDER_TYPES = ("limit", "market")
+
+
+def _prepare(config: dict, intent: Dict[str, Any], weight: float) -> Tuple[Dict[str, Any], float]:
+    """Size the account's order from cached market data and validate it (blocking)."""
+    cache = get_market_cache(f"{config['base_url']}/api/v1")
+    market = cache.get_market(intent["market_index"])
+    if market is None:
+        raise OrderValidationError(f"Unknown market {intent['market_index']}", "unknown_market")
+    size = round_size(market, intent["size"] * weight)
+    if size <= 0:
+        raise OrderValidationError(
+            f"Weight {weight} rounds the order down to nothing", "size_too_small"
+        )
+    validate_order(
+        cache, config["account_index"], intent["market_index"], intent["side"],
+        size, intent["price"], intent["reduce_only"]
+    )
+    return market, size
+
+
+async def _place_for_account(
+    intent: Dict[str, Any],
+    account_index: int,
+    weight: float,
+) -> Dict[str, Any]:
+    """Validate, sign and send one account's share of the intent."""
+    started = time.perf_counter()
+    result: Dict[str, Any] = {"account_index": account_index, "weight": weight}
+    try:
+        config = get_config(account_index)
+        market, size = await asyncio.get_running_loop().run_in_executor(
+            None, _prepare, config, intent, weight
+        )
+        signer = await get_signer(config)
+    except OrderValidationError as e:
+        return {**result, "success": False, "error": str(e), "reason": e.reason}
+    except Exception as e:
+        return {**result, "success": False, "error": str(e)}
+
+    is_market = intent["order_type"] == "market"
+    allocator = get_allocator(account_index)
+    client_order_index = allocator.allocate({
+        "market_index": intent["market_index"],
+        "side": intent["side"],
+        "size": size,
+        "price": intent["price"],
+        "type": intent["order_type"],
+        "reduce_only": intent["reduce_only"],
+        "purpose": "fan_out",
+    })
+    kwargs = {
+        "market_index": intent["market_index"],
+        "client_order_index": client_order_index,
+        "base_amount": to_base_amount(market, size),
+        "price": to_price(market, intent["price"]),
+        "is_ask": intent["side"] == "sell",
+        "order_type": 1 if is_market else 0,  # MARKET / LIMIT
+        "time_in_force": 0 if is_market else 1,  # IOC / GTT
+        "reduce_only": intent["reduce_only"],
+    }
+    if is_market:
+        kwargs["order_expiry"] = 0  # IOC orders carry no expiry
+
+    tx_hash, _, err = await send_signed(signer, "sign_create_order", kwargs, key=client_order_index)
+    result.update(size=size, client_order_id=client_order_index)
+    if err:
+        allocator.update(client_order_index, status="rejected", error=str(err))
+        return {**result, "success": False, "error": str(err)}
+    allocator.update(client_order_index, status="submitted", tx_hash=tx_hash)
+    metrics.record("fanout.order", time.perf_counter() - started, client_order_index)
+    return {**result, "success": True, "tx_hash": tx_hash}
+
+
+async def fan_out_order(
+    market_index: int,
+    side: str,
+    size: float,
+    price: float,
+    allocations: List[Tuple[int, float]],
+    order_type: str = "limit",
+    reduce_only: bool = False,
+) -> Dict[str, Any]:
+    """
+    Place one order intent on many accounts concurrently.
+
+    Each account's size is `size * weight`, rounded down to the market's
+    size precision. Accounts are independent: a rejection on one does not
+    stop the others.
+
+    Args:
+        market_index: Market ID
+        side: 'buy' or 'sell'
+        size: Base size of the intent (weight 1.0)
+        price: Limit price, or worst acceptable price for market orders
+        allocations: (account_index, weight) pairs; every account must be
+            configured with its own API key
+        order_type: 'limit' or 'market'
+        reduce_only: Whether the orders may only reduce positions
+
+    Returns:
+        Dict with the per-account results and aggregate totals
+    """
+    if order_type not in ORDER_TYPES:
+        raise ValueError(f"Unknown order type: {order_type}")
+    intent = {
+        "market_index": market_index,
+        "side": side,
+        "size": size,
+        "price": price,
+        "order_type": order_type,
+        "reduce_only": reduce_only,
+    }
+
+    started = time.perf_counter()
+    orders = await asyncio.gather(*(
+        _place_for_account(intent, account_index, weight)
+        for account_index, weight in allocations
+    ))
+    elapsed = time.perf_counter() - started
+    metrics.record("fanout.total", elapsed, accounts=len(allocations))
+
+    submitted = [o for o in orders if o["success"]]
+    return {
+        "success": len(submitted) == len(orders),
+        "intent": intent,
+        "accounts": len(orders),
+        "submitted": len(submitted),
+        "failed": len(orders) - len(submitted),
+        "total_size": sum(o["size"] for o in submitted),
+        "wall_ms": round(elapsed * 1e3, 2),
+        "orders": list(orders),
+    }
+
+
+def build_allocations(
+    accounts: Optional[List[int]] = None,
+    weights: Optional[List[float]] = None,
+) -> List[Tuple[int, float]]:
+    """
+    Pair accounts with weights (default: every configured account, weight 1.0).
+
+    Raises:
+        ValueError: If weights are given but do not match the accounts
+    """
+    if accounts is None:
+        accounts = get_config_store().accounts()
+    if weights is None:
+        weights = [1.0] * len(accounts)
+    if len(weights) != len(accounts):
+        raise ValueError(f"Got {len(weights)} weights for {len(accounts)} accounts")
+    if any(w < 0 for w in weights):
+        raise ValueError("Weights must not be negative")
+    return list(zip(accounts, weights))
@@ -0,0 +1,233 @@
+"""
+Client order index allocation for Lighter Exchange.
+
+Hands out monotonic, collision-free client order indices per account and
+keeps an in-memory index from client_order_index to the order intent, so
+acks, fills and cancels can be matched back in O(1).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from lighter_agno.constants import (
+    CLIENT_ORDER_INDEX_BLOCK,
+    MAX_CLIENT_ORDER_INDEX,
+    MAX_TRACKED_INTENTS,
+    STATE_DIR,
+)
+
+
+class ClientOrderIndexAllocator:
+    """
+    Monotonic client order index allocator for a single account.
+
+    Indices are reserved from disk in blocks: the watermark file only stores
+    the first index that has NOT been handed out by any previous process.
+    After a crash the allocator resumes from the watermark, skipping at most
+    one unused block, so an index is never issued twice.
+    """
+
+    def __init__(
+        self,
+        account_index: int,
+        state_dir: str = STATE_DIR,
+        block_size: int = CLIENT_ORDER_INDEX_BLOCK,
+        max_intents: int = MAX_TRACKED_INTENTS
+    ):
+        self.account_index = account_index
+        self.block_size = block_size
+        self.max_intents = max_intents
+        self.path = os.path.join(state_dir, f"client_order_index_{account_index}.json")
+
+        self._lock = threading.Lock()
+        self._intents: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._by_order_index: Dict[int, int] = {}
+
+        # Seed from the clock on first use so we never collide with indices
+        # that were hard-coded before the allocator existed.
+        self._next = max(self._read_watermark(), int(time.time() * 1000))
+        self._reserved_until = self._next
+
+    def _read_watermark(self) -> int:
+        """Read the persisted watermark, or 0 if none exists."""
+        try:
+            with open(self.path) as f:
+                return int(json.load(f)["next"])
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def _write_watermark(self, value: int) -> None:
+        """Atomically persist the watermark (write temp file, fsync, rename)."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"account_index": self.account_index, "next": value}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def allocate(self, intent: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Allocate the next client order index.
+
+        Args:
+            intent: Optional order intent (market, side, size, price, ...) to index
+
+        Returns:
+            A client order index never issued before for this account
+        """
+        with self._lock:
+            if self._next >= self._reserved_until:
+                reserved_until = self._next + self.block_size
+                if reserved_until > MAX_CLIENT_ORDER_INDEX:
+                    raise OverflowError(
+                        f"Client order index space exhausted for account {self.account_index}"
+                    )
+                self._write_watermark(reserved_until)
+                self._reserved_until = reserved_until
+
+            client_order_index = self._next
+            self._next += 1
+
+            if intent is not None:
+                self._store(client_order_index, intent)
+            return client_order_index
+
+    def track(self, client_order_index: int, intent: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Index an intent under a caller-chosen client order index.
+
+        Args:
+            client_order_index: Client order index supplied by the caller
+            intent: Order intent (market, side, size, price, ...)
+
+        Returns:
+            The stored intent
+        """
+        with self._lock:
+            return self._store(client_order_index, intent)
+
+    def _store(self, client_order_index: int, intent: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert an intent, evicting the oldest ones beyond max_intents."""
+        intent = {
+            **intent,
+            "client_order_index": client_order_index,
+            "status": "pending",
+            "created_at": time.time(),
+        }
+        self._intents[client_order_index] = intent
+        while len(self._intents) > self.max_intents:
+            _, evicted = self._intents.popitem(last=False)
+            self._by_order_index.pop(evicted.get("order_index"), None)
+        return intent
+
+    def lookup(self, client_order_index: int) -> Optional[Dict[str, Any]]:
+        """Return the intent recorded for a client order index, if any."""
+        return self._intents.get(client_order_index)
+
+    def lookup_by_order_index(self, order_index: int) -> Optional[Dict[str, Any]]:
+        """Return the intent for an exchange-assigned order index, if linked."""
+        client_order_index = self._by_order_index.get(order_index)
+        if client_order_index is None:
+            return None
+        return self._intents.get(client_order_index)
+
+    def update(self, client_order_index: int, **fields: Any) -> Optional[Dict[str, Any]]:
+        """
+        Update an intent in place (e.g. status="acked", tx_hash=..., order_index=...).
+
+        Returns:
+            The updated intent, or None if the index is not tracked
+        """
+        with self._lock:
+            intent = self._intents.get(client_order_index)
+            if intent is None:
+                return None
+            intent.update(fields)
+            intent["updated_at"] = time.time()
+            if fields.get("order_index") is not None:
+                self._by_order_index[fields["order_index"]] = client_order_index
+            return intent
+
+    def link(self, orders: Iterable[Dict[str, Any]]) -> int:
+        """
+        Link exchange orders (from active / inactive order reads) to their intents.
+
+        Each order is matched by its client_order_index; the intent records the
+        exchange order_index (so lookup_by_order_index finds it), the exchange
+        status and the filled amount.
+
+        Returns:
+            Number of orders matched to a tracked intent
+        """
+        linked = 0
+        with self._lock:
+            for order in orders:
+                intent = self._intents.get(order.get("client_order_index"))
+                if intent is None:
+                    continue
+                order_index = order.get("order_index")
+                if order_index is not None:
+                    intent["order_index"] = order_index
+                    self._by_order_index[order_index] = intent["client_order_index"]
+                if order.get("status"):
+                    intent["status"] = order["status"]
+                if order.get("filled_base_amount") is not None:
+                    intent["filled_base_amount"] = order["filled_base_amount"]
+                intent["updated_at"] = time.time()
+                linked += 1
+        return linked
+
+    def stats(self) -> Dict[str, Any]:
+        """Return allocator state for diagnostics."""
+        return {
+            "account_index": self.account_index,
+            "next_client_order_index": self._next,
+            "reserved_until": self._reserved_until,
+            "tracked_intents": len(self._intents),
+        }
+
+
+# Per-account singletons, mirroring lighter_agno.client.get_client
+_allocators: Dict[int, ClientOrderIndexAllocator] = {}
+_allocators_lock = threading.Lock()
+
+
+def get_allocator(account_index: int) -> ClientOrderIndexAllocator:
+    """
+    Get or create the client order index allocator for an account.
+
+    Args:
+        account_index: Lighter account index
+
+    Returns:
+        ClientOrderIndexAllocator instance
+    """
+    with _allocators_lock:
+        allocator = _allocators.get(account_index)
+        if allocator is None:
+            allocator = ClientOrderIndexAllocator(account_index)
+            _allocators[account_index] = allocator
+        return allocator
+
+
+def link_orders(account_index: int, orders: Iterable[Dict[str, Any]]) -> int:
+    """
+    Link exchange orders of an account to the intents placed from this process.
+
+    Accounts without an allocator have no intents, so nothing is created for them.
+
+    Args:
+        account_index: Lighter account index
+        orders: Order dicts as returned by /accountActiveOrders or /accountInactiveOrders
+
+    Returns:
+        Number of orders matched to a tracked intent
+    """
+    with _allocators_lock:
+        allocator = _allocators.get(account_index)
+    return allocator.link(orders) if allocator is not None else 0
@@ -0,0 +1,220 @@
+"""
+Background position watcher for Lighter Exchange.
+
+Refreshes the account on the execution loop, diffs each snapshot against the
+previous one and publishes only the positions and balances that changed.
+Every delta gets a sequence number, so readers can ask for "everything since
+N" instead of re-reading the whole account.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from lighter_agno.client import LighterClient
+from lighter_agno.constants import POSITION_CHANGE_EVENTS, POSITION_WATCH_INTERVAL
+from lighter_agno.market_cache import get_market_cache
+from lighter_agno.metrics import metrics
+
+POSITION_FIELDS = (
+    "symbol", "sign", "position", "avg_entry_price", "position_value",
+    "unrealized_pnl", "realized_pnl", "liquidation_price",
+)
+BALANCE_FIELDS = ("available_balance", "collateral", "total_asset_value")
+
+
+def _pick(source: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    return {field: source[field] for field in fields if field in source}
+
+
+class PositionWatcher:
+    """
+    Keeps the latest account snapshot of one account and a log of its deltas.
+
+    Deltas are {"seq", "timestamp", "type": "position" | "balance",
+    "change": "opened" | "updated" | "closed", "market_id", "fields"}, where
+    "fields" holds only the values that changed.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        client: Optional[LighterClient] = None,
+        interval: float = POSITION_WATCH_INTERVAL,
+        max_changes: int = POSITION_CHANGE_EVENTS
+    ):
+        self.config = config
+        self.account_index = config["account_index"]
+        self.client = client or LighterClient(base_url=f"{config['base_url']}/api/v1")
+        self.interval = interval
+
+        self.positions: Dict[int, Dict[str, Any]] = {}
+        self.balances: Dict[str, Any] = {}
+        self.seq = 0
+        self.refreshed_at: Optional[float] = None
+        self._changes: deque = deque(maxlen=max_changes)
+        self._subscribers: List[asyncio.Queue] = []
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # === refresh and diff ===
+
+    def _diff(self, account: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Apply a fresh /account snapshot and return the deltas (without seq)."""
+        changes = []
+        balances = _pick(account, BALANCE_FIELDS)
+        changed = {k: v for k, v in balances.items() if self.balances.get(k) != v}
+        if changed:
+            changes.append({"type": "balance", "change": "updated", "fields": changed})
+        self.balances = balances
+
+        positions = {
+            p["market_id"]: _pick(p, POSITION_FIELDS)
+            for p in account.get("positions") or []
+            if float(p["position"]) != 0
+        }
+        for market_id, position in positions.items():
+            previous = self.positions.get(market_id)
+            if previous is None:
+                changes.append({
+                    "type": "position", "change": "opened",
+                    "market_id": market_id, "fields": position,
+                })
+                continue
+            changed = {k: v for k, v in position.items() if previous.get(k) != v}
+            if changed:
+                changes.append({
+                    "type": "position", "change": "updated",
+                    "market_id": market_id, "fields": changed,
+                })
+        for market_id in self.positions.keys() - positions.keys():
+            changes.append({
+                "type": "position", "change": "closed",
+                "market_id": market_id, "fields": {"position": "0"},
+            })
+        self.positions = positions
+        return changes
+
+    def _publish(self, changes: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        for change in changes:
+            self.seq += 1
+            change["seq"] = self.seq
+            change["timestamp"] = now
+            self._changes.append(change)
+            for queue in self._subscribers:
+                queue.put_nowait(change)
+        if changes:
+            # Wake long-polling readers, then re-arm for the next delta
+            self._changed.set()
+            self._changed = asyncio.Event()
+
+    async def refresh(self) -> List[Dict[str, Any]]:
+        """Fetch the account once and publish what changed."""
+        data = await self.client.async_get("/account", {
+            "by": "index", "value": str(self.account_index)
+        })
+        accounts = data.get("accounts") or []
+        if not accounts:
+            return []
+        get_market_cache(self.client.base_url).put_account(self.account_index, accounts[0])
+        changes = self._diff(accounts[0])
+        self.refreshed_at = time.time()
+        self._publish(changes)
+        return changes
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception:
+                metrics.incr("position_watcher.errors")
+
+    # === public API ===
+
+    async def start(self) -> None:
+        """Start watching; the first snapshot is loaded before this returns."""
+        if self._task is not None and not self._task.done():
+            return
+        await self.refresh()
+        self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        """Stop refreshing (the last snapshot and deltas are kept)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the watch loop is active."""
+        return self._task is not None and not self._task.done()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The full current state, with the sequence number it corresponds to."""
+        return {
+            "seq": self.seq,
+            "refreshed_at": self.refreshed_at,
+            "balances": dict(self.balances),
+            "positions": {market_id: dict(p) for market_id, p in self.positions.items()},
+        }
+
+    def changes_since(self, since: Optional[int]) -> Dict[str, Any]:
+        """
+        Return the deltas after sequence number `since`.
+
+        If `since` is None, or older than the retained deltas, the full
+        snapshot is returned instead with "resync": True.
+        """
+        oldest = self._changes[0]["seq"] if self._changes else self.seq + 1
+        if since is None or since > self.seq or since < oldest - 1:
+            return {"resync": True, **self.snapshot()}
+        return {
+            "resync": False,
+            "seq": self.seq,
+            "refreshed_at": self.refreshed_at,
+            "changes": [c for c in self._changes if c["seq"] > since],
+        }
+
+    async def wait_for_changes(self, since: Optional[int], timeout: float) -> Dict[str, Any]:
+        """Like changes_since(), but wait up to `timeout` seconds for a delta to arrive."""
+        if since is not None and since == self.seq and timeout > 0:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._changed.wait(), timeout)
+        return self.changes_since(since)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Get a queue that receives every delta from now on."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop delivering deltas to a queue."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+
+# Watchers keyed by (event loop id, account index)
+_watchers: Dict[Tuple[int, int], PositionWatcher] = {}
+
+
+def get_position_watcher(config: dict) -> PositionWatcher:
+    """
+    Get the position watcher for an account on the running loop.
+
+    Args:
+        config: Execution config with base_url and account_index
+
+    Returns:
+        PositionWatcher instance (call start() to begin watching)
+    """
+    key = (id(asyncio.get_running_loop()), config["account_index"])
+    watcher = _watchers.get(key)
+    if watcher is None:
+        watcher = PositionWatcher(config)
+        _watchers[key] = watcher
+    return watcher
@@ -0,0 +1,98 @@
+"""
+Shared last-trade price feed for Lighter Exchange.
+
+One /orderBookDetails request returns the last trade price of every market,
+so a single poller serves every consumer on the execution loop. Subscribers
+receive only the markets whose price changed since the previous poll.
+"""
+
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from lighter_agno.client import LighterClient
+from lighter_agno.constants import PRICE_FEED_INTERVAL
+from lighter_agno.metrics import metrics
+
+PriceCallback = Callable[[Dict[int, float], float], None]
+
+
+class PriceFeed:
+    """
+    Polls last trade prices for all markets and pushes changes to subscribers.
+
+    Callbacks run synchronously on the loop with (changed prices by market
+    ID, monotonic receive time), so they must not block. The poller stops
+    when the last subscriber leaves and restarts with the next one.
+    """
+
+    def __init__(self, client: LighterClient, interval: float = PRICE_FEED_INTERVAL):
+        self.client = client
+        self.interval = interval
+        self.prices: Dict[int, float] = {}
+        self._subscribers: List[PriceCallback] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: PriceCallback) -> None:
+        """Start receiving price changes (must be called on the execution loop)."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def unsubscribe(self, callback: PriceCallback) -> None:
+        """Stop receiving price changes."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def latest(self, market_id: int) -> Optional[float]:
+        """Last polled price for a market, if any."""
+        return self.prices.get(market_id)
+
+    async def poll(self) -> Dict[int, float]:
+        """Fetch prices once; returns the markets whose price changed."""
+        data = await self.client.async_get("/orderBookDetails", {})
+        received_at = asyncio.get_running_loop().time()
+        changed = {}
+        for key in ("order_book_details", "spot_order_book_details"):
+            for detail in data.get(key) or []:
+                price = detail.get("last_trade_price")
+                if price is None:
+                    continue
+                price = float(price)
+                if self.prices.get(detail["market_id"]) != price:
+                    changed[detail["market_id"]] = price
+        self.prices.update(changed)
+        if changed:
+            for callback in list(self._subscribers):
+                callback(changed, received_at)
+        return changed
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            try:
+                await self.poll()
+            except Exception:
+                metrics.incr("price_feed.errors")
+            await asyncio.sleep(self.interval)
+
+
+# Feeds keyed by (event loop id, API base URL)
+_feeds: Dict[tuple, PriceFeed] = {}
+
+
+def get_price_feed(base_url: str) -> PriceFeed:
+    """
+    Get the shared price feed for an API base URL on the running loop.
+
+    Args:
+        base_url: Main API URL including /api/v1
+
+    Returns:
+        PriceFeed instance
+    """
+    key = (id(asyncio.get_running_loop()), base_url)
+    feed = _feeds.get(key)
+    if feed is None:
+        feed = PriceFeed(LighterClient(base_url=base_url))
+        _feeds[key] = feed
+    return feed
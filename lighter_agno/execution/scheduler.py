@@ -0,0 +1,783 @@
+"""
+In-process execution algorithms for Lighter Exchange.
+
+Slices large parent orders into child orders over time (TWAP), by visible
+size (iceberg) or by book depth until a position is flat (smart close).
+Every parent runs as a task on the shared execution loop and
+signs through the shared SignerClient and nonce manager; book depth and
+active-order reads are coalesced per market, so hundreds of parents cost
+about as much I/O as one.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from lighter_agno.client import LighterClient
+from lighter_agno.constants import (
+    ALGO_DEPTH_FRACTION,
+    ALGO_DEPTH_LEVELS,
+    ALGO_DEPTH_TTL,
+    ALGO_FILL_POLL_ATTEMPTS,
+    ALGO_FILL_POLL_INTERVAL,
+    ALGO_FINISHED_PARENTS,
+    ALGO_INACTIVE_ORDERS,
+    ALGO_PROGRESS_EVENTS,
+)
+from lighter_agno.execution.order_index import get_allocator, link_orders
+from lighter_agno.execution.signer import get_signer, send_signed, send_signed_bulk
+from lighter_agno.execution.validation import round_price, round_size, to_base_amount, to_price
+from lighter_agno.market_cache import get_market_cache
+
+PARENT_TERMINAL_STATUSES = ("completed", "partial", "cancelled", "failed")
+
+# Auth tokens for private reads are valid for 10 minutes; renew well before
+_AUTH_TOKEN_TTL = 300
+
+
+class _Coalescer:
+    """
+    Keyed async fetch with a short TTL and in-flight deduplication.
+
+    Concurrent callers for the same key share one request; results are reused
+    until they are `ttl` seconds old.
+    """
+
+    def __init__(self, fetch: Callable[[Any], Awaitable[Any]], ttl: float):
+        self._fetch = fetch
+        self.ttl = ttl
+        self._results: Dict[Any, Tuple[float, Any]] = {}
+        self._inflight: Dict[Any, asyncio.Task] = {}
+
+    async def get(self, key: Any) -> Any:
+        cached = self._results.get(key)
+        if cached and time.monotonic() - cached[0] <= self.ttl:
+            return cached[1]
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Any) -> Any:
+        try:
+            result = await self._fetch(key)
+            self._results[key] = (time.monotonic(), result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+
+def _filled_size(order: Dict[str, Any]) -> float:
+    """Base amount an exchange order (active or inactive) has filled."""
+    if order.get("filled_base_amount") is not None:
+        return float(order["filled_base_amount"])
+    return float(order["initial_base_amount"]) - float(order["remaining_base_amount"])
+
+
+def _book_liquidity(
+    book: Dict[str, Any],
+    side: str,
+    limit_price: Optional[float],
+) -> Tuple[Optional[float], float]:
+    """
+    Return (best opposite price, size available within limit_price).
+
+    A buy consumes asks priced at or below the limit, a sell consumes bids
+    priced at or above it.
+    """
+    levels = book.get("asks" if side == "buy" else "bids") or []
+    if not levels:
+        return None, 0.0
+    best = float(levels[0]["price"])
+    available = 0.0
+    for level in levels:
+        price = float(level["price"])
+        if limit_price is not None and (
+            (side == "buy" and price > limit_price) or (side == "sell" and price < limit_price)
+        ):
+            break
+        available += float(level["remaining_base_amount"])
+    return best, available
+
+
+class ParentOrder:
+    """State and progress of one algorithmic parent order."""
+
+    def __init__(
+        self,
+        parent_id: str,
+        algo: str,
+        market: Dict[str, Any],
+        side: str,
+        size: float,
+        limit_price: Optional[float],
+        params: Dict[str, Any]
+    ):
+        self.parent_id = parent_id
+        self.algo = algo
+        self.market = market
+        self.market_index = market["market_id"]
+        self.side = side
+        self.size = size
+        self.limit_price = limit_price
+        self.params = params
+
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.submitted_size = 0.0
+        self.filled_size = 0.0
+        self.children: List[Dict[str, Any]] = []
+        self.created_at = time.time()
+        self.events: deque = deque(maxlen=ALGO_PROGRESS_EVENTS)
+        self.task: Optional[asyncio.Task] = None
+        self._subscribers: List[asyncio.Queue] = []
+
+    @property
+    def remaining(self) -> float:
+        """Size not yet filled."""
+        return max(self.size - self.filled_size, 0.0)
+
+    def publish(self, event: str, **fields: Any) -> None:
+        """Record a progress event and push it to stream subscribers."""
+        payload = {
+            "parent_id": self.parent_id,
+            "event": event,
+            "status": self.status,
+            "submitted_size": self.submitted_size,
+            "filled_size": self.filled_size,
+            "remaining": self.remaining,
+            "timestamp": time.time(),
+            **fields,
+        }
+        self.events.append(payload)
+        for queue in self._subscribers:
+            queue.put_nowait(payload)
+
+    def to_dict(self, events: int = 10) -> Dict[str, Any]:
+        """Summarize the parent order for tools."""
+        return {
+            "parent_id": self.parent_id,
+            "algo": self.algo,
+            "market_index": self.market_index,
+            "side": self.side,
+            "size": self.size,
+            "limit_price": self.limit_price,
+            "params": self.params,
+            "status": self.status,
+            "error": self.error,
+            "submitted_size": self.submitted_size,
+            "filled_size": self.filled_size,
+            "remaining": self.remaining,
+            "child_orders": len(self.children),
+            "created_at": self.created_at,
+            "recent_events": list(self.events)[-events:],
+        }
+
+
+class ExecutionScheduler:
+    """
+    Runs TWAP, iceberg and smart close parent orders for one account on one event loop.
+
+    TWAP parents send immediate-or-cancel child orders on a fixed schedule.
+    Each child is sized as the unfilled quantity spread over the remaining
+    slices, capped at a fraction of the liquidity currently resting within the
+    limit, so thin books push size into later slices instead of walking. The
+    fill of every child is read back from the account's inactive orders
+    before the next slice is planned, so unfilled IOC size is rescheduled. A
+    TWAP that ends with size left over finishes as "partial" (or "failed" if
+    nothing filled).
+
+    Iceberg parents keep one resting child of `visible_size` on the book and
+    replace it each time it leaves the book. A child that leaves the book is
+    credited only with the fill its inactive order reports; a child that left
+    without filling anything (rejected, cancelled or expired elsewhere) fails
+    the parent.
+
+    Smart close parents re-read the position and the book every round. In
+    "ioc" mode they send one reduce-only IOC child per book level within the
+    slippage budget, all in one batch; in "post_only" mode they rest one
+    reduce-only post-only child at the touch and requote it next round. Fills
+    are measured from the position itself, until it is flat.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        client: Optional[LighterClient] = None,
+        depth_fraction: float = ALGO_DEPTH_FRACTION,
+        depth_ttl: float = ALGO_DEPTH_TTL
+    ):
+        self.config = config
+        self.account_index = config["account_index"]
+        self.client = client or LighterClient(base_url=f"{config['base_url']}/api/v1")
+        self.depth_fraction = depth_fraction
+
+        self._parents: Dict[str, ParentOrder] = {}
+        self._ids = itertools.count(1)
+        self._depth = _Coalescer(self._fetch_depth, depth_ttl)
+        self._active_orders = _Coalescer(self._fetch_active_orders, depth_ttl)
+        self._inactive_orders = _Coalescer(self._fetch_inactive_orders, depth_ttl)
+        self._auth: Tuple[float, Optional[str]] = (0.0, None)
+
+    # === shared reads ===
+
+    async def _fetch_depth(self, market_index: int) -> Dict[str, Any]:
+        return await self.client.async_get("/orderBookOrders", {
+            "market_id": market_index,
+            "limit": ALGO_DEPTH_LEVELS,
+        })
+
+    async def _auth_token(self) -> str:
+        issued_at, token = self._auth
+        if token is None or time.monotonic() - issued_at > _AUTH_TOKEN_TTL:
+            signer = await get_signer(self.config)
+            token, err = signer.create_auth_token_with_expiry()
+            if err:
+                raise Exception(f"Auth token error: {err}")
+            self._auth = (time.monotonic(), token)
+        return token
+
+    async def _fetch_active_orders(self, market_index: int) -> Dict[int, Dict[str, Any]]:
+        data = await self.client.async_get("/accountActiveOrders", {
+            "account_index": self.account_index,
+            "market_id": market_index,
+            "auth": await self._auth_token(),
+        })
+        orders = data.get("orders") or []
+        link_orders(self.account_index, orders)
+        return {order["client_order_index"]: order for order in orders}
+
+    async def _fetch_inactive_orders(self, market_index: int) -> Dict[int, Dict[str, Any]]:
+        data = await self.client.async_get("/accountInactiveOrders", {
+            "account_index": self.account_index,
+            "market_id": market_index,
+            "limit": ALGO_INACTIVE_ORDERS,
+            "auth": await self._auth_token(),
+        })
+        orders = data.get("orders") or []
+        link_orders(self.account_index, orders)
+        return {order["client_order_index"]: order for order in orders}
+
+    async def _child_fill(self, parent: ParentOrder, child: Dict[str, Any]) -> Optional[float]:
+        """
+        Size a child that has left the book actually filled, from the account's
+        inactive orders; None if it does not show up there in time.
+        """
+        for attempt in range(ALGO_FILL_POLL_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(ALGO_FILL_POLL_INTERVAL)
+            inactive = await self._inactive_orders.get(parent.market_index)
+            order = inactive.get(child["client_order_index"])
+            if order is not None:
+                child["order_index"] = order.get("order_index")
+                child["status"] = order.get("status")
+                return _filled_size(order)
+        return None
+
+    def _credit_fill(self, parent: ParentOrder, child: Dict[str, Any], filled: float) -> None:
+        child["filled"] = filled
+        parent.filled_size += filled
+        parent.publish(
+            "child_filled" if filled > 0 else "child_unfilled",
+            client_order_index=child["client_order_index"],
+            filled=filled,
+            child_status=child.get("status"),
+        )
+
+    def _finish(self, parent: ParentOrder) -> None:
+        """Mark a parent completed, or partial / failed if size is left unfilled."""
+        if round_size(parent.market, parent.remaining) > 0:
+            parent.status = "partial" if parent.filled_size > 0 else "failed"
+            parent.error = f"{parent.remaining} of {parent.size} left unfilled"
+            parent.publish(parent.status, error=parent.error)
+            return
+        parent.status = "completed"
+        parent.publish("completed")
+
+    # === child orders ===
+
+    async def _submit_child(
+        self,
+        parent: ParentOrder,
+        size: float,
+        price: float,
+        time_in_force: int,
+        order_expiry: int = -1,
+        reduce_only: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Sign and send one child order; returns the child record or None on error."""
+        children = await self._submit_children(
+            parent, [(size, price)], time_in_force, order_expiry, reduce_only
+        )
+        return children[0] if children else None
+
+    async def _submit_children(
+        self,
+        parent: ParentOrder,
+        orders: List[Tuple[float, float]],
+        time_in_force: int,
+        order_expiry: int = -1,
+        reduce_only: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sign and send (size, price) child orders, batched through /sendTxBatch
+        when there are several; returns the records of the accepted children.
+        """
+        signer = await get_signer(self.config)
+        allocator = get_allocator(self.account_index)
+        requests, indices = [], []
+        for size, price in orders:
+            client_order_index = allocator.allocate({
+                "market_index": parent.market_index,
+                "side": parent.side,
+                "size": size,
+                "price": price,
+                "type": "limit",
+                "reduce_only": reduce_only,
+                "parent_id": parent.parent_id,
+            })
+            indices.append(client_order_index)
+            requests.append(("sign_create_order", {
+                "market_index": parent.market_index,
+                "client_order_index": client_order_index,
+                "base_amount": to_base_amount(parent.market, size),
+                "price": to_price(parent.market, price),
+                "is_ask": parent.side == "sell",
+                "order_type": 0,  # LIMIT
+                "time_in_force": time_in_force,
+                "reduce_only": reduce_only,
+                "order_expiry": order_expiry,
+            }))
+
+        results: List[Tuple[Optional[str], Optional[str]]] = []
+        if len(requests) == 1:
+            method, kwargs = requests[0]
+            tx_hash, _, err = await send_signed(signer, method, kwargs, key=indices[0])
+            results.append((tx_hash, err))
+        else:
+            results = await send_signed_bulk(signer, requests)
+
+        children = []
+        for (size, price), client_order_index, (tx_hash, err) in zip(orders, indices, results):
+            if err:
+                allocator.update(client_order_index, status="rejected", error=str(err))
+                parent.publish("child_rejected", size=size, price=price, error=str(err))
+                continue
+            allocator.update(client_order_index, status="submitted", tx_hash=tx_hash)
+            child = {
+                "client_order_index": client_order_index,
+                "size": size,
+                "price": price,
+                "tx_hash": tx_hash,
+                "submitted_at": time.time(),
+            }
+            parent.children.append(child)
+            parent.submitted_size += size
+            parent.publish("child_submitted", **child)
+            children.append(child)
+        return children
+
+    # === algorithms ===
+
+    async def _run_twap(self, parent: ParentOrder) -> None:
+        slices = parent.params["slices"]
+        interval = parent.params["duration_seconds"] / slices
+        slippage = parent.params["max_slippage_percent"] / 100
+        min_size = float(parent.market.get("min_base_amount") or 0)
+        started = time.monotonic()
+
+        for slice_index in range(slices):
+            if slice_index:
+                # Reconciling the previous child may have used part of the interval
+                await asyncio.sleep(max(started + slice_index * interval - time.monotonic(), 0.0))
+            remaining = round_size(parent.market, parent.remaining)
+            if remaining <= 0:
+                break
+
+            book = await self._depth.get(parent.market_index)
+            best, _ = _book_liquidity(book, parent.side, None)
+            if best is None:
+                parent.publish("no_liquidity", slice=slice_index)
+                continue
+
+            worst = best * (1 + slippage) if parent.side == "buy" else best * (1 - slippage)
+            if parent.limit_price is not None:
+                worst = min(worst, parent.limit_price) if parent.side == "buy" \
+                    else max(worst, parent.limit_price)
+            worst = round_price(parent.market, worst, parent.side)
+            _, available = _book_liquidity(book, parent.side, worst)
+
+            planned = remaining / (slices - slice_index)
+            size = round_size(parent.market, min(planned, available * self.depth_fraction))
+            if slice_index == slices - 1:
+                size = round_size(parent.market, min(remaining, available))
+            if size < min_size or size <= 0:
+                parent.publish("skipped_thin_book", slice=slice_index, available=available)
+                continue
+
+            # Immediate-or-cancel with zero expiry, as the SDK does for IOC orders
+            child = await self._submit_child(parent, size, worst, time_in_force=0, order_expiry=0)
+            if child is None:
+                continue
+            filled = await self._child_fill(parent, child)
+            if filled is None:
+                # Sending more could overfill the parent
+                parent.status = "failed"
+                parent.error = f"fill of child {child['client_order_index']} could not be confirmed"
+                parent.publish("failed", error=parent.error)
+                return
+            self._credit_fill(parent, child, filled)
+
+        self._finish(parent)
+
+    async def _run_iceberg(self, parent: ParentOrder) -> None:
+        visible = parent.params["visible_size"]
+        poll_interval = parent.params["poll_interval_seconds"]
+
+        while round_size(parent.market, parent.remaining) > 0:
+            size = round_size(parent.market, min(visible, parent.remaining))
+            child = await self._submit_child(parent, size, parent.limit_price, time_in_force=1)
+            if child is None:
+                parent.status = "failed"
+                parent.error = "child order rejected"
+                parent.publish("failed")
+                return
+
+            seen = False
+            while True:
+                await asyncio.sleep(poll_interval)
+                active = await self._active_orders.get(parent.market_index)
+                order = active.get(child["client_order_index"])
+                if order is not None:
+                    seen = True
+                    child["order_index"] = order["order_index"]
+                    child["filled"] = _filled_size(order)
+                    continue
+                if seen or time.time() - child["submitted_at"] > 3 * poll_interval:
+                    break
+
+            # Off the book (or never on it): credit only what the exchange reports as filled
+            filled = await self._child_fill(parent, child)
+            self._credit_fill(parent, child, filled or 0.0)
+            if not filled:
+                parent.status = "failed"
+                parent.error = (
+                    f"child {child['client_order_index']} left the book without filling"
+                    f" ({child.get('status') or 'not found in inactive orders'})"
+                )
+                parent.publish("failed", error=parent.error)
+                return
+
+        parent.status = "completed"
+        parent.publish("completed")
+
+    async def _position_size(self, market_index: int) -> float:
+        """Signed size of the account's position in a market (fresh /account read)."""
+        data = await self.client.async_get("/account", {
+            "by": "index", "value": str(self.account_index)
+        })
+        accounts = data.get("accounts") or []
+        account = accounts[0] if accounts else None
+        get_market_cache(self.client.base_url).put_account(self.account_index, account)
+        for p in (account or {}).get("positions") or []:
+            if p["market_id"] == market_index:
+                return float(p["position"]) * (1 if p["sign"] == 1 else -1)
+        return 0.0
+
+    def _depth_children(
+        self,
+        parent: ParentOrder,
+        book: Dict[str, Any],
+        size: float,
+        worst: float,
+    ) -> List[Tuple[float, float]]:
+        """Split `size` into one (size, price) child per book level priced within `worst`."""
+        min_size = float(parent.market.get("min_base_amount") or 0)
+        levels = book.get("asks" if parent.side == "buy" else "bids") or []
+        children, remaining = [], size
+        for level in levels:
+            price = float(level["price"])
+            beyond = price > worst if parent.side == "buy" else price < worst
+            if beyond:
+                break
+            available = float(level["remaining_base_amount"])
+            child_size = round_size(parent.market, min(available, remaining))
+            if child_size <= 0 or child_size < min_size:
+                continue
+            children.append((child_size, price))
+            remaining -= child_size
+            if round_size(parent.market, remaining) <= 0:
+                break
+        return children
+
+    async def _run_smart_close(self, parent: ParentOrder) -> None:
+        mode = parent.params["mode"]
+        slippage = parent.params["max_slippage_percent"] / 100
+        interval = parent.params["round_interval_seconds"]
+        # Closing a long sells, closing a short buys
+        direction = -1 if parent.side == "sell" else 1
+
+        for round_index in range(parent.params["max_rounds"]):
+            if round_index and mode == "ioc":
+                # Post-only rounds already waited for their resting child
+                await asyncio.sleep(interval)
+            position = await self._position_size(parent.market_index)
+            open_size = max(-direction * position, 0.0)
+            parent.filled_size = max(parent.size - open_size, 0.0)
+            remaining = round_size(parent.market, open_size)
+            if remaining <= 0:
+                break
+
+            book = await self._depth.get(parent.market_index)
+            if mode == "ioc":
+                best, _ = _book_liquidity(book, parent.side, None)
+                if best is None:
+                    parent.publish("no_liquidity", round=round_index)
+                    continue
+                worst = best * (1 + slippage) if parent.side == "buy" else best * (1 - slippage)
+                worst = round_price(parent.market, worst, parent.side)
+                children = self._depth_children(parent, book, remaining, worst)
+                if not children:
+                    parent.publish("skipped_thin_book", round=round_index)
+                    continue
+                await self._submit_children(
+                    parent, children, time_in_force=0, order_expiry=0, reduce_only=True
+                )
+            else:
+                # Join the touch on our own side of the book
+                own = book.get("bids" if parent.side == "buy" else "asks") or []
+                opposite, _ = _book_liquidity(book, parent.side, None)
+                if own:
+                    price = float(own[0]["price"])
+                elif opposite is not None:
+                    price = opposite
+                else:
+                    parent.publish("no_liquidity", round=round_index)
+                    continue
+                price = round_price(parent.market, price, parent.side)
+                await self._submit_child(
+                    parent, remaining, price, time_in_force=2, reduce_only=True
+                )
+                await asyncio.sleep(interval)
+                await self._cancel_resting_child(parent)
+
+        position = await self._position_size(parent.market_index)
+        parent.filled_size = max(parent.size - max(-direction * position, 0.0), 0.0)
+        if round_size(parent.market, parent.remaining) > 0:
+            parent.status = "failed"
+            parent.error = f"position not flat after {parent.params['max_rounds']} rounds"
+            parent.publish("failed", error=parent.error)
+            return
+        parent.status = "completed"
+        parent.publish("completed")
+
+    async def _run(self, parent: ParentOrder, algo: Callable[[ParentOrder], Awaitable[None]]):
+        try:
+            await algo(parent)
+        except asyncio.CancelledError:
+            parent.status = "cancelled"
+            await self._cancel_resting_child(parent)
+            parent.publish("cancelled")
+        except Exception as e:
+            parent.status = "failed"
+            parent.error = str(e)
+            parent.publish("failed", error=str(e))
+
+    async def _cancel_resting_child(self, parent: ParentOrder) -> None:
+        """Pull the resting iceberg or post-only close child, if any."""
+        if parent.algo == "twap" or not parent.children:
+            return
+        child = parent.children[-1]
+        if "order_index" not in child:
+            active = await self._active_orders.get(parent.market_index)
+            order = active.get(child["client_order_index"])
+            if order is None:
+                return
+            child["order_index"] = order["order_index"]
+        signer = await get_signer(self.config)
+        _, _, err = await send_signed(signer, "sign_cancel_order", {
+            "market_index": parent.market_index,
+            "order_index": child["order_index"],
+        }, key=child["client_order_index"])
+        if err:
+            parent.error = f"Cancel of resting child failed: {err}"
+
+    def _start(self, parent: ParentOrder, algo) -> ParentOrder:
+        # Keep only the most recent finished parent orders around for status queries
+        finished = [
+            parent_id for parent_id, p in self._parents.items()
+            if p.status in PARENT_TERMINAL_STATUSES
+        ]
+        for parent_id in finished[:max(len(finished) - ALGO_FINISHED_PARENTS, 0)]:
+            del self._parents[parent_id]
+        self._parents[parent.parent_id] = parent
+        parent.task = asyncio.ensure_future(self._run(parent, algo))
+        parent.publish("started")
+        return parent
+
+    # === public API ===
+
+    async def start_twap(
+        self,
+        market: Dict[str, Any],
+        side: str,
+        size: float,
+        duration_seconds: float,
+        slices: int,
+        limit_price: Optional[float] = None,
+        max_slippage_percent: float = 0.5,
+    ) -> ParentOrder:
+        """
+        Start a TWAP parent order.
+
+        Args:
+            market: Market metadata from /orderBookDetails
+            side: 'buy' or 'sell'
+            size: Total size in base asset
+            duration_seconds: Time over which to spread the child orders
+            slices: Number of child orders
+            limit_price: Optional price no child may cross
+            max_slippage_percent: Max distance of each child from the best price
+
+        Returns:
+            The running ParentOrder
+        """
+        parent = ParentOrder(f"twap-{next(self._ids)}", "twap", market, side, size, limit_price, {
+            "duration_seconds": duration_seconds,
+            "slices": slices,
+            "max_slippage_percent": max_slippage_percent,
+        })
+        return self._start(parent, self._run_twap)
+
+    async def start_iceberg(
+        self,
+        market: Dict[str, Any],
+        side: str,
+        size: float,
+        price: float,
+        visible_size: float,
+        poll_interval_seconds: float = 1.0,
+    ) -> ParentOrder:
+        """
+        Start an iceberg parent order.
+
+        Args:
+            market: Market metadata from /orderBookDetails
+            side: 'buy' or 'sell'
+            size: Total size in base asset
+            price: Limit price for every child
+            visible_size: Size shown on the book at any time
+            poll_interval_seconds: How often to check whether the child has filled
+
+        Returns:
+            The running ParentOrder
+        """
+        parent = ParentOrder(f"iceberg-{next(self._ids)}", "iceberg", market, side, size, price, {
+            "visible_size": visible_size,
+            "poll_interval_seconds": poll_interval_seconds,
+        })
+        return self._start(parent, self._run_iceberg)
+
+    async def start_smart_close(
+        self,
+        market: Dict[str, Any],
+        side: str,
+        size: float,
+        mode: str = "ioc",
+        max_slippage_percent: float = 0.5,
+        max_rounds: int = 20,
+        round_interval_seconds: float = 1.0,
+    ) -> ParentOrder:
+        """
+        Start closing a position in depth-sized reduce-only child orders.
+
+        Args:
+            market: Market metadata from /orderBookDetails
+            side: Side that reduces the position ('sell' closes a long)
+            size: Current absolute position size
+            mode: 'ioc' (take liquidity within the budget) or 'post_only' (rest at the touch)
+            max_slippage_percent: Budget from the best price per round, for 'ioc'
+            max_rounds: Rounds before giving up with the rest still open
+            round_interval_seconds: Pause between rounds (and requote interval for 'post_only')
+
+        Returns:
+            The running ParentOrder
+        """
+        if mode not in ("ioc", "post_only"):
+            raise ValueError(f"Unknown smart close mode: {mode}")
+        parent = ParentOrder(f"close-{next(self._ids)}", "smart_close", market, side, size, None, {
+            "mode": mode,
+            "max_slippage_percent": max_slippage_percent,
+            "max_rounds": max_rounds,
+            "round_interval_seconds": round_interval_seconds,
+        })
+        return self._start(parent, self._run_smart_close)
+
+    async def cancel(self, parent_id: str) -> Optional[ParentOrder]:
+        """Cancel a running parent order and wait for it to wind down."""
+        parent = self._parents.get(parent_id)
+        if parent is None or parent.task is None:
+            return parent
+        if not parent.task.done():
+            parent.task.cancel()
+            await asyncio.gather(parent.task, return_exceptions=True)
+        return parent
+
+    def get(self, parent_id: str) -> Optional[ParentOrder]:
+        """Return a parent order by ID."""
+        return self._parents.get(parent_id)
+
+    def list(self, active_only: bool = False) -> List[ParentOrder]:
+        """Return all parent orders, optionally only the running ones."""
+        return [
+            p for p in self._parents.values()
+            if not active_only or p.status not in PARENT_TERMINAL_STATUSES
+        ]
+
+    async def stream(self, parent_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield progress events for a parent order until it finishes.
+
+        Args:
+            parent_id: Parent order ID
+
+        Yields:
+            Progress event dicts
+        """
+        parent = self._parents[parent_id]
+        if parent.status in PARENT_TERMINAL_STATUSES:
+            return
+        queue: asyncio.Queue = asyncio.Queue()
+        parent._subscribers.append(queue)
+        try:
+            while True:
+                event = await queue.get()
+                yield event
+                if event["status"] in PARENT_TERMINAL_STATUSES:
+                    return
+        finally:
+            parent._subscribers.remove(queue)
+
+
+# Schedulers keyed by account index; they live on the shared execution loop
+_schedulers: Dict[int, ExecutionScheduler] = {}
+
+
+def get_scheduler(config: dict) -> ExecutionScheduler:
+    """
+    Get or create the execution scheduler for the configured account.
+
+    Args:
+        config: Execution config with base_url, account_index and private_keys
+
+    Returns:
+        ExecutionScheduler instance
+    """
+    scheduler = _schedulers.get(config["account_index"])
+    if scheduler is None:
+        scheduler = ExecutionScheduler(config)
+        _schedulers[config["account_index"]] = scheduler
+    return scheduler
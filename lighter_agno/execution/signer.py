@@ -0,0 +1,275 @@
+"""
+Shared signer and nonce machinery for Lighter Exchange.
+
+Keeps one verified SignerClient per account on a persistent background
+event loop, so tool calls stop paying for signer setup and check_client on
+every order, and signs multi-transaction batches under a single nonce lock
+so they can be submitted together through /sendTxBatch.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import lighter
+from lighter.signer_client import trim_exc
+
+from lighter_agno.constants import MAX_TX_BATCH_SIZE, TX_BATCH_IN_FLIGHT
+from lighter_agno.execution.signing_pool import refresh_signing_pool
+from lighter_agno.execution.signing_pool import sign_requests as _sign_requests
+from lighter_agno.metrics import metrics
+from lighter_agno.submission import sdk_lookup, submit_once
+
+CODE_OK = 200
+
+# Persistent loop that owns the cached signers and their HTTP sessions
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+# Signers keyed by (event loop id, account index); sessions are loop-bound
+_signers: Dict[Tuple[int, int], lighter.SignerClient] = {}
+# Config version each cached signer was built from
+_signer_versions: Dict[Tuple[int, int], int] = {}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start the background execution loop on first use."""
+    global _loop, _loop_thread
+
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="lighter-execution-loop", daemon=True
+            )
+            _loop_thread.start()
+        return _loop
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on the shared execution loop and wait for its result.
+
+    Safe to call from synchronous code and from inside another running event
+    loop; signers cached by earlier calls are reused.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_sync() called from the execution loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+async def get_signer(config: dict) -> lighter.SignerClient:
+    """
+    Get the verified SignerClient for an account on the running loop.
+
+    The first call per account creates the client and runs check_client;
+    later calls return the cached instance. When the config has been
+    reloaded since (a higher "version"), the client and any signing pool are
+    rebuilt from the new keys; callers holding an older config keep getting
+    the current client.
+
+    Args:
+        config: Execution config with base_url, account_index and private_keys
+
+    Returns:
+        lighter.SignerClient instance
+    """
+    key = (id(asyncio.get_running_loop()), config["account_index"])
+    version = config.get("version", 0)
+    client = _signers.get(key)
+    if client is not None and version > _signer_versions[key]:
+        del _signers[key]
+        await client.close()
+        client = None
+        refresh_signing_pool(config)
+    if client is None:
+        with metrics.span("order.signer_create"):
+            client = lighter.SignerClient(
+                url=config["base_url"],
+                account_index=config["account_index"],
+                api_private_keys=dict(config["private_keys"]),
+            )
+        with metrics.span("order.check_client"):
+            err = client.check_client()
+        if err:
+            await client.close()
+            raise Exception(f"Client error: {err}")
+        _signers[key] = client
+        _signer_versions[key] = version
+    return client
+
+
+async def send_signed(
+    client: lighter.SignerClient,
+    method: str,
+    kwargs: Dict[str, Any],
+    key: Optional[int] = None,
+) -> Tuple[Optional[str], Any, Optional[str]]:
+    """
+    Sign one transaction and submit it through /sendTx.
+
+    Same nonce handling as the SDK's create_order / cancel_order helpers, but
+    signing and submission are timed as separate "order.sign" and
+    "order.submit" spans, and submission goes through submit_once(), so a
+    timed-out send is reconciled by tx hash instead of blindly resent.
+
+    Args:
+        client: SignerClient from get_signer()
+        method: Sign method name, e.g. "sign_create_order"
+        kwargs: Sign method arguments, without nonce and api_key_index
+        key: Client order index the spans are recorded under
+
+    Returns:
+        Tuple of (tx_hash, send response, error)
+    """
+    nonce_manager = client.nonce_manager
+    api_key_index = nonce_manager.rotate_key()
+
+    async with nonce_manager.lock(api_key_index):
+        _, nonce = await nonce_manager.async_next_nonce(api_key_index)
+        with metrics.span("order.sign", key):
+            tx_type, tx_info, tx_hash, err = getattr(client, method)(
+                **kwargs, nonce=nonce, api_key_index=api_key_index
+            )
+        if err:
+            nonce_manager.acknowledge_failure(api_key_index)
+            return None, None, str(err)
+
+        try:
+            with metrics.span("order.submit", key):
+                response = await submit_once(
+                    [tx_type, tx_info], [tx_hash],
+                    lambda: client.send_tx(tx_type=tx_type, tx_info=tx_info),
+                    sdk_lookup(client),
+                )
+        except lighter.exceptions.BadRequestException as e:
+            if "invalid nonce" in str(e):
+                await nonce_manager.async_hard_refresh_nonce(api_key_index)
+            else:
+                nonce_manager.acknowledge_failure(api_key_index)
+            return tx_hash, None, trim_exc(str(e))
+        except Exception as e:
+            await nonce_manager.async_hard_refresh_nonce(api_key_index)
+            return tx_hash, None, str(e)
+
+        if response.code != CODE_OK:
+            nonce_manager.acknowledge_failure(api_key_index)
+            return tx_hash, response, response.message or f"code {response.code}"
+
+    return tx_hash, response, None
+
+
+async def send_signed_batch(
+    client: lighter.SignerClient,
+    sign_requests: List[Tuple[str, Dict[str, Any]]],
+) -> Tuple[Optional[List[str]], Any, Optional[str]]:
+    """
+    Sign several transactions with consecutive nonces and submit them in one batch.
+
+    All transactions use the same API key, whose nonce lock is held from the
+    first nonce reservation until /sendTxBatch answers, so nothing else can
+    interleave on that key. Nonces are reserved in order before signing, so
+    signing can be parallelized (see signing_pool) without reordering.
+
+    Args:
+        client: SignerClient from get_signer()
+        sign_requests: (sign method name, kwargs) pairs, e.g.
+            ("sign_cancel_order", {"market_index": 0, "order_index": 123})
+
+    Returns:
+        Tuple of (tx_hashes, batch response, error)
+    """
+    if not sign_requests:
+        return [], None, None
+    if len(sign_requests) > MAX_TX_BATCH_SIZE:
+        return None, None, f"Batch of {len(sign_requests)} exceeds {MAX_TX_BATCH_SIZE} transactions"
+
+    nonce_manager = client.nonce_manager
+    api_key_index = nonce_manager.rotate_key()
+
+    async with nonce_manager.lock(api_key_index):
+        requests = []
+        for method, kwargs in sign_requests:
+            _, nonce = await nonce_manager.async_next_nonce(api_key_index)
+            requests.append((method, {**kwargs, "nonce": nonce, "api_key_index": api_key_index}))
+
+        # Signing may run in a worker pool; results come back in nonce order
+        with metrics.span("batch.sign", transactions=len(requests)):
+            signed = await _sign_requests(client, requests)
+        errors = [err for _, _, _, err in signed if err]
+        if errors:
+            # Nothing was sent: hand back every nonce reserved for this batch
+            for _ in requests:
+                nonce_manager.acknowledge_failure(api_key_index)
+            return None, None, str(errors[0])
+        tx_types = [tx_type for tx_type, _, _, _ in signed]
+        tx_infos = [tx_info for _, tx_info, _, _ in signed]
+        tx_hashes = [tx_hash for _, _, tx_hash, _ in signed]
+
+        try:
+            with metrics.span("batch.submit", transactions=len(requests)):
+                response = await submit_once(
+                    [tx_types, tx_infos], tx_hashes,
+                    lambda: client.send_tx_batch(tx_types=tx_types, tx_infos=tx_infos),
+                    sdk_lookup(client),
+                )
+        except Exception as e:
+            await nonce_manager.async_hard_refresh_nonce(api_key_index)
+            return tx_hashes, None, str(e)
+
+        if response.code != CODE_OK:
+            await nonce_manager.async_hard_refresh_nonce(api_key_index)
+            return tx_hashes, response, response.message or f"code {response.code}"
+
+    return tx_hashes, response, None
+
+
+async def send_signed_bulk(
+    client: lighter.SignerClient,
+    sign_requests: List[Tuple[str, Dict[str, Any]]],
+    max_in_flight: int = TX_BATCH_IN_FLIGHT,
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Sign and submit any number of transactions as pipelined /sendTxBatch chunks.
+
+    Requests are split into chunks of at most MAX_TX_BATCH_SIZE. Each chunk
+    is signed under the next API key in rotation, so with several keys
+    configured up to `max_in_flight` chunks are in flight at once. Chunks
+    that land on the same key queue on its nonce lock in submission order,
+    which keeps every key's nonces in order.
+
+    Args:
+        client: SignerClient from get_signer()
+        sign_requests: (sign method name, kwargs) pairs
+        max_in_flight: Chunks submitted concurrently
+
+    Returns:
+        One (tx_hash, error) pair per request, in input order
+    """
+    if len(sign_requests) == 1:
+        method, kwargs = sign_requests[0]
+        tx_hash, _, err = await send_signed(client, method, kwargs)
+        return [(tx_hash, err)]
+
+    in_flight = asyncio.Semaphore(max(max_in_flight, 1))
+
+    async def submit(chunk):
+        async with in_flight:
+            tx_hashes, _, err = await send_signed_batch(client, chunk)
+        return [(tx_hashes[i] if tx_hashes else None, err) for i in range(len(chunk))]
+
+    chunks = [
+        sign_requests[start:start + MAX_TX_BATCH_SIZE]
+        for start in range(0, len(sign_requests), MAX_TX_BATCH_SIZE)
+    ]
+    with metrics.span("batch.bulk", transactions=len(sign_requests), chunks=len(chunks)):
+        results = await asyncio.gather(*(submit(chunk) for chunk in chunks))
+    return [result for chunk_results in results for result in chunk_results]
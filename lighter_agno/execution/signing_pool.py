@@ -0,0 +1,187 @@
+"""
+Off-loop transaction signing for Lighter Exchange.
+
+Signing a transaction in lighter.SignerClient is a blocking call into the
+native signer (a few milliseconds each). For large batches that stalls the
+event loop, so batches can be signed in a worker pool instead:
+
+- "thread": workers share the process's SignerClient; the native signer
+  releases the GIL, so signatures run in parallel.
+- "process": every worker builds its own SignerClient from the account's
+  key material at start-up and signs independently.
+
+Nonces are still reserved in order on the event loop before signing, and the
+signed transactions are returned in request order, so submission keeps strict
+per-key nonce ordering.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+import lighter
+
+from lighter_agno.constants import SIGNING_POOL_MIN_BATCH
+
+SignRequest = Tuple[str, Dict[str, Any]]
+SignResult = Tuple[Any, Optional[str], Optional[str], Optional[str]]
+
+# Per-process state of a "process" pool worker
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_client: Optional[lighter.SignerClient] = None
+
+
+def _init_worker(base_url: str, account_index: int, private_keys: Dict[int, str]) -> None:
+    """Build this worker's SignerClient (its constructor needs a running loop)."""
+    global _worker_loop, _worker_client
+
+    async def _build():
+        return lighter.SignerClient(
+            url=base_url,
+            account_index=account_index,
+            api_private_keys=dict(private_keys),
+        )
+
+    _worker_loop = asyncio.new_event_loop()
+    _worker_client = _worker_loop.run_until_complete(_build())
+
+
+def _sign_in_worker(method: str, kwargs: Dict[str, Any]) -> SignResult:
+    """Sign one transaction with the worker's own SignerClient."""
+    return getattr(_worker_client, method)(**kwargs)
+
+
+def _sign_with(client: lighter.SignerClient, method: str, kwargs: Dict[str, Any]) -> SignResult:
+    """Sign one transaction with a shared SignerClient."""
+    return getattr(client, method)(**kwargs)
+
+
+class SigningPool:
+    """
+    Worker pool that signs transaction batches off the event loop.
+
+    Each request must carry an explicit nonce and api_key_index; the pool
+    only signs, it never touches the nonce manager.
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        mode: str = "thread",
+        workers: Optional[int] = None
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown signing pool mode: {mode}")
+        self.config = config
+        self.mode = mode
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+        self._executor: Executor
+        if mode == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="lighter-signer"
+            )
+        else:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(config["base_url"], config["account_index"], config["private_keys"]),
+            )
+
+    async def sign(
+        self,
+        client: lighter.SignerClient,
+        requests: List[SignRequest],
+    ) -> List[SignResult]:
+        """
+        Sign a batch of requests in parallel, preserving request order.
+
+        Args:
+            client: The account's SignerClient (used by thread workers)
+            requests: (sign method name, kwargs with nonce and api_key_index) pairs
+
+        Returns:
+            (tx_type, tx_info, tx_hash, error) tuples in request order
+        """
+        loop = asyncio.get_running_loop()
+        if self.mode == "thread":
+            calls = [partial(_sign_with, client, method, kwargs) for method, kwargs in requests]
+        else:
+            calls = [partial(_sign_in_worker, method, kwargs) for method, kwargs in requests]
+        return list(await asyncio.gather(*[
+            loop.run_in_executor(self._executor, call) for call in calls
+        ]))
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=False)
+
+
+# Pools keyed by account index
+_pools: Dict[int, SigningPool] = {}
+
+
+def enable_signing_pool(
+    config: dict,
+    mode: str = "thread",
+    workers: Optional[int] = None,
+) -> SigningPool:
+    """
+    Sign this account's batches in a worker pool from now on.
+
+    Batches smaller than SIGNING_POOL_MIN_BATCH are still signed inline, where
+    dispatch overhead would outweigh the parallelism.
+
+    Args:
+        config: Execution config with base_url, account_index and private_keys
+        mode: "thread" or "process"
+        workers: Number of workers (default: CPU count, at most 8)
+
+    Returns:
+        The SigningPool now in use
+    """
+    disable_signing_pool(config["account_index"])
+    pool = SigningPool(config, mode, workers)
+    _pools[config["account_index"]] = pool
+    return pool
+
+
+def disable_signing_pool(account_index: int) -> None:
+    """Stop using (and shut down) an account's signing pool."""
+    pool = _pools.pop(account_index, None)
+    if pool is not None:
+        pool.close()
+
+
+def refresh_signing_pool(config: dict) -> None:
+    """Rebuild an account's signing pool if it predates this config version."""
+    pool = _pools.get(config["account_index"])
+    if pool is not None and config.get("version", 0) > pool.config.get("version", 0):
+        enable_signing_pool(config, pool.mode, pool.workers)
+
+
+def get_signing_pool(account_index: int) -> Optional[SigningPool]:
+    """Return the account's signing pool, if one is enabled."""
+    return _pools.get(account_index)
+
+
+async def sign_requests(
+    client: lighter.SignerClient,
+    requests: List[SignRequest],
+) -> List[SignResult]:
+    """
+    Sign requests with the account's pool when enabled, otherwise inline.
+
+    Args:
+        client: The account's SignerClient
+        requests: (sign method name, kwargs with nonce and api_key_index) pairs
+
+    Returns:
+        (tx_type, tx_info, tx_hash, error) tuples in request order
+    """
+    pool = _pools.get(client.account_index)
+    if pool is None or len(requests) < SIGNING_POOL_MIN_BATCH:
+        return [getattr(client, method)(**kwargs) for method, kwargs in requests]
+    return await pool.sign(client, requests)
@@ -0,0 +1,360 @@
+"""
+Local stop-loss / take-profit triggers for Lighter Exchange.
+
+Trigger levels are kept per market in two sorted lists: levels that fire
+when the price falls to them and levels that fire when it rises to them.
+Each price tick from the shared feed finds the crossed levels with one
+bisect per list, and the fired triggers are sent straight away as
+reduce-only market orders through the shared signer (batched when several
+fire on the same tick).
+"""
+
+import asyncio
+import itertools
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from lighter_agno.constants import TRIGGER_EVENTS
+from lighter_agno.execution.order_index import get_allocator
+from lighter_agno.execution.price_feed import PriceFeed, get_price_feed
+from lighter_agno.execution.signer import get_signer, send_signed, send_signed_bulk
+from lighter_agno.execution.validation import round_price, round_size, to_base_amount, to_price
+from lighter_agno.metrics import metrics
+
+TRIGGER_KINDS = ("stop_loss", "take_profit")
+
+# Sort keys bracketing every sequence number at one price level
+_FIRST, _LAST = float("-inf"), float("inf")
+
+
+class Trigger:
+    """One armed protective exit."""
+
+    def __init__(
+        self,
+        trigger_id: str,
+        kind: str,
+        market: Dict[str, Any],
+        side: str,
+        trigger_price: float,
+        size: float,
+        max_slippage_percent: float,
+        group: Optional[str] = None,
+    ):
+        self.trigger_id = trigger_id
+        self.kind = kind
+        self.market = market
+        self.market_index = market["market_id"]
+        self.side = side
+        self.trigger_price = trigger_price
+        self.size = size
+        self.max_slippage_percent = max_slippage_percent
+        self.group = group
+
+        self.status = "armed"
+        self.created_at = time.time()
+        self.fired_at: Optional[float] = None
+        self.fire_price: Optional[float] = None
+        self.client_order_id: Optional[int] = None
+        self.tx_hash: Optional[str] = None
+        self.error: Optional[str] = None
+        self.reaction_ms: Optional[float] = None
+
+    @property
+    def fires_below(self) -> bool:
+        """True if the trigger fires when the price falls to its level."""
+        # Closing a long (sell): stop below, take profit above; mirrored for shorts
+        return (self.kind == "stop_loss") == (self.side == "sell")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the trigger for tools."""
+        return {
+            "trigger_id": self.trigger_id,
+            "kind": self.kind,
+            "market_index": self.market_index,
+            "side": self.side,
+            "trigger_price": self.trigger_price,
+            "size": self.size,
+            "max_slippage_percent": self.max_slippage_percent,
+            "group": self.group,
+            "status": self.status,
+            "created_at": self.created_at,
+            "fired_at": self.fired_at,
+            "fire_price": self.fire_price,
+            "client_order_id": self.client_order_id,
+            "tx_hash": self.tx_hash,
+            "error": self.error,
+            "reaction_ms": self.reaction_ms,
+        }
+
+
+class TriggerEngine:
+    """
+    Watches every armed trigger of one account against the shared price feed.
+
+    Triggers in the same group are one-cancels-other: when a position's stop
+    loss fires, its take profit is disarmed, and vice versa.
+    """
+
+    def __init__(self, config: dict, feed: Optional[PriceFeed] = None):
+        self.config = config
+        self.account_index = config["account_index"]
+        self.feed = feed or get_price_feed(f"{config['base_url']}/api/v1")
+
+        self._triggers: Dict[str, Trigger] = {}
+        self._below: Dict[int, List[Tuple[float, int, str]]] = {}
+        self._above: Dict[int, List[Tuple[float, int, str]]] = {}
+        self._entries: Dict[str, Tuple[float, int, str]] = {}
+        self._groups: Dict[str, List[str]] = {}
+        self._finished: deque = deque()
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        # In-flight submits; the loop only keeps weak references to tasks
+        self._firing: Set[asyncio.Task] = set()
+
+    # === sorted levels ===
+
+    def _levels(self, trigger: Trigger) -> List[Tuple[float, int, str]]:
+        book = self._below if trigger.fires_below else self._above
+        return book.setdefault(trigger.market_index, [])
+
+    def _disarm(self, trigger: Trigger) -> None:
+        entry = self._entries.pop(trigger.trigger_id, None)
+        if entry is None:
+            return
+        levels = self._levels(trigger)
+        index = bisect_left(levels, entry)
+        if index < len(levels) and levels[index] == entry:
+            del levels[index]
+
+    def _finish(self, trigger: Trigger, status: str) -> None:
+        trigger.status = status
+        if trigger.group is not None:
+            members = self._groups.get(trigger.group, [])
+            if trigger.trigger_id in members:
+                members.remove(trigger.trigger_id)
+            if not members:
+                self._groups.pop(trigger.group, None)
+        # Keep only the most recent finished triggers around for status queries
+        self._finished.append(trigger.trigger_id)
+        if len(self._finished) > TRIGGER_EVENTS:
+            self._triggers.pop(self._finished.popleft(), None)
+
+    def on_prices(self, prices: Dict[int, float], received_at: float) -> None:
+        """Price feed callback: fire every trigger the new prices have crossed."""
+        crossed: List[Tuple[Tuple[float, int, str], float]] = []
+        for market_index, price in prices.items():
+            below = self._below.get(market_index)
+            if below:
+                # Levels at or above the price have been reached from above
+                index = bisect_left(below, (price, _FIRST))
+                crossed.extend((entry, price) for entry in below[index:])
+                del below[index:]
+            above = self._above.get(market_index)
+            if above:
+                index = bisect_right(above, (price, _LAST))
+                crossed.extend((entry, price) for entry in above[:index])
+                del above[:index]
+        if not crossed:
+            return
+
+        fired: List[Trigger] = []
+        for (_, _, trigger_id), price in crossed:
+            trigger = self._triggers[trigger_id]
+            if trigger.status != "armed":
+                # Its one-cancels-other sibling fired on the same tick
+                continue
+            self._entries.pop(trigger_id, None)
+            trigger.status = "fired"
+            trigger.fired_at = time.time()
+            trigger.fire_price = price
+            fired.append(trigger)
+            for sibling_id in list(self._groups.get(trigger.group, ())):
+                sibling = self._triggers[sibling_id]
+                if sibling.status == "armed":
+                    self._disarm(sibling)
+                    sibling.error = f"{trigger_id} fired"
+                    self._finish(sibling, "cancelled")
+
+        if not self._entries:
+            self.feed.unsubscribe(self.on_prices)
+        if fired:
+            task = asyncio.ensure_future(self._fire(fired, received_at))
+            self._firing.add(task)
+            task.add_done_callback(partial(self._fire_done, fired))
+
+    # === firing ===
+
+    def _sign_request(
+        self, trigger: Trigger, client_order_index: int
+    ) -> Tuple[str, Dict[str, Any]]:
+        slippage = trigger.max_slippage_percent / 100
+        if trigger.side == "sell":
+            worst = trigger.fire_price * (1 - slippage)
+        else:
+            worst = trigger.fire_price * (1 + slippage)
+        worst = round_price(trigger.market, worst, trigger.side)
+        return ("sign_create_order", {
+            "market_index": trigger.market_index,
+            "client_order_index": client_order_index,
+            "base_amount": to_base_amount(trigger.market, trigger.size),
+            "price": to_price(trigger.market, worst),
+            "is_ask": trigger.side == "sell",
+            "order_type": 1,  # MARKET
+            "time_in_force": 0,  # IOC
+            "reduce_only": True,
+            "order_expiry": 0,  # IOC orders carry no expiry
+        })
+
+    def _fire_done(self, fired: List[Trigger], task: asyncio.Task) -> None:
+        """Fail the triggers a crashed or cancelled submit left without an outcome."""
+        self._firing.discard(task)
+        if task.cancelled():
+            error = "submit cancelled"
+        elif task.exception() is not None:
+            error = str(task.exception())
+        else:
+            return
+        metrics.incr("trigger.fire_errors")
+        for trigger in fired:
+            if trigger.status == "fired":
+                trigger.error = error
+                self._finish(trigger, "failed")
+
+    async def _fire(self, fired: List[Trigger], received_at: float) -> None:
+        """Send reduce-only market orders for fired triggers, in one batch where possible."""
+        allocator = get_allocator(self.account_index)
+        try:
+            signer = await get_signer(self.config)
+        except Exception as e:
+            for trigger in fired:
+                trigger.error = str(e)
+                self._finish(trigger, "failed")
+            return
+
+        requests = []
+        for trigger in fired:
+            trigger.client_order_id = allocator.allocate({
+                "market_index": trigger.market_index,
+                "side": trigger.side,
+                "size": trigger.size,
+                "price": trigger.fire_price,
+                "type": "market",
+                "reduce_only": True,
+                "purpose": trigger.kind,
+                "trigger_id": trigger.trigger_id,
+            })
+            requests.append(self._sign_request(trigger, trigger.client_order_id))
+
+        results: List[Tuple[Optional[str], Optional[str]]] = []
+        if len(requests) == 1:
+            method, kwargs = requests[0]
+            tx_hash, _, err = await send_signed(
+                signer, method, kwargs, key=fired[0].client_order_id
+            )
+            results.append((tx_hash, err))
+        else:
+            results = await send_signed_bulk(signer, requests)
+
+        acked_at = asyncio.get_running_loop().time()
+        for trigger, (tx_hash, err) in zip(fired, results):
+            trigger.tx_hash = tx_hash
+            if err:
+                trigger.error = str(err)
+                allocator.update(trigger.client_order_id, status="rejected", error=str(err))
+                self._finish(trigger, "failed")
+                continue
+            allocator.update(trigger.client_order_id, status="submitted", tx_hash=tx_hash)
+            trigger.reaction_ms = (acked_at - received_at) * 1e3
+            metrics.record("trigger.reaction", acked_at - received_at, trigger.client_order_id)
+            self._finish(trigger, "submitted")
+
+    # === public API ===
+
+    def arm(
+        self,
+        kind: str,
+        market: Dict[str, Any],
+        side: str,
+        trigger_price: float,
+        size: float,
+        max_slippage_percent: float = 1.0,
+        group: Optional[str] = None,
+    ) -> Trigger:
+        """
+        Arm a stop loss or take profit (must be called on the execution loop).
+
+        Args:
+            kind: 'stop_loss' or 'take_profit'
+            market: Market metadata from /orderBookDetails
+            side: Side of the exit order ('sell' closes a long, 'buy' a short)
+            trigger_price: Last trade price that fires the exit
+            size: Size to close in base asset
+            max_slippage_percent: Max distance of the exit price from the fire price
+            group: One-cancels-other group shared with sibling triggers
+
+        Returns:
+            The armed Trigger
+        """
+        if kind not in TRIGGER_KINDS:
+            raise ValueError(f"Unknown trigger kind: {kind}")
+        prefix = "sl" if kind == "stop_loss" else "tp"
+        trigger = Trigger(
+            f"{prefix}-{next(self._ids)}", kind, market, side, trigger_price,
+            round_size(market, size), max_slippage_percent, group
+        )
+        entry = (trigger_price, next(self._seq), trigger.trigger_id)
+        self._triggers[trigger.trigger_id] = trigger
+        self._entries[trigger.trigger_id] = entry
+        if group is not None:
+            self._groups.setdefault(group, []).append(trigger.trigger_id)
+        insort(self._levels(trigger), entry)
+        self.feed.subscribe(self.on_prices)
+        return trigger
+
+    def cancel(self, trigger_id: str) -> Optional[Trigger]:
+        """Disarm a trigger that has not fired yet."""
+        trigger = self._triggers.get(trigger_id)
+        if trigger is not None and trigger.status == "armed":
+            self._disarm(trigger)
+            self._finish(trigger, "cancelled")
+            if not self._entries:
+                self.feed.unsubscribe(self.on_prices)
+        return trigger
+
+    def get(self, trigger_id: str) -> Optional[Trigger]:
+        """Return a trigger by ID."""
+        return self._triggers.get(trigger_id)
+
+    def list(self, active_only: bool = False, market_index: Optional[int] = None) -> List[Trigger]:
+        """Return triggers, optionally only armed ones and only for one market."""
+        return [
+            t for t in self._triggers.values()
+            if (not active_only or t.status == "armed")
+            and (market_index is None or t.market_index == market_index)
+        ]
+
+
+# Engines keyed by (event loop id, account index)
+_engines: Dict[Tuple[int, int], TriggerEngine] = {}
+
+
+def get_trigger_engine(config: dict) -> TriggerEngine:
+    """
+    Get the trigger engine for an account on the running loop.
+
+    Args:
+        config: Execution config with base_url, account_index and private_keys
+
+    Returns:
+        TriggerEngine instance
+    """
+    key = (id(asyncio.get_running_loop()), config["account_index"])
+    engine = _engines.get(key)
+    if engine is None:
+        engine = TriggerEngine(config)
+        _engines[key] = engine
+    return engine
@@ -0,0 +1,294 @@
+"""
+Local pre-trade validation for Lighter Exchange orders.
+
+Checks orders against cached market metadata and account state before they
+are signed, so orders the exchange would reject never leave the process.
+"""
+
+import math
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from lighter_agno.client import LighterApiError
+from lighter_agno.constants import ACCOUNT_RECHECK_AGE
+from lighter_agno.market_cache import MarketDataCache
+from lighter_agno.metrics import metrics
+
+# Margin fractions in /orderBookDetails are expressed in 1/10000ths
+MARGIN_FRACTION_SCALE = 10_000
+
+# Tolerance when checking that a float lands on the tick grid
+_TICK_EPSILON = 1e-9
+
+
+class OrderValidationError(Exception):
+    """Raised when an order fails local pre-trade validation."""
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+def _on_grid(value: float, decimals: int) -> bool:
+    """Return True if value has at most `decimals` decimal places."""
+    scaled = value * 10 ** decimals
+    return abs(scaled - round(scaled)) < _TICK_EPSILON * max(1.0, abs(scaled))
+
+
+def to_base_amount(market: Dict[str, Any], size: float) -> int:
+    """Convert a size in base asset to the exchange's integer base amount."""
+    return int(round(size * 10 ** market["size_decimals"]))
+
+
+def to_price(market: Dict[str, Any], price: float) -> int:
+    """Convert a USD price to the exchange's integer price."""
+    return int(round(price * 10 ** market["price_decimals"]))
+
+
+def round_size(market: Dict[str, Any], size: float) -> float:
+    """Round a size down to the market's size precision."""
+    scale = 10 ** market["size_decimals"]
+    return math.floor(size * scale + _TICK_EPSILON * scale) / scale
+
+
+def round_price(market: Dict[str, Any], price: float, side: str) -> float:
+    """Round a worst-acceptable price to the tick grid, never loosening it.
+
+    Buys round down and sells round up, so the limit stays at least as tight.
+    """
+    scale = 10 ** market["price_decimals"]
+    rounded = math.floor(price * scale) if side == "buy" else math.ceil(price * scale)
+    return rounded / scale
+
+
+def _signed_position(account: Dict[str, Any], market_id: int) -> float:
+    """Return the signed position size (long > 0, short < 0) for a market."""
+    for p in account.get("positions") or []:
+        if p["market_id"] == market_id:
+            return float(p["position"]) * (1 if p["sign"] == 1 else -1)
+    return 0.0
+
+
+def check_market(market: Dict[str, Any], size: float, price: float) -> None:
+    """
+    Validate an order against market metadata only (precision, minimums, quote limit).
+
+    Pure function with no I/O.
+
+    Raises:
+        OrderValidationError: If the order would be rejected by the exchange
+    """
+    if size <= 0:
+        raise OrderValidationError(f"Size must be positive, got {size}", "invalid_size")
+    if price <= 0:
+        raise OrderValidationError(f"Price must be positive, got {price}", "invalid_price")
+
+    size_decimals = market["size_decimals"]
+    price_decimals = market["price_decimals"]
+    if not _on_grid(size, size_decimals):
+        raise OrderValidationError(
+            f"Size {size} has more than {size_decimals} decimals for {market['symbol']}",
+            "size_precision",
+        )
+    if not _on_grid(price, price_decimals):
+        raise OrderValidationError(
+            f"Price {price} has more than {price_decimals} decimals for {market['symbol']}",
+            "price_precision",
+        )
+
+    min_base = float(market.get("min_base_amount") or 0)
+    if size < min_base:
+        raise OrderValidationError(
+            f"Size {size} is below the minimum {min_base} for {market['symbol']}",
+            "below_min_size",
+        )
+
+    notional = size * price
+    min_quote = float(market.get("min_quote_amount") or 0)
+    if notional < min_quote:
+        raise OrderValidationError(
+            f"Notional {notional:.2f} is below the minimum {min_quote} for {market['symbol']}",
+            "below_min_notional",
+        )
+    max_quote = float(market.get("order_quote_limit") or 0)
+    if max_quote and notional > max_quote:
+        raise OrderValidationError(
+            f"Notional {notional:.2f} exceeds the order limit {max_quote} for {market['symbol']}",
+            "above_max_notional",
+        )
+
+
+def check_account(
+    market: Dict[str, Any],
+    side: str,
+    size: float,
+    price: float,
+    reduce_only: bool,
+    account: Optional[Dict[str, Any]],
+) -> None:
+    """
+    Validate an order against an /account snapshot (reduce-only and margin).
+
+    Pure function with no I/O; does nothing without a snapshot.
+
+    Raises:
+        OrderValidationError: If the order would be rejected by the exchange
+    """
+    if account is None:
+        return
+
+    position = _signed_position(account, market["market_id"])
+    if reduce_only:
+        reduces = (side == "buy" and position < 0) or (side == "sell" and position > 0)
+        if not reduces:
+            raise OrderValidationError(
+                f"Reduce-only {side} has no opposing position in {market['symbol']}",
+                "reduce_only_no_position",
+            )
+        if size > abs(position) + 10 ** -market["size_decimals"] / 2:
+            raise OrderValidationError(
+                f"Reduce-only size {size} exceeds the position {abs(position)}",
+                "reduce_only_exceeds_position",
+            )
+        return
+
+    new_position = position + (size if side == "buy" else -size)
+    added_exposure = abs(new_position) - abs(position)
+    min_imf = float(market.get("min_initial_margin_fraction") or 0) / MARGIN_FRACTION_SCALE
+    if added_exposure > 0 and min_imf > 0:
+        required_margin = added_exposure * price * min_imf
+        available = float(account.get("available_balance") or 0)
+        if required_margin > available:
+            raise OrderValidationError(
+                f"Order needs at least {required_margin:.2f} margin at max leverage "
+                f"{1 / min_imf:.0f}x, only {available:.2f} available",
+                "insufficient_margin",
+            )
+
+
+def check_order(
+    market: Dict[str, Any],
+    side: Optional[str],
+    size: float,
+    price: float,
+    reduce_only: bool = False,
+    account: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Validate an order against market metadata and, optionally, account state.
+
+    Pure function with no I/O.
+
+    Args:
+        market: Market entry from /orderBookDetails
+        side: 'buy' or 'sell' (None for in-place modifies, skips account checks)
+        size: Order size in base asset
+        price: Limit price (or worst acceptable price for market orders)
+        reduce_only: Whether the order may only reduce a position
+        account: /account snapshot for reduce-only and margin checks
+
+    Raises:
+        OrderValidationError: If the order would be rejected by the exchange
+    """
+    check_market(market, size, price)
+    if side is not None:
+        check_account(market, side, size, price, reduce_only, account)
+
+
+def validate_order(
+    cache: MarketDataCache,
+    account_index: int,
+    market_index: int,
+    side: Optional[str],
+    size: float,
+    price: float,
+    reduce_only: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Validate an order using cached reference data and record metrics.
+
+    Market metadata comes from the cache (fetched at most once per TTL), and
+    the account snapshot is only read for orders with a side, after the
+    market-only checks have passed. The snapshot is kept warm by the position
+    watcher and position reads; if it rejects the order but is older than
+    ACCOUNT_RECHECK_AGE, the order is rechecked against a fresh one, so a
+    snapshot predating the latest fills never causes a false rejection. The
+    pure checks are timed as `pretrade.validation` and
+    `pretrade.account_validation`. If reference data cannot be loaded, the
+    checks that need it are skipped and the exchange decides.
+
+    Args:
+        cache: Reference data cache
+        account_index: Account placing the order
+        market_index: Market ID
+        side: 'buy' or 'sell' (None for in-place modifies)
+        size: Order size in base asset
+        price: Limit price (or worst acceptable price)
+        reduce_only: Whether the order may only reduce a position
+
+    Returns:
+        The market metadata the order was validated against, or None if
+        validation was skipped
+
+    Raises:
+        OrderValidationError: If the order is rejected locally
+    """
+    try:
+        market = cache.get_market(market_index)
+    except (LighterApiError, httpx.HTTPError):
+        metrics.incr("pretrade.skipped")
+        return None
+
+    try:
+        if market is None:
+            raise OrderValidationError(f"Unknown market {market_index}", "unknown_market")
+        _timed("pretrade.validation", check_market, market, size, price)
+        if side is not None:
+            _validate_account(cache, account_index, market, side, size, price, reduce_only)
+    except OrderValidationError as e:
+        metrics.incr("pretrade.rejected")
+        metrics.incr(f"pretrade.rejected.{e.reason}")
+        raise
+
+    metrics.incr("pretrade.accepted")
+    return market
+
+
+def _timed(name: str, check: Callable[..., None], *args: Any) -> None:
+    start = time.perf_counter()
+    try:
+        check(*args)
+    finally:
+        metrics.observe(name, time.perf_counter() - start)
+
+
+def _validate_account(
+    cache: MarketDataCache,
+    account_index: int,
+    market: Dict[str, Any],
+    side: str,
+    size: float,
+    price: float,
+    reduce_only: bool,
+) -> None:
+    """Run the account checks on the cached snapshot, rechecking stale rejections."""
+    args = (market, side, size, price, reduce_only)
+    try:
+        account = cache.get_account(account_index)
+    except (LighterApiError, httpx.HTTPError):
+        metrics.incr("pretrade.account_skipped")
+        return
+    try:
+        _timed("pretrade.account_validation", check_account, *args, account)
+    except OrderValidationError:
+        if cache.account_age(account_index) <= ACCOUNT_RECHECK_AGE:
+            raise
+        try:
+            account = cache.get_account(account_index, max_age=0)
+        except (LighterApiError, httpx.HTTPError):
+            metrics.incr("pretrade.account_skipped")
+            return
+        metrics.incr("pretrade.account_rechecked")
+        _timed("pretrade.account_validation", check_account, *args, account)
@@ -0,0 +1,111 @@
+"""
+Cached reference data for Lighter Exchange.
+
+Keeps market metadata (/orderBookDetails) and account snapshots (/account)
+in memory with per-dataset TTLs, so the order path can read them without a
+network round-trip.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from lighter_agno.client import LighterClient
+from lighter_agno.constants import ACCOUNT_CACHE_TTL, BASE_URL, MARKET_CACHE_TTL
+
+
+class MarketDataCache:
+    """
+    TTL cache over market and account reference data.
+
+    Markets are loaded all at once (one /orderBookDetails call covers every
+    market); accounts are cached per account index.
+    """
+
+    def __init__(
+        self,
+        client: LighterClient,
+        market_ttl: float = MARKET_CACHE_TTL,
+        account_ttl: float = ACCOUNT_CACHE_TTL
+    ):
+        self.client = client
+        self.market_ttl = market_ttl
+        self.account_ttl = account_ttl
+
+        self._lock = threading.Lock()
+        self._markets: Dict[int, Dict[str, Any]] = {}
+        self._markets_loaded_at = 0.0
+        self._accounts: Dict[int, tuple] = {}
+
+    def _load_markets(self) -> None:
+        """Fetch metadata for all markets in one request."""
+        data = self.client.get("/orderBookDetails", {})
+        markets = {
+            detail["market_id"]: detail
+            for key in ("order_book_details", "spot_order_book_details")
+            for detail in data.get(key) or []
+        }
+        with self._lock:
+            self._markets = markets
+            self._markets_loaded_at = time.monotonic()
+
+    def get_markets(self) -> Dict[int, Dict[str, Any]]:
+        """Return metadata for all markets, refreshing once the TTL has expired."""
+        if time.monotonic() - self._markets_loaded_at > self.market_ttl:
+            self._load_markets()
+        return self._markets
+
+    def get_market(self, market_id: int) -> Optional[Dict[str, Any]]:
+        """Return metadata for one market, or None if the market is unknown."""
+        return self.get_markets().get(market_id)
+
+    def get_account(
+        self,
+        account_index: int,
+        max_age: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a recent /account snapshot, fetching one if the cached copy is
+        older than `max_age` seconds (default: the account TTL).
+        """
+        cached = self._accounts.get(account_index)
+        ttl = self.account_ttl if max_age is None else max_age
+        if cached and time.monotonic() - cached[0] <= ttl:
+            return cached[1]
+        data = self.client.get("/account", {"by": "index", "value": str(account_index)})
+        accounts = data.get("accounts") or []
+        account = accounts[0] if accounts else None
+        self.put_account(account_index, account)
+        return account
+
+    def put_account(self, account_index: int, account: Optional[Dict[str, Any]]) -> None:
+        """Store an account snapshot fetched elsewhere, so the next read is free."""
+        with self._lock:
+            self._accounts[account_index] = (time.monotonic(), account)
+
+    def account_age(self, account_index: int) -> float:
+        """Seconds since the cached snapshot of an account was stored (inf if none)."""
+        cached = self._accounts.get(account_index)
+        return time.monotonic() - cached[0] if cached else math.inf
+
+
+# Caches keyed by API base URL
+_caches: Dict[str, MarketDataCache] = {}
+
+
+def get_market_cache(base_url: str = BASE_URL) -> MarketDataCache:
+    """
+    Get or create the reference data cache for an API base URL.
+
+    Args:
+        base_url: Main API URL including /api/v1
+
+    Returns:
+        MarketDataCache instance
+    """
+    cache = _caches.get(base_url)
+    if cache is None:
+        cache = MarketDataCache(LighterClient(base_url=base_url))
+        _caches[base_url] = cache
+    return cache
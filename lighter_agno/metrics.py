@@ -0,0 +1,190 @@
+"""
+In-process metrics for Lighter Exchange tools.
+
+Counters, latency histograms and order path spans recorded on the order
+path. Spans can also be appended to an NDJSON trace file (one JSON object
+per line) for offline tail-latency analysis.
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, Optional
+
+from lighter_agno.constants import TRACE_FILE
+
+# Histogram bucket upper bounds in microseconds; the last bucket is unbounded
+HISTOGRAM_BUCKETS_US = (
+    50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 50_000,
+    100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000,
+)
+PERCENTILES = (50, 90, 99)
+
+
+def _bucket_label(index: int) -> str:
+    if index < len(HISTOGRAM_BUCKETS_US):
+        return f"le_{HISTOGRAM_BUCKETS_US[index]}"
+    return "inf"
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters, timings and spans.
+
+    Timings keep count, total, min, max and a fixed-bucket histogram per
+    name; they are cheap enough to record on every order.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._timings: Dict[str, Dict[str, Any]] = {}
+        self._trace: Optional[IO[str]] = None
+        self._trace_path: Optional[str] = None
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration in seconds."""
+        bucket = bisect_left(HISTOGRAM_BUCKETS_US, seconds * 1e6)
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = self._timings[name] = {
+                    "count": 0, "total": 0.0, "min": seconds, "max": seconds,
+                    "buckets": [0] * (len(HISTOGRAM_BUCKETS_US) + 1),
+                }
+            timing["count"] += 1
+            timing["total"] += seconds
+            timing["min"] = min(timing["min"], seconds)
+            timing["max"] = max(timing["max"], seconds)
+            timing["buckets"][bucket] += 1
+
+    def record(self, name: str, seconds: float, key: Optional[int] = None, **fields) -> None:
+        """
+        Record a completed span: observe its duration and trace it.
+
+        Args:
+            name: Span name, e.g. "order.submit"
+            seconds: Span duration in seconds
+            key: Client order index the span belongs to, if any
+            **fields: Extra attributes written to the trace record
+        """
+        self.observe(name, seconds)
+        if self._trace is None:
+            return
+        line = json.dumps({
+            "ts": time.time(),
+            "span": name,
+            "key": key,
+            "duration_us": round(seconds * 1e6, 1),
+            **fields,
+        }, default=str)
+        with self._lock:
+            if self._trace is not None:
+                self._trace.write(line + "\n")
+
+    @contextmanager
+    def span(self, name: str, key: Optional[int] = None, **fields) -> Iterator[None]:
+        """
+        Time the enclosed block as a span.
+
+        Spans that raise are still recorded, with the exception type in
+        the trace record's "error" field.
+
+        Args:
+            name: Span name, e.g. "order.sign"
+            key: Client order index the span belongs to, if any
+            **fields: Extra attributes written to the trace record
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.record(name, time.perf_counter() - start, key, error=type(e).__name__, **fields)
+            raise
+        self.record(name, time.perf_counter() - start, key, **fields)
+
+    def enable_trace(self, path: str) -> None:
+        """Append every span to an NDJSON trace file from now on."""
+        self.disable_trace()
+        # Kept open until disable_trace()
+        trace = open(path, "a", buffering=1)  # noqa: SIM115
+        with self._lock:
+            self._trace, self._trace_path = trace, path
+
+    def disable_trace(self) -> None:
+        """Stop writing the trace file."""
+        with self._lock:
+            trace, self._trace, self._trace_path = self._trace, None, None
+        if trace is not None:
+            trace.close()
+
+    def snapshot(self, prefix: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return counters and timing summaries (durations in microseconds).
+
+        Percentiles are estimated from the histogram as the upper bound of
+        the bucket they fall in, capped at the observed maximum.
+
+        Args:
+            prefix: Only include counters and timings whose name starts with this
+        """
+        with self._lock:
+            counters = {
+                name: value for name, value in self._counters.items()
+                if prefix is None or name.startswith(prefix)
+            }
+            timings = {
+                name: {**t, "buckets": list(t["buckets"])}
+                for name, t in self._timings.items()
+                if prefix is None or name.startswith(prefix)
+            }
+            trace_path = self._trace_path
+
+        summaries = {}
+        for name, t in timings.items():
+            summary = {
+                "count": int(t["count"]),
+                "avg": t["total"] / t["count"] * 1e6,
+                "min": t["min"] * 1e6,
+                "max": t["max"] * 1e6,
+            }
+            for pct in PERCENTILES:
+                summary[f"p{pct}"] = _percentile(t, pct)
+            summary["histogram"] = {
+                _bucket_label(i): n for i, n in enumerate(t["buckets"]) if n
+            }
+            summaries[name] = summary
+
+        return {"counters": counters, "timings_us": summaries, "trace_file": trace_path}
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+
+def _percentile(timing: Dict[str, Any], pct: int) -> float:
+    """Estimate a percentile (microseconds) from a timing's histogram."""
+    rank = timing["count"] * pct / 100
+    seen = 0
+    for index, count in enumerate(timing["buckets"]):
+        seen += count
+        if count and seen >= rank:
+            if index < len(HISTOGRAM_BUCKETS_US):
+                return min(float(HISTOGRAM_BUCKETS_US[index]), timing["max"] * 1e6)
+            break
+    return timing["max"] * 1e6
+
+
+# Process-wide registry
+metrics = Metrics()
+if TRACE_FILE:
+    metrics.enable_trace(TRACE_FILE)
@@ -0,0 +1,60 @@
+"""
+Client-side rate limiting for Lighter Exchange API calls.
+
+A token bucket shared by background pollers, so sweeps over many pending
+items never exceed the request budget the exchange allows.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` requests per second with bursts of `burst`.
+
+    Safe to share between event loops and threads: the bucket itself is
+    guarded by a lock and waiting happens outside it.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take `tokens` from the bucket and return how long to wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(-self._tokens / self.rate, 0.0)
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens only if they are available right now."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait until `tokens` requests may be made."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, tokens: float = 1) -> None:
+        """Blocking variant of acquire() for synchronous callers."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
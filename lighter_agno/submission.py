@@ -0,0 +1,351 @@
+"""
+Idempotent transaction submission for Lighter Exchange.
+
+Every signed transaction (or batch) is fingerprinted before it is sent and
+its outcome is journaled, in memory and in an append-only file under
+STATE_DIR (written in batches off the order path). Sending the same signed
+bytes again returns the journaled outcome instead of resubmitting, and a
+submission that times out is reconciled against the exchange by tx hash
+before it is sent again. Resending is only
+ever done with the same signed bytes (same nonce), which the exchange can
+execute at most once, so the order path can use short timeouts without
+risking double fills.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from lighter_agno.constants import (
+    STATE_DIR,
+    TX_JOURNAL_SIZE,
+    TX_RECONCILE_ATTEMPTS,
+    TX_RECONCILE_DELAY,
+    TX_SUBMIT_TIMEOUT,
+)
+from lighter_agno.metrics import metrics
+
+CODE_OK = 200
+
+
+def fingerprint(payloads: List[Any]) -> str:
+    """Stable fingerprint of the signed payload(s) of one submission."""
+    return hashlib.sha256(json.dumps(payloads, separators=(",", ":")).encode()).hexdigest()
+
+
+class JournaledResponse:
+    """Send response stand-in for a submission settled from the journal or by reconciliation."""
+
+    def __init__(self, code: int, message: str):
+        self.code = code
+        self.message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the response as a JSON-able dict, like the SDK response models."""
+        return {"code": self.code, "message": self.message}
+
+
+def _response_field(response: Any, name: str) -> Any:
+    """Read a field from an SDK response model or a raw JSON response."""
+    if isinstance(response, dict):
+        return response.get(name)
+    return getattr(response, name, None)
+
+
+def _server_answered(e: Exception) -> bool:
+    """True if the exception carries an HTTP status, i.e. the exchange replied."""
+    return getattr(e, "status", None) is not None or getattr(e, "status_code", None) is not None
+
+
+class SubmissionJournal:
+    """
+    Bounded record of submissions by fingerprint, mirrored to an NDJSON file.
+
+    Entries are {"fingerprint", "status": "sending" | "accepted" | "rejected"
+    | "unknown", "tx_hashes", "code", "message", "updated_at", ...}. Records
+    update memory immediately; a writer thread appends them to the file in
+    batches, so the order path never does file I/O. The file is compacted to
+    the live entries whenever it has grown past twice the bound.
+    """
+
+    def __init__(self, path: str, max_entries: int = TX_JOURNAL_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lines = 0
+        self._load()
+
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="lighter-tx-journal", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _load(self) -> None:
+        lines = 0
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash; later lines are still usable
+                        continue
+                    self._entries[entry["fingerprint"]] = entry
+                    self._entries.move_to_end(entry["fingerprint"])
+        except OSError:
+            return
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._lines = lines
+        if lines > 2 * self.max_entries:
+            self._compact(list(self._entries.values()))
+
+    def _compact(self, entries: List[Dict[str, Any]]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._lines = len(entries)
+
+    def _write_loop(self) -> None:
+        while True:
+            lines = [self._queue.get()]
+            # Everything recorded meanwhile goes out in the same append
+            while True:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._append(lines)
+            except OSError:
+                metrics.incr("tx_submit.journal_errors")
+            finally:
+                for _ in lines:
+                    self._queue.task_done()
+
+    def _append(self, lines: List[str]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            f.writelines(lines)
+        self._lines += len(lines)
+        if self._lines > 2 * self.max_entries:
+            # Entries recorded after this snapshot are still queued and land after it
+            with self._lock:
+                entries = list(self._entries.values())
+            self._compact(entries)
+
+    def flush(self) -> None:
+        """Block until every recorded entry has been written to the file."""
+        self._queue.join()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the journaled entry for a fingerprint, if any."""
+        return self._entries.get(key)
+
+    def record(self, key: str, **fields: Any) -> Dict[str, Any]:
+        """Merge fields into a fingerprint's entry and queue it for the journal file."""
+        with self._lock:
+            entry = {**self._entries.get(key, {}), **fields, "fingerprint": key,
+                     "updated_at": time.time()}
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._queue.put(json.dumps(entry) + "\n")
+        return entry
+
+
+_journal: Optional[SubmissionJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_journal() -> SubmissionJournal:
+    """Get the process-wide submission journal."""
+    global _journal
+
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = SubmissionJournal(os.path.join(STATE_DIR, "submissions.ndjson"))
+    return _journal
+
+
+def _lookup_any(found: List[Any]) -> bool:
+    return any(f is True for f in found)
+
+
+async def _reconcile(tx_hashes: List[str], lookup: Callable[[str], Awaitable[bool]]) -> bool:
+    """Return True once any of the hashes is known to the exchange (batches land whole)."""
+    for attempt in range(TX_RECONCILE_ATTEMPTS if tx_hashes else 0):
+        if attempt:
+            await asyncio.sleep(TX_RECONCILE_DELAY)
+        found = await asyncio.gather(*(lookup(h) for h in tx_hashes), return_exceptions=True)
+        if _lookup_any(found):
+            return True
+    return False
+
+
+def _reconcile_sync(tx_hashes: List[str], lookup: Callable[[str], bool]) -> bool:
+    """Blocking variant of _reconcile()."""
+    for attempt in range(TX_RECONCILE_ATTEMPTS if tx_hashes else 0):
+        if attempt:
+            time.sleep(TX_RECONCILE_DELAY)
+        if _lookup_any([lookup(h) for h in tx_hashes]):
+            return True
+    return False
+
+
+def _from_journal(journal: SubmissionJournal, key: str) -> Optional[Dict[str, Any]]:
+    """Return the journal entry if it may need settling, counting duplicates."""
+    entry = journal.get(key)
+    if entry is not None and entry["status"] == "accepted":
+        metrics.incr("tx_submit.duplicates")
+    return entry
+
+
+def _reconciled(journal: SubmissionJournal, key: str, message: str) -> JournaledResponse:
+    metrics.incr("tx_submit.reconciled")
+    journal.record(key, status="accepted", reconciled=True)
+    return JournaledResponse(CODE_OK, message)
+
+
+def _record_response(journal: SubmissionJournal, key: str, response: Any) -> Any:
+    code = _response_field(response, "code")
+    journal.record(
+        key,
+        status="accepted" if code in (None, CODE_OK) else "rejected",
+        code=code,
+        message=_response_field(response, "message"),
+    )
+    return response
+
+
+def _record_error(journal: SubmissionJournal, key: str, e: Exception) -> None:
+    # A transport error may still have delivered the transaction
+    journal.record(key, status="rejected" if _server_answered(e) else "unknown", message=str(e))
+
+
+def _timed_out(tx_hashes: List[str]) -> TimeoutError:
+    return TimeoutError(
+        f"Submission timed out twice and {len(tx_hashes)} tx hash(es) are unknown to the "
+        "exchange; resubmit the same signed transaction to reconcile"
+    )
+
+
+async def submit_once(
+    payloads: List[Any],
+    tx_hashes: List[str],
+    send: Callable[[], Awaitable[Any]],
+    lookup: Callable[[str], Awaitable[bool]],
+    timeout: float = TX_SUBMIT_TIMEOUT,
+) -> Any:
+    """
+    Send signed transactions at most once.
+
+    Args:
+        payloads: The signed payload(s) being sent, used as the fingerprint
+        tx_hashes: Hashes of the signed transactions, for reconciliation
+        send: Coroutine factory performing the actual /sendTx(Batch) call
+        lookup: Coroutine returning True if a tx hash is known to the exchange
+        timeout: Seconds to wait for the send before reconciling
+
+    Returns:
+        The send response, or a JournaledResponse when the outcome came from
+        the journal or from reconciliation
+
+    Raises:
+        TimeoutError: If the send timed out twice and the exchange has no
+            record of the transactions (the entry stays "unknown", so the
+            next identical submission reconciles first)
+        Exception: Whatever the send raised otherwise
+    """
+    journal = get_journal()
+    key = fingerprint(payloads)
+    entry = _from_journal(journal, key)
+    if entry is not None:
+        if entry["status"] == "accepted":
+            return JournaledResponse(CODE_OK, "already submitted")
+        if entry["status"] in ("sending", "unknown") and await _reconcile(tx_hashes, lookup):
+            return _reconciled(journal, key, "reconciled with the exchange")
+
+    journal.record(key, status="sending", tx_hashes=tx_hashes)
+    # The second attempt only happens after reconciliation found nothing
+    for _ in range(2):
+        try:
+            response = await asyncio.wait_for(send(), timeout)
+        except asyncio.TimeoutError:
+            metrics.incr("tx_submit.timeouts")
+            journal.record(key, status="unknown")
+            if await _reconcile(tx_hashes, lookup):
+                return _reconciled(journal, key, "reconciled with the exchange after a timeout")
+            continue
+        except Exception as e:
+            _record_error(journal, key, e)
+            raise
+        return _record_response(journal, key, response)
+    raise _timed_out(tx_hashes)
+
+
+def submit_once_sync(
+    payloads: List[Any],
+    tx_hashes: List[str],
+    send: Callable[[], Any],
+    lookup: Callable[[str], bool],
+    timeout_errors: Tuple[Type[BaseException], ...],
+) -> Any:
+    """
+    Blocking variant of submit_once() for synchronous HTTP clients.
+
+    The send callable enforces its own timeout and signals it by raising one
+    of `timeout_errors`.
+    """
+    journal = get_journal()
+    key = fingerprint(payloads)
+    entry = _from_journal(journal, key)
+    if entry is not None:
+        if entry["status"] == "accepted":
+            return JournaledResponse(CODE_OK, "already submitted")
+        if entry["status"] in ("sending", "unknown") and _reconcile_sync(tx_hashes, lookup):
+            return _reconciled(journal, key, "reconciled with the exchange")
+
+    journal.record(key, status="sending", tx_hashes=tx_hashes)
+    for _ in range(2):
+        try:
+            response = send()
+        except timeout_errors:
+            metrics.incr("tx_submit.timeouts")
+            journal.record(key, status="unknown")
+            if _reconcile_sync(tx_hashes, lookup):
+                return _reconciled(journal, key, "reconciled with the exchange after a timeout")
+            continue
+        except Exception as e:
+            _record_error(journal, key, e)
+            raise
+        return _record_response(journal, key, response)
+    raise _timed_out(tx_hashes)
+
+
+def sdk_lookup(client) -> Callable[[str], Awaitable[bool]]:
+    """Tx hash lookup through a SignerClient's transaction API."""
+    async def lookup(tx_hash: str) -> bool:
+        try:
+            await client.tx_api.tx(by="hash", value=tx_hash)
+        except Exception:
+            return False
+        return True
+    return lookup
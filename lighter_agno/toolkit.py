@@ -1,7 +1,7 @@
 """
 Lighter Exchange Toolkit for Agno
 
-Provides a complete toolkit with all 40 tools for Lighter Exchange integration.
+Provides a complete toolkit with all 45 tools for Lighter Exchange integration.
 """
 
 from typing import Optional, List, Callable
@@ -40,8 +40,13 @@ from lighter_agno.tools.markets import (
 from lighter_agno.tools.trading import (
     get_trades,
     get_recent_trades,
+    get_trade_stats,
+    get_bars,
     get_candlesticks,
+    get_indicators,
     get_funding_rates,
+    scan_funding,
+    backfill_history,
 )
 
 from lighter_agno.tools.transactions import (
@@ -75,11 +80,11 @@ class LighterExchangeTools:
     """
     Agno-compatible toolkit for Lighter Exchange.
 
-    Provides 40 tools organized into 8 categories:
+    Provides 45 tools organized into 8 categories:
     - Account (11 tools): Account management and queries
     - Orders (5 tools): Order management
     - Markets (6 tools): Market data
-    - Trading (4 tools): Trade history and candlesticks
+    - Trading (9 tools): Trades, trade stats, bars, candlesticks, indicators, funding, backfill
     - Transactions (3 tools): Transaction signing and submission
     - API Keys (3 tools): API key management
     - Bridge (3 tools): Deposits and withdrawals
@@ -159,8 +164,13 @@ class LighterExchangeTools:
             self._tools.extend([
                 get_trades,
                 get_recent_trades,
+                get_trade_stats,
+                get_bars,
                 get_candlesticks,
+                get_indicators,
                 get_funding_rates,
+                scan_funding,
+                backfill_history,
             ])
 
         if include_transactions:
@@ -214,7 +224,7 @@ class LighterExchangeTools:
 # Convenience function to get all tools as a flat list
 def get_all_tools() -> List[Callable]:
     """
-    Get all 40 Lighter Exchange tools as a flat list.
+    Get all 45 Lighter Exchange tools as a flat list.
 
     This can be used directly with Agno:
         from agno.agent import Agent
@@ -223,7 +233,7 @@ def get_all_tools() -> List[Callable]:
         agent = Agent(tools=get_all_tools())
 
     Returns:
-        List of all 40 tool functions
+        List of all 45 tool functions
     """
     return LighterExchangeTools().tools
 
@@ -269,7 +279,7 @@ def get_market_tools() -> List[Callable]:
 
 
 def get_trading_tools() -> List[Callable]:
-    """Get only trading history tools (4 tools)."""
+    """Get only trading history tools (9 tools)."""
     return LighterExchangeTools(
         include_account=False,
         include_orders=False,
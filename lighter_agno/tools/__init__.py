@@ -1,7 +1,7 @@
 """
 Lighter Exchange Tools for Agno
 
-This module exports all 40 tools organized by category.
+This module exports all 45 tools organized by category.
 """
 
 from lighter_agno.tools.account import (
@@ -38,8 +38,13 @@ from lighter_agno.tools.markets import (
 from lighter_agno.tools.trading import (
     get_trades,
     get_recent_trades,
+    get_trade_stats,
+    get_bars,
     get_candlesticks,
+    get_indicators,
     get_funding_rates,
+    scan_funding,
+    backfill_history,
 )
 
 from lighter_agno.tools.transactions import (
@@ -103,8 +108,13 @@ MARKET_TOOLS = [
 TRADING_TOOLS = [
     get_trades,
     get_recent_trades,
+    get_trade_stats,
+    get_bars,
     get_candlesticks,
+    get_indicators,
     get_funding_rates,
+    scan_funding,
+    backfill_history,
 ]
 
 TRANSACTION_TOOLS = [
@@ -133,7 +143,7 @@ INFO_TOOLS = [
     get_referral_info,
 ]
 
-# All tools combined (40 total)
+# All tools combined (45 total)
 ALL_TOOLS = (
     ACCOUNT_TOOLS +
     ORDER_TOOLS +
@@ -174,8 +184,13 @@ __all__ = [
     # Trading tools
     "get_trades",
     "get_recent_trades",
+    "get_trade_stats",
+    "get_bars",
     "get_candlesticks",
+    "get_indicators",
     "get_funding_rates",
+    "scan_funding",
+    "backfill_history",
     # Transaction tools
     "get_next_nonce",
     "send_transaction",
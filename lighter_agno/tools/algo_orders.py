@@ -0,0 +1,186 @@
+"""
+Algorithmic order tools for Lighter Exchange.
+
+TWAP and iceberg parent orders executed by the in-process scheduler.
+"""
+
+import json
+from typing import Literal, Optional
+
+import httpx
+
+from lighter_agno.client import LighterApiError
+from lighter_agno.config import ConfigError, get_config
+from lighter_agno.execution.scheduler import get_scheduler
+from lighter_agno.execution.signer import run_sync
+from lighter_agno.execution.validation import OrderValidationError, validate_order
+from lighter_agno.market_cache import get_market_cache
+
+
+def _validate_parent(config, market_index, side, size, price):
+    """Validate the parent order as a whole; returns (market, rejection or None)."""
+    cache = get_market_cache(f"{config['base_url']}/api/v1")
+    try:
+        market = cache.get_market(market_index)
+    except (LighterApiError, httpx.HTTPError) as e:
+        return None, {"success": False, "error": f"Failed to fetch market {market_index}: {e}"}
+    if market is None:
+        return None, {"success": False, "error": f"Unknown market {market_index}"}
+    if price is None:
+        price = float(market["last_trade_price"])
+    try:
+        validate_order(cache, config["account_index"], market_index, side, size, price)
+    except OrderValidationError as e:
+        return None, {
+            "success": False,
+            "error": str(e),
+            "reason": e.reason,
+            "rejected_locally": True
+        }
+    return market, None
+
+
+def start_twap_order(
+    market_index: int,
+    side: Literal["buy", "sell"],
+    size: float,
+    duration_seconds: float,
+    slices: int = 10,
+    limit_price: Optional[float] = None,
+    max_slippage_percent: float = 0.5,
+) -> str:
+    """Start a TWAP order that spreads a large order evenly over time.
+
+    The order is split into `slices` immediate-or-cancel child orders, one
+    every duration_seconds / slices. Each child is capped by the liquidity
+    currently on the book; each child's actual fill is checked before the
+    next slice, so any shortfall (thin book or unfilled IOC size) is carried
+    into later slices. Ends as "partial" if size is still unfilled after the
+    last slice. Returns immediately; use get_algo_order_status to follow progress.
+
+    Args:
+        market_index: Market ID
+        side: 'buy' or 'sell'
+        size: Total order size in base asset
+        duration_seconds: Total execution time in seconds
+        slices: Number of child orders (default 10)
+        limit_price: Optional price no child order may cross
+        max_slippage_percent: Max distance of each child from the best price (default 0.5%)
+
+    Returns:
+        JSON string with the parent order ID and initial status
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    market, rejection = _validate_parent(config, market_index, side, size, limit_price)
+    if rejection:
+        return json.dumps(rejection, indent=2)
+
+    async def _start():
+        return await get_scheduler(config).start_twap(
+            market, side, size, duration_seconds, slices, limit_price, max_slippage_percent
+        )
+
+    parent = run_sync(_start())
+    return json.dumps({"success": True, "parent_order": parent.to_dict()}, indent=2)
+
+
+def start_iceberg_order(
+    market_index: int,
+    side: Literal["buy", "sell"],
+    size: float,
+    price: float,
+    visible_size: float,
+    poll_interval_seconds: float = 1.0,
+) -> str:
+    """Start an iceberg order that only shows part of its size on the book.
+
+    One child limit order of `visible_size` rests at `price`; whenever it
+    fills, the next one is posted until the full size is done.
+    Returns immediately; use get_algo_order_status to follow progress.
+
+    Args:
+        market_index: Market ID
+        side: 'buy' or 'sell'
+        size: Total order size in base asset
+        price: Limit price in USD
+        visible_size: Size shown on the book at any time
+        poll_interval_seconds: How often to check for fills (default 1s)
+
+    Returns:
+        JSON string with the parent order ID and initial status
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    market, rejection = _validate_parent(config, market_index, side, size, price)
+    if rejection:
+        return json.dumps(rejection, indent=2)
+    if visible_size < float(market.get("min_base_amount") or 0):
+        return json.dumps({
+            "success": False,
+            "error": f"visible_size {visible_size} is below the market minimum "
+                     f"{market['min_base_amount']}"
+        }, indent=2)
+
+    async def _start():
+        return await get_scheduler(config).start_iceberg(
+            market, side, size, price, visible_size, poll_interval_seconds
+        )
+
+    parent = run_sync(_start())
+    return json.dumps({"success": True, "parent_order": parent.to_dict()}, indent=2)
+
+
+def cancel_algo_order(parent_id: str) -> str:
+    """Cancel a running TWAP or iceberg order.
+
+    No further child orders are sent, and a resting iceberg child is cancelled.
+
+    Args:
+        parent_id: Parent order ID returned when the order was started
+
+    Returns:
+        JSON string with the final parent order status
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    parent = run_sync(get_scheduler(config).cancel(parent_id))
+    if parent is None:
+        return json.dumps({"success": False, "error": f"Unknown parent order {parent_id}"})
+    return json.dumps({"success": True, "parent_order": parent.to_dict()}, indent=2)
+
+
+def get_algo_order_status(
+    parent_id: Optional[str] = None,
+    active_only: bool = False,
+) -> str:
+    """Get progress of TWAP and iceberg orders.
+
+    Args:
+        parent_id: Parent order ID (omit to list all parent orders)
+        active_only: When listing, only include running orders
+
+    Returns:
+        JSON string with parent order status and recent progress events
+    """
+    try:
+        scheduler = get_scheduler(get_config())
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+    if parent_id is not None:
+        parent = scheduler.get(parent_id)
+        if parent is None:
+            return json.dumps({"error": f"Unknown parent order {parent_id}"})
+        return json.dumps(parent.to_dict(), indent=2)
+
+    parents = scheduler.list(active_only=active_only)
+    return json.dumps({
+        "parent_orders": [p.to_dict(events=1) for p in parents],
+        "total": len(parents)
+    }, indent=2)
@@ -4,63 +4,98 @@ Order execution tools using official Lighter SDK.
 These tools can actually place, modify, and cancel orders.
 """
 
-import os
 import json
-import asyncio
-from typing import Optional, Literal
+import time
+from typing import List, Optional, Literal
 import lighter
 
-# Load config from environment or file
-def get_config():
-    """Get Lighter configuration from environment or config file."""
-    config_file = os.path.join(os.path.dirname(__file__), "..", "api_key_config.json")
+from lighter_agno.config import ConfigError, get_config
+from lighter_agno.constants import MAX_TX_BATCH_SIZE
+from lighter_agno.execution.confirmations import get_confirmation_tracker
+from lighter_agno.execution.fanout import build_allocations, fan_out_order
+from lighter_agno.execution.order_index import get_allocator
+from lighter_agno.execution.signer import (
+    get_signer,
+    run_sync,
+    send_signed,
+    send_signed_bulk,
+)
+from lighter_agno.execution.validation import (
+    OrderValidationError,
+    to_base_amount,
+    to_price,
+    validate_order,
+)
+from lighter_agno.market_cache import get_market_cache
+from lighter_agno.metrics import metrics
+
+
+async def _create_client(config):
+    """Get the shared, verified Lighter SignerClient for the configured account."""
+    client = await get_signer(config)
+    return client, config["account_index"]
 
-    if os.path.exists(config_file):
-        with open(config_file) as f:
-            cfg = json.load(f)
-        return {
-            "base_url": cfg["baseUrl"],
-            "account_index": cfg["accountIndex"],
-            "private_keys": {int(k): v for k, v in cfg["privateKeys"].items()}
-        }
 
-    # Fallback to environment variables
-    return {
-        "base_url": os.getenv("LIGHTER_BASE_URL", "https://mainnet.zklighter.elliot.ai"),
-        "account_index": int(os.getenv("LIGHTER_ACCOUNT_INDEX", 0)),
-        "private_keys": {
-            int(os.getenv("LIGHTER_API_KEY_INDEX", 0)): os.getenv("LIGHTER_PRIVATE_KEY", "")
+def _validate(config, market_index, side, size, price, reduce_only=False):
+    """Run local pre-trade checks; returns (market metadata, rejection result or None)."""
+    cache = get_market_cache(f"{config['base_url']}/api/v1")
+    try:
+        market = validate_order(
+            cache, config["account_index"], market_index, side, size, price, reduce_only
+        )
+    except OrderValidationError as e:
+        return None, {
+            "success": False,
+            "error": str(e),
+            "reason": e.reason,
+            "rejected_locally": True
         }
-    }
+    return market, None
 
 
-def _run_async(coro):
-    """Run async coroutine synchronously."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If we're already in an async context, create a new loop
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, coro)
-                return future.result()
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
-
-
-async def _create_client():
-    """Create and verify Lighter SignerClient."""
-    config = get_config()
-    client = lighter.SignerClient(
-        url=config["base_url"],
-        account_index=config["account_index"],
-        api_private_keys=config["private_keys"],
-    )
-    err = client.check_client()
+def _encode_amounts(market, size, price):
+    """Convert size and price to exchange integers, using market decimals when known."""
+    if market is None:
+        # Size decimals vary by market, typically 4 (so 0.1 = 1000)
+        return int(size * 10000), int(price * 100)
+    return to_base_amount(market, size), to_price(market, price)
+
+
+def _reserve_client_order_id(
+    account_index: int,
+    client_order_id: Optional[int],
+    intent: dict,
+) -> int:
+    """Allocate a unique client order index (or adopt the caller's) and index the intent."""
+    allocator = get_allocator(account_index)
+    if client_order_id is None:
+        return allocator.allocate(intent)
+    allocator.track(client_order_id, intent)
+    return client_order_id
+
+
+async def _submit(client, method, kwargs, key=None, started=None):
+    """
+    Sign and send one transaction, recording order path spans under `key`.
+
+    When `started` (a time.perf_counter() reading taken on tool entry) is
+    given, the end-to-end time until the exchange acknowledged the
+    transaction is recorded as the "order.ack" span.
+    """
+    tx_hash, _, err = await send_signed(client, method, kwargs, key=key)
+    if not err and started is not None:
+        metrics.record("order.ack", time.perf_counter() - started, key)
+    return tx_hash, err
+
+
+def _record_submission(account_index: int, client_order_id: int, tx_hash, err) -> None:
+    """Record the submission outcome on the indexed intent."""
     if err:
-        raise Exception(f"Client error: {err}")
-    return client, config["account_index"]
+        get_allocator(account_index).update(client_order_id, status="rejected", error=str(err))
+    else:
+        get_allocator(account_index).update(
+            client_order_id, status="submitted", tx_hash=str(tx_hash)
+        )
 
 
 def place_limit_order(
@@ -68,7 +103,7 @@ def place_limit_order(
     side: Literal["buy", "sell"],
     size: float,
     price: float,
-    client_order_id: int = 1,
+    client_order_id: Optional[int] = None,
     reduce_only: bool = False,
 ) -> str:
     """Place a limit order on Lighter Exchange.
@@ -78,48 +113,61 @@ def place_limit_order(
         side: 'buy' or 'sell'
         size: Order size in base asset (e.g., 0.1 for 0.1 ETH)
         price: Limit price in USD
-        client_order_id: Your custom order ID (default 1)
+        client_order_id: Your custom order ID (default: next unique index for the account)
         reduce_only: If True, only reduces existing position
 
     Returns:
         JSON string with order result
     """
-    async def _place():
-        client, account_index = await _create_client()
-        try:
-            # Convert to Lighter format
-            # Size decimals vary by market, typically 4 (so 0.1 = 1000)
-            base_amount = int(size * 10000)
-            price_amount = int(price * 100)  # 2 decimal places
-
-            tx, tx_hash, err = await client.create_order(
-                market_index=market_index,
-                client_order_index=client_order_id,
-                base_amount=base_amount,
-                price=price_amount,
-                is_ask=(side == "sell"),
-                order_type=0,  # LIMIT
-                time_in_force=1,  # GTC
-                reduce_only=reduce_only,
-            )
+    started = time.perf_counter()
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    market, rejection = _validate(config, market_index, side, size, price, reduce_only)
+    if rejection:
+        return json.dumps(rejection, indent=2)
 
-            if err:
-                return {"success": False, "error": str(err)}
-            return {
-                "success": True,
-                "tx_hash": tx_hash,
-                "order": {
-                    "market_index": market_index,
-                    "side": side,
-                    "size": size,
-                    "price": price,
-                    "client_order_id": client_order_id
-                }
+    async def _place():
+        client, account_index = await _create_client(config)
+        client_order_index = _reserve_client_order_id(account_index, client_order_id, {
+            "market_index": market_index,
+            "side": side,
+            "size": size,
+            "price": price,
+            "type": "limit",
+            "reduce_only": reduce_only,
+        })
+        # Convert to Lighter format
+        base_amount, price_amount = _encode_amounts(market, size, price)
+
+        tx_hash, err = await _submit(client, "sign_create_order", {
+            "market_index": market_index,
+            "client_order_index": client_order_index,
+            "base_amount": base_amount,
+            "price": price_amount,
+            "is_ask": side == "sell",
+            "order_type": 0,  # LIMIT
+            "time_in_force": 1,  # GTC
+            "reduce_only": reduce_only,
+        }, key=client_order_index, started=started)
+
+        _record_submission(account_index, client_order_index, tx_hash, err)
+        if err:
+            return {"success": False, "error": str(err), "client_order_id": client_order_index}
+        return {
+            "success": True,
+            "tx_hash": tx_hash,
+            "order": {
+                "market_index": market_index,
+                "side": side,
+                "size": size,
+                "price": price,
+                "client_order_id": client_order_index
             }
-        finally:
-            await client.close()
+        }
 
-    result = _run_async(_place())
+    result = run_sync(_place())
     return json.dumps(result, indent=2)
 
 
@@ -128,7 +176,7 @@ def place_market_order(
     side: Literal["buy", "sell"],
     size: float,
     max_slippage_price: float,
-    client_order_id: int = 1,
+    client_order_id: Optional[int] = None,
     reduce_only: bool = False,
 ) -> str:
     """Place a market order on Lighter Exchange.
@@ -138,43 +186,63 @@ def place_market_order(
         side: 'buy' or 'sell'
         size: Order size in base asset
         max_slippage_price: Maximum acceptable execution price (for slippage protection)
-        client_order_id: Your custom order ID
+        client_order_id: Your custom order ID (default: next unique index for the account)
         reduce_only: If True, only reduces existing position
 
     Returns:
         JSON string with order result
     """
-    async def _place():
-        client, _ = await _create_client()
-        try:
-            base_amount = int(size * 10000)
-            avg_price = int(max_slippage_price * 100)
-
-            tx, tx_hash, err = await client.create_market_order(
-                market_index=market_index,
-                client_order_index=client_order_id,
-                base_amount=base_amount,
-                avg_execution_price=avg_price,
-                is_ask=(side == "sell"),
-                reduce_only=reduce_only,
-            )
+    started = time.perf_counter()
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    market, rejection = _validate(
+        config, market_index, side, size, max_slippage_price, reduce_only
+    )
+    if rejection:
+        return json.dumps(rejection, indent=2)
 
-            if err:
-                return {"success": False, "error": str(err)}
-            return {
-                "success": True,
-                "tx_hash": tx_hash,
-                "order": {
-                    "market_index": market_index,
-                    "side": side,
-                    "size": size,
-                    "type": "market"
-                }
+    async def _place():
+        client, account_index = await _create_client(config)
+        client_order_index = _reserve_client_order_id(account_index, client_order_id, {
+            "market_index": market_index,
+            "side": side,
+            "size": size,
+            "price": max_slippage_price,
+            "type": "market",
+            "reduce_only": reduce_only,
+        })
+        base_amount, avg_price = _encode_amounts(market, size, max_slippage_price)
+
+        tx_hash, err = await _submit(client, "sign_create_order", {
+            "market_index": market_index,
+            "client_order_index": client_order_index,
+            "base_amount": base_amount,
+            "price": avg_price,
+            "is_ask": side == "sell",
+            "order_type": 1,  # MARKET
+            "time_in_force": 0,  # IOC
+            "reduce_only": reduce_only,
+            "order_expiry": 0,  # IOC orders carry no expiry
+        }, key=client_order_index, started=started)
+
+        _record_submission(account_index, client_order_index, tx_hash, err)
+        if err:
+            return {"success": False, "error": str(err), "client_order_id": client_order_index}
+        return {
+            "success": True,
+            "tx_hash": tx_hash,
+            "order": {
+                "market_index": market_index,
+                "side": side,
+                "size": size,
+                "type": "market",
+                "client_order_id": client_order_index
             }
-        finally:
-            await client.close()
+        }
 
-    result = _run_async(_place())
+    result = run_sync(_place())
     return json.dumps(result, indent=2)
 
 
@@ -191,25 +259,34 @@ def cancel_order(
     Returns:
         JSON string with cancellation result
     """
+    started = time.perf_counter()
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"success": False, "error": str(e)})
+
     async def _cancel():
-        client, _ = await _create_client()
-        try:
-            tx, tx_hash, err = await client.cancel_order(
-                market_index=market_index,
-                order_index=order_id,
+        client, account_index = await _create_client(config)
+        intent = get_allocator(account_index).lookup_by_order_index(order_id)
+        key = intent["client_order_index"] if intent is not None else None
+        tx_hash, err = await _submit(client, "sign_cancel_order", {
+            "market_index": market_index,
+            "order_index": order_id,
+        }, key=key, started=started)
+
+        if err:
+            return {"success": False, "error": str(err)}
+        if intent is not None:
+            get_allocator(account_index).update(
+                intent["client_order_index"], status="cancel_submitted"
             )
+        return {
+            "success": True,
+            "tx_hash": tx_hash,
+            "cancelled_order_id": order_id
+        }
 
-            if err:
-                return {"success": False, "error": str(err)}
-            return {
-                "success": True,
-                "tx_hash": tx_hash,
-                "cancelled_order_id": order_id
-            }
-        finally:
-            await client.close()
-
-    result = _run_async(_cancel())
+    result = run_sync(_cancel())
     return json.dumps(result, indent=2)
 
 
@@ -224,34 +301,291 @@ def cancel_all_orders(
     Returns:
         JSON string with cancellation result
     """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"success": False, "error": str(e)})
+
     async def _cancel_all():
-        client, _ = await _create_client()
-        try:
-            tx, tx_hash, err = await client.cancel_all_orders(
-                market_index=market_index if market_index is not None else 255,
+        client, _ = await _create_client(config)
+        tx, tx_hash, err = await client.cancel_all_orders(
+            market_index=market_index if market_index is not None else 255,
+        )
+
+        if err:
+            return {"success": False, "error": str(err)}
+        return {
+            "success": True,
+            "tx_hash": tx_hash,
+            "market_index": market_index
+        }
+
+    result = run_sync(_cancel_all())
+    return json.dumps(result, indent=2)
+
+
+def replace_order(
+    market_index: int,
+    order_id: int,
+    size: float,
+    price: float,
+) -> str:
+    """Atomically change the size and price of a resting order.
+
+    Uses the exchange's native modify transaction, so the order never leaves
+    the book and only one transaction is signed and sent.
+
+    Args:
+        market_index: Market ID
+        order_id: The order ID to modify
+        size: New order size in base asset
+        price: New limit price in USD
+
+    Returns:
+        JSON string with modification result
+    """
+    started = time.perf_counter()
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    market, rejection = _validate(config, market_index, None, size, price)
+    if rejection:
+        return json.dumps(rejection, indent=2)
+
+    async def _replace():
+        client, account_index = await _create_client(config)
+        intent = get_allocator(account_index).lookup_by_order_index(order_id)
+        key = intent["client_order_index"] if intent is not None else None
+        base_amount, price_amount = _encode_amounts(market, size, price)
+        tx_hash, err = await _submit(client, "sign_modify_order", {
+            "market_index": market_index,
+            "order_index": order_id,
+            "base_amount": base_amount,
+            "price": price_amount,
+        }, key=key, started=started)
+
+        if err:
+            return {"success": False, "error": str(err)}
+        if intent is not None:
+            get_allocator(account_index).update(
+                intent["client_order_index"], size=size, price=price, status="modify_submitted"
             )
+        return {
+            "success": True,
+            "tx_hash": tx_hash,
+            "order": {
+                "market_index": market_index,
+                "order_id": order_id,
+                "size": size,
+                "price": price
+            }
+        }
+
+    result = run_sync(_replace())
+    return json.dumps(result, indent=2)
+
 
+def replace_orders(
+    market_index: int,
+    orders: List[dict],
+) -> str:
+    """Requote a ladder of orders in a single signed batch.
+
+    Each entry is one of:
+    - {"order_id", "size", "price"}: modify a resting order in place
+    - {"order_id"}: cancel a resting order
+    - {"side", "size", "price"}: create a new limit order (optional "client_order_id",
+      "reduce_only")
+
+    All transactions are signed with consecutive nonces and submitted through
+    /sendTxBatch in chunks of at most 50, pipelined across API keys, so the
+    whole ladder moves in about one round-trip instead of one cancel and one
+    create per level. This is also the bulk path for grid placement (create
+    entries only) and mass cancels (order_id entries only).
+
+    Args:
+        market_index: Market ID
+        orders: List of modify / cancel / create entries
+
+    Returns:
+        JSON string with batch result and one action per entry
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"success": False, "error": str(e)})
+    markets, rejections = [], []
+    for index, entry in enumerate(orders):
+        if "price" not in entry or "size" not in entry:
+            markets.append(None)
+            continue
+        side = entry.get("side") if "order_id" not in entry else None
+        market, rejection = _validate(
+            config, market_index, side, entry["size"], entry["price"],
+            entry.get("reduce_only", False)
+        )
+        if rejection:
+            rejections.append({"entry": index, **rejection})
+        markets.append(market)
+    if rejections:
+        return json.dumps({
+            "success": False,
+            "rejected_locally": True,
+            "rejections": rejections
+        }, indent=2)
+
+    async def _replace_all():
+        client, account_index = await _create_client(config)
+
+        sign_requests, actions = [], []
+        for entry, market in zip(orders, markets):
+            if "order_id" in entry and "price" in entry and "size" in entry:
+                base_amount, price_amount = _encode_amounts(market, entry["size"], entry["price"])
+                sign_requests.append(("sign_modify_order", {
+                    "market_index": market_index,
+                    "order_index": entry["order_id"],
+                    "base_amount": base_amount,
+                    "price": price_amount,
+                }))
+                actions.append({"action": "modify", **entry})
+            elif "order_id" in entry:
+                sign_requests.append(("sign_cancel_order", {
+                    "market_index": market_index,
+                    "order_index": entry["order_id"],
+                }))
+                actions.append({"action": "cancel", **entry})
+            else:
+                reduce_only = entry.get("reduce_only", False)
+                client_order_index = _reserve_client_order_id(
+                    account_index, entry.get("client_order_id"), {
+                        "market_index": market_index,
+                        "side": entry["side"],
+                        "size": entry["size"],
+                        "price": entry["price"],
+                        "type": "limit",
+                        "reduce_only": reduce_only,
+                    }
+                )
+                base_amount, price_amount = _encode_amounts(market, entry["size"], entry["price"])
+                sign_requests.append(("sign_create_order", {
+                    "market_index": market_index,
+                    "client_order_index": client_order_index,
+                    "base_amount": base_amount,
+                    "price": price_amount,
+                    "is_ask": entry["side"] == "sell",
+                    "order_type": 0,  # LIMIT
+                    "time_in_force": 1,  # GTC
+                    "reduce_only": reduce_only,
+                }))
+                actions.append({"action": "create", "client_order_id": client_order_index, **entry})
+
+        sent = await send_signed_bulk(client, sign_requests)
+        for action, (tx_hash, err) in zip(actions, sent):
+            if tx_hash:
+                action["tx_hash"] = tx_hash
             if err:
-                return {"success": False, "error": str(err)}
-            return {
-                "success": True,
-                "tx_hash": tx_hash,
-                "market_index": market_index
-            }
-        finally:
-            await client.close()
+                action["error"] = err
+            if action["action"] == "create":
+                _record_submission(account_index, action["client_order_id"], tx_hash, err)
 
-    result = _run_async(_cancel_all())
+        return {
+            "success": all("error" not in action for action in actions),
+            "market_index": market_index,
+            "batches": -(-len(sign_requests) // MAX_TX_BATCH_SIZE),
+            "actions": actions
+        }
+
+    result = run_sync(_replace_all())
     return json.dumps(result, indent=2)
 
 
+def place_copy_order(
+    market_index: int,
+    side: Literal["buy", "sell"],
+    size: float,
+    price: float,
+    order_type: Literal["limit", "market"] = "limit",
+    accounts: Optional[List[int]] = None,
+    weights: Optional[List[float]] = None,
+    reduce_only: bool = False,
+) -> str:
+    """Copy one order to many sub-accounts at once.
+
+    Every account gets `size * weight` (rounded to the market's precision)
+    and signs with its own API key and nonce stream; all orders are sent
+    concurrently, so the whole fan-out takes about one order's latency.
+    Accounts must be listed in api_key_config.json (see
+    get_accounts_by_l1_address for a main account's sub-accounts).
+
+    Args:
+        market_index: Market ID
+        side: 'buy' or 'sell'
+        size: Order size in base asset at weight 1.0
+        price: Limit price, or maximum acceptable execution price for market orders
+        order_type: 'limit' or 'market' (default 'limit')
+        accounts: Account indices to trade on (default: every configured account)
+        weights: Size multiplier per account, same order as accounts (default 1.0 each)
+        reduce_only: If True, orders only reduce existing positions
+
+    Returns:
+        JSON string with per-account results and totals
+    """
+    try:
+        allocations = build_allocations(accounts, weights)
+    except (ConfigError, ValueError) as e:
+        return json.dumps({"success": False, "error": str(e)})
+
+    result = run_sync(fan_out_order(
+        market_index, side, size, price, allocations, order_type, reduce_only
+    ))
+    return json.dumps(result, indent=2)
+
+
+def wait_for_transactions(
+    tx_hashes: List[str],
+    timeout_seconds: float = 30.0,
+) -> str:
+    """Wait for submitted transactions to be executed or fail.
+
+    Hashes are tracked together and resolved in batched, rate-limited
+    sweeps (one request settles every hash among the account's latest
+    transactions), so thousands can be confirmed at once.
+
+    Args:
+        tx_hashes: Transaction hashes returned by the order tools
+        timeout_seconds: How long to wait before returning (default 30s)
+
+    Returns:
+        JSON string with one result per hash: executed, failed, timeout or
+        pending (still unsettled when the wait ended)
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+
+    async def _wait():
+        return await get_confirmation_tracker(config).wait(tx_hashes, timeout_seconds)
+
+    results = run_sync(_wait())
+    return json.dumps({
+        "settled": sum(1 for r in results if r["status"] != "pending"),
+        "executed": sum(1 for r in results if r["status"] == "executed"),
+        "results": results,
+    }, indent=2)
+
+
 def get_account_status() -> str:
     """Get current account status including balance and positions.
 
     Returns:
         JSON string with account information
     """
-    config = get_config()
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
     api_client = lighter.ApiClient(
         configuration=lighter.Configuration(host=config["base_url"] + "/api/v1")
     )
@@ -279,3 +613,59 @@ def get_account_status() -> str:
         }, indent=2)
     finally:
         api_client.close()
+
+
+def get_order_intent(
+    client_order_id: Optional[int] = None,
+    order_id: Optional[int] = None,
+) -> str:
+    """Look up a locally placed order by client order ID or exchange order ID.
+
+    Reads the in-memory intent index, so no API call is made.
+
+    Args:
+        client_order_id: Client order index returned when the order was placed
+        order_id: Exchange order index, linked to the intent once an active or
+            inactive order read has returned the order
+
+    Returns:
+        JSON string with the order intent and its last known status
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+    allocator = get_allocator(config["account_index"])
+    if client_order_id is not None:
+        intent = allocator.lookup(client_order_id)
+    elif order_id is not None:
+        intent = allocator.lookup_by_order_index(order_id)
+    else:
+        return json.dumps({"error": "Provide client_order_id or order_id"})
+
+    if intent is None:
+        return json.dumps(
+            {"found": False, "client_order_id": client_order_id, "order_id": order_id}
+        )
+    return json.dumps({"found": True, "intent": intent}, indent=2)
+
+
+def get_execution_metrics(prefix: Optional[str] = None) -> str:
+    """Get order path metrics recorded in this process.
+
+    Includes the latency breakdown of the order path (microseconds, with
+    p50/p90/p99 and histograms): order.config_load, order.signer_create,
+    order.check_client, order.sign, order.submit and order.ack (tool call to
+    exchange acknowledgement), the batch.* equivalents, fanout.order and
+    fanout.total for copy orders, local pre-trade
+    validation timings, and counts of accepted, rejected (by reason) and
+    skipped validations. Set LIGHTER_TRACE_FILE to also write every span,
+    keyed by client order index, to an NDJSON trace file.
+
+    Args:
+        prefix: Only include metrics whose name starts with this (e.g. "order.")
+
+    Returns:
+        JSON string with counters and timing summaries
+    """
+    return json.dumps(metrics.snapshot(prefix), indent=2)
@@ -7,6 +7,7 @@ Provides 5 tools for order management and queries.
 import json
 from typing import Optional, Literal
 from lighter_agno.client import get_client
+from lighter_agno.execution.order_index import link_orders
 
 
 def get_orders(
@@ -40,6 +41,7 @@ def get_orders(
         "limit": limit,
         "auth": auth,
     })
+    link_orders(account_index, result.get("orders") or [])
     return json.dumps(result, indent=2)
 
 
@@ -71,6 +73,7 @@ def get_account_active_orders(
         "limit": limit,
         "auth": auth,
     })
+    link_orders(account_index, result.get("orders") or [])
     return json.dumps(result, indent=2)
 
 
@@ -102,6 +105,7 @@ def get_account_inactive_orders(
         "limit": limit,
         "auth": auth,
     })
+    link_orders(account_index, result.get("orders") or [])
     return json.dumps(result, indent=2)
 
 
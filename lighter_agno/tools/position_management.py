@@ -4,41 +4,72 @@ Position management tools for Lighter Exchange.
 Tools for fetching positions and closing them.
 """
 
-import os
 import json
 import asyncio
-from typing import Optional, Literal
-import lighter
+import time
+from typing import Dict, List, Optional, Literal
+
+from lighter_agno.client import LighterClient
+from lighter_agno.config import ConfigError, get_config
+from lighter_agno.execution.order_index import get_allocator
+from lighter_agno.execution.signer import (
+    get_signer,
+    run_sync,
+    send_signed,
+    send_signed_bulk,
+)
+from lighter_agno.execution.position_watcher import get_position_watcher
+from lighter_agno.execution.scheduler import get_scheduler
+from lighter_agno.execution.triggers import get_trigger_engine
+from lighter_agno.execution.validation import round_price, round_size, to_base_amount, to_price
+from lighter_agno.market_cache import get_market_cache
+from lighter_agno.metrics import metrics
+
+# API clients keyed by base URL, so async connection pools are reused
+_api_clients: Dict[str, LighterClient] = {}
+
+
+def _api_client(config) -> LighterClient:
+    """Get the shared API client for the configured exchange URL."""
+    base_url = f"{config['base_url']}/api/v1"
+    client = _api_clients.get(base_url)
+    if client is None:
+        client = LighterClient(base_url=base_url)
+        _api_clients[base_url] = client
+    return client
+
+
+async def _fetch_snapshot(config, market_index=None):
+    """
+    Fetch the account and market details concurrently on the shared client.
 
+    The account snapshot is also handed to the market data cache, so
+    pre-trade checks made right after reuse it instead of refetching.
 
-def get_config():
-    """Get Lighter configuration."""
-    config_file = os.path.join(os.path.dirname(__file__), "..", "api_key_config.json")
-    if os.path.exists(config_file):
-        with open(config_file) as f:
-            cfg = json.load(f)
-        return {
-            "base_url": cfg["baseUrl"],
-            "account_index": cfg["accountIndex"],
-            "private_keys": {int(k): v for k, v in cfg["privateKeys"].items()}
-        }
+    Returns:
+        Tuple of (account or None, market details by market ID)
+    """
+    api = _api_client(config)
+    market_params = {"market_id": market_index} if market_index is not None else {}
+    account_data, market_data = await asyncio.gather(
+        api.async_get("/account", {"by": "index", "value": str(config["account_index"])}),
+        api.async_get("/orderBookDetails", market_params),
+    )
+    accounts = account_data.get("accounts") or []
+    account = accounts[0] if accounts else None
+    get_market_cache(api.base_url).put_account(config["account_index"], account)
+    markets = {m["market_id"]: m for m in market_data.get("order_book_details") or []}
+    return account, markets
+
+
+def _find_position(account, market_index):
+    """Return the account's open position in a market, or None."""
+    for p in (account or {}).get("positions") or []:
+        if p["market_id"] == market_index and float(p["position"]) != 0:
+            return p
     return None
 
 
-def _run_async(coro):
-    """Run async coroutine synchronously."""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, coro)
-                return future.result()
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
-
-
 def get_positions() -> str:
     """Get all open positions with PnL for the account.
 
@@ -51,22 +82,21 @@ def get_positions() -> str:
         - Unrealized PnL
         - Liquidation price
     """
-    config = get_config()
-    if not config:
-        return json.dumps({"error": "Config not found"})
-
-    import httpx
-    url = f"{config['base_url']}/api/v1/account"
-    params = {"by": "index", "value": str(config["account_index"])}
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
 
-    with httpx.Client(timeout=30) as client:
-        response = client.get(url, params=params)
-        data = response.json()
+    api = _api_client(config)
+    data = run_sync(
+        api.async_get("/account", {"by": "index", "value": str(config["account_index"])})
+    )
 
     if data.get("code") != 200:
         return json.dumps({"error": "Failed to fetch account"})
 
     acc = data["accounts"][0]
+    get_market_cache(api.base_url).put_account(config["account_index"], acc)
     positions = []
 
     for p in acc["positions"]:
@@ -99,7 +129,8 @@ def close_position_market(
 ) -> str:
     """Close an entire position at market price.
 
-    Fetches the current position and places an opposite market order to close it.
+    Fetches the current position and market price concurrently and places an
+    opposite market order to close it.
 
     Args:
         market_index: Market ID (0=ETH, 1=BTC, 2=SOL, etc.)
@@ -108,97 +139,86 @@ def close_position_market(
     Returns:
         JSON string with close result including final PnL
     """
-    config = get_config()
-    if not config:
-        return json.dumps({"error": "Config not found"})
-
-    # First, get current position
-    import httpx
-    url = f"{config['base_url']}/api/v1/account"
-    params = {"by": "index", "value": str(config["account_index"])}
-
-    with httpx.Client(timeout=30) as client:
-        response = client.get(url, params=params)
-        data = response.json()
+    started = time.perf_counter()
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
 
-    acc = data["accounts"][0]
-    position = None
-    for p in acc["positions"]:
-        if p["market_id"] == market_index and float(p["position"]) != 0:
-            position = p
-            break
+    async def _close():
+        account, markets = await _fetch_snapshot(config, market_index)
+        position = _find_position(account, market_index)
+        if not position:
+            return {
+                "success": False,
+                "error": f"No open position found for market {market_index}"
+            }
+        market = markets.get(market_index)
+        if market is None:
+            return {"success": False, "error": f"No market data for market {market_index}"}
+
+        size = float(position["position"])
+        is_long = position["sign"] == 1
+        current_price = float(market["last_trade_price"])
+
+        # Calculate max execution price with slippage
+        if is_long:
+            # Closing long = SELL, want price not too low
+            max_price = current_price * (1 - max_slippage_percent / 100)
+        else:
+            # Closing short = BUY, want price not too high
+            max_price = current_price * (1 + max_slippage_percent / 100)
+        max_price = round_price(market, max_price, "sell" if is_long else "buy")
 
-    if not position:
-        return json.dumps({
-            "success": False,
-            "error": f"No open position found for market {market_index}"
+        try:
+            client = await get_signer(config)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+        allocator = get_allocator(config["account_index"])
+        client_order_index = allocator.allocate({
+            "market_index": market_index,
+            "side": "sell" if is_long else "buy",
+            "size": abs(size),
+            "price": max_price,
+            "type": "market",
+            "reduce_only": True,
+            "purpose": "close_position",
         })
 
-    size = float(position["position"])
-    is_long = position["sign"] == 1
-    entry_price = float(position["avg_entry_price"])
-    unrealized_pnl = position["unrealized_pnl"]
-
-    # Get current market price for slippage calculation
-    url = f"{config['base_url']}/api/v1/orderBookDetails"
-    with httpx.Client(timeout=30) as client:
-        response = client.get(url, params={"market_id": market_index})
-        market_data = response.json()
-
-    current_price = market_data["order_book_details"][0]["last_trade_price"]
+        tx_hash, _, err = await send_signed(client, "sign_create_order", {
+            "market_index": market_index,
+            "client_order_index": client_order_index,
+            "base_amount": to_base_amount(market, abs(size)),
+            "price": to_price(market, max_price),
+            "is_ask": is_long,  # If LONG, we SELL (is_ask=True). If SHORT, we BUY (is_ask=False)
+            "order_type": 1,  # MARKET
+            "time_in_force": 0,  # IOC
+            "reduce_only": True,  # Important: only reduce, don't flip position
+            "order_expiry": 0,  # IOC orders carry no expiry
+        }, key=client_order_index)
 
-    # Calculate max execution price with slippage
-    if is_long:
-        # Closing long = SELL, want price not too low
-        max_price = current_price * (1 - max_slippage_percent / 100)
-    else:
-        # Closing short = BUY, want price not too high
-        max_price = current_price * (1 + max_slippage_percent / 100)
-
-    async def _close():
-        client = lighter.SignerClient(
-            url=config["base_url"],
-            account_index=config["account_index"],
-            api_private_keys=config["private_keys"],
-        )
-
-        err = client.check_client()
         if err:
+            allocator.update(client_order_index, status="rejected", error=str(err))
             return {"success": False, "error": str(err)}
+        metrics.record("order.ack", time.perf_counter() - started, client_order_index)
+        allocator.update(client_order_index, status="submitted", tx_hash=tx_hash)
 
-        try:
-            # Convert to Lighter format
-            base_amount = int(abs(size) * 10000)  # 4 decimals
-            avg_price = int(max_price * 100)  # 2 decimals
-
-            tx, tx_hash, err = await client.create_market_order(
-                market_index=market_index,
-                client_order_index=999,  # Use 999 for close orders
-                base_amount=base_amount,
-                avg_execution_price=avg_price,
-                is_ask=is_long,  # If LONG, we SELL (is_ask=True). If SHORT, we BUY (is_ask=False)
-                reduce_only=True,  # Important: only reduce, don't flip position
-            )
-
-            if err:
-                return {"success": False, "error": str(err)}
-
-            return {
-                "success": True,
-                "tx_hash": str(tx_hash),
-                "closed_position": {
-                    "market": position["symbol"],
-                    "side": "LONG" if is_long else "SHORT",
-                    "size": position["position"],
-                    "entry_price": entry_price,
-                    "exit_price": f"~{current_price} (market)",
-                    "unrealized_pnl_before_close": unrealized_pnl,
-                }
+        return {
+            "success": True,
+            "tx_hash": tx_hash,
+            "client_order_id": client_order_index,
+            "closed_position": {
+                "market": position["symbol"],
+                "side": "LONG" if is_long else "SHORT",
+                "size": position["position"],
+                "entry_price": float(position["avg_entry_price"]),
+                "exit_price": f"~{current_price} (market)",
+                "unrealized_pnl_before_close": position["unrealized_pnl"],
             }
-        finally:
-            await client.close()
+        }
 
-    result = _run_async(_close())
+    result = run_sync(_close())
     return json.dumps(result, indent=2)
 
 
@@ -215,80 +235,132 @@ def close_position_limit(
     Returns:
         JSON string with order placement result
     """
-    config = get_config()
-    if not config:
-        return json.dumps({"error": "Config not found"})
+    started = time.perf_counter()
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
 
-    # Get current position
-    import httpx
-    url = f"{config['base_url']}/api/v1/account"
-    params = {"by": "index", "value": str(config["account_index"])}
+    async def _close_limit():
+        # Market details come along for free and give the exact size/price precision
+        account, markets = await _fetch_snapshot(config, market_index)
+        position = _find_position(account, market_index)
+        if not position:
+            return {
+                "success": False,
+                "error": f"No open position found for market {market_index}"
+            }
+        market = markets.get(market_index)
+        if market is None:
+            return {"success": False, "error": f"No market data for market {market_index}"}
 
-    with httpx.Client(timeout=30) as client:
-        response = client.get(url, params=params)
-        data = response.json()
+        size = float(position["position"])
+        is_long = position["sign"] == 1
 
-    acc = data["accounts"][0]
-    position = None
-    for p in acc["positions"]:
-        if p["market_id"] == market_index and float(p["position"]) != 0:
-            position = p
-            break
-
-    if not position:
-        return json.dumps({
-            "success": False,
-            "error": f"No open position found for market {market_index}"
+        try:
+            client = await get_signer(config)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+        allocator = get_allocator(config["account_index"])
+        client_order_index = allocator.allocate({
+            "market_index": market_index,
+            "side": "sell" if is_long else "buy",
+            "size": abs(size),
+            "price": limit_price,
+            "type": "limit",
+            "reduce_only": True,
+            "purpose": "close_position",
         })
 
-    size = float(position["position"])
-    is_long = position["sign"] == 1
+        tx_hash, _, err = await send_signed(client, "sign_create_order", {
+            "market_index": market_index,
+            "client_order_index": client_order_index,
+            "base_amount": to_base_amount(market, abs(size)),
+            "price": to_price(market, limit_price),
+            "is_ask": is_long,  # LONG -> SELL, SHORT -> BUY
+            "order_type": 0,  # LIMIT
+            "time_in_force": 1,  # GTC
+            "reduce_only": True,
+        }, key=client_order_index)
 
-    async def _close_limit():
-        client = lighter.SignerClient(
-            url=config["base_url"],
-            account_index=config["account_index"],
-            api_private_keys=config["private_keys"],
-        )
-
-        err = client.check_client()
         if err:
+            allocator.update(client_order_index, status="rejected", error=str(err))
             return {"success": False, "error": str(err)}
+        metrics.record("order.ack", time.perf_counter() - started, client_order_index)
+        allocator.update(client_order_index, status="submitted", tx_hash=tx_hash)
 
-        try:
-            base_amount = int(abs(size) * 10000)
-            price_amount = int(limit_price * 100)
-
-            tx, tx_hash, err = await client.create_order(
-                market_index=market_index,
-                client_order_index=998,
-                base_amount=base_amount,
-                price=price_amount,
-                is_ask=is_long,  # LONG -> SELL, SHORT -> BUY
-                order_type=0,  # LIMIT
-                time_in_force=1,  # GTC
-                reduce_only=True,
-            )
+        return {
+            "success": True,
+            "tx_hash": tx_hash,
+            "client_order_id": client_order_index,
+            "order": {
+                "market": position["symbol"],
+                "type": "LIMIT",
+                "side": "SELL" if is_long else "BUY",
+                "size": position["position"],
+                "limit_price": limit_price,
+                "reduce_only": True,
+            }
+        }
 
-            if err:
-                return {"success": False, "error": str(err)}
+    result = run_sync(_close_limit())
+    return json.dumps(result, indent=2)
+
+
+def smart_close_position(
+    market_index: int,
+    mode: Literal["ioc", "post_only"] = "ioc",
+    max_slippage_percent: float = 0.5,
+    max_rounds: int = 20,
+    round_interval_seconds: float = 1.0,
+) -> str:
+    """Close a position in depth-aware child orders until it is flat.
 
+    Each round re-reads the position and the order book. In "ioc" mode the
+    remaining size is split into one reduce-only IOC child per book level
+    within max_slippage_percent of the best price, sent as one batch. In
+    "post_only" mode a single reduce-only post-only child rests at the touch
+    and is requoted every round. Runs in the background; follow it with
+    get_algo_order_status.
+
+    Args:
+        market_index: Market ID of the open position
+        mode: 'ioc' to take liquidity, 'post_only' to earn the spread (default 'ioc')
+        max_slippage_percent: Max distance from the best price per round (default 0.5%)
+        max_rounds: Rounds before giving up (default 20)
+        round_interval_seconds: Pause between rounds (default 1s)
+
+    Returns:
+        JSON string with the parent order ID and initial status
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+
+    async def _start():
+        account, markets = await _fetch_snapshot(config, market_index)
+        position = _find_position(account, market_index)
+        if not position:
             return {
-                "success": True,
-                "tx_hash": str(tx_hash),
-                "order": {
-                    "market": position["symbol"],
-                    "type": "LIMIT",
-                    "side": "SELL" if is_long else "BUY",
-                    "size": position["position"],
-                    "limit_price": limit_price,
-                    "reduce_only": True,
-                }
+                "success": False,
+                "error": f"No open position found for market {market_index}"
             }
-        finally:
-            await client.close()
+        if market_index not in markets:
+            return {"success": False, "error": f"No market data for market {market_index}"}
+
+        side = "sell" if position["sign"] == 1 else "buy"
+        try:
+            parent = await get_scheduler(config).start_smart_close(
+                markets[market_index], side, abs(float(position["position"])), mode,
+                max_slippage_percent, max_rounds, round_interval_seconds
+            )
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        return {"success": True, "parent_order": parent.to_dict()}
 
-    result = _run_async(_close_limit())
+    result = run_sync(_start())
     return json.dumps(result, indent=2)
 
 
@@ -301,43 +373,26 @@ def get_position_pnl(market_index: int) -> str:
     Returns:
         JSON string with PnL details
     """
-    config = get_config()
-    if not config:
-        return json.dumps({"error": "Config not found"})
-
-    import httpx
-
-    # Get position
-    url = f"{config['base_url']}/api/v1/account"
-    params = {"by": "index", "value": str(config["account_index"])}
-
-    with httpx.Client(timeout=30) as client:
-        response = client.get(url, params=params)
-        data = response.json()
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
 
-    acc = data["accounts"][0]
-    position = None
-    for p in acc["positions"]:
-        if p["market_id"] == market_index:
-            position = p
-            break
+    account, markets = run_sync(_fetch_snapshot(config, market_index))
+    position = _find_position(account, market_index)
 
-    if not position or float(position["position"]) == 0:
+    if not position:
         return json.dumps({
             "market_id": market_index,
             "has_position": False,
             "message": "No open position for this market"
         })
 
-    # Get current market price
-    url = f"{config['base_url']}/api/v1/orderBookDetails"
-    with httpx.Client(timeout=30) as client:
-        response = client.get(url, params={"market_id": market_index})
-        market_data = response.json()
+    if market_index not in markets:
+        return json.dumps({"error": f"No market data for market {market_index}"})
 
-    current_price = market_data["order_book_details"][0]["last_trade_price"]
+    current_price = float(markets[market_index]["last_trade_price"])
     entry_price = float(position["avg_entry_price"])
-    size = float(position["position"])
     is_long = position["sign"] == 1
 
     # Calculate PnL percentage
@@ -359,3 +414,481 @@ def get_position_pnl(market_index: int) -> str:
         "realized_pnl": position["realized_pnl"],
         "liquidation_price": position["liquidation_price"],
     }, indent=2)
+
+
+def close_all_positions(
+    max_slippage_percent: float = 0.5,
+    market_indices: Optional[List[int]] = None,
+) -> str:
+    """Close every open position at market in a single batched round-trip.
+
+    Fetches the account and all market prices once (concurrently), builds a
+    reduce-only market order for each open position and submits them
+    together through /sendTxBatch.
+
+    Args:
+        max_slippage_percent: Maximum slippage allowed per position (default 0.5%)
+        market_indices: Only close positions in these markets (default: all)
+
+    Returns:
+        JSON string with one result per position
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+
+    async def _close_all():
+        acc, markets = await _fetch_snapshot(config)
+        if acc is None:
+            return {"error": "Failed to fetch account"}
+        allocator = get_allocator(config["account_index"])
+
+        results, pending, sign_requests = [], [], []
+        for p in acc.get("positions") or []:
+            size = float(p["position"])
+            if size == 0 or (market_indices is not None and p["market_id"] not in market_indices):
+                continue
+
+            market = markets.get(p["market_id"])
+            if market is None:
+                results.append({
+                    "market": p["symbol"],
+                    "market_id": p["market_id"],
+                    "success": False,
+                    "error": "No market data"
+                })
+                continue
+
+            is_long = p["sign"] == 1
+            side = "sell" if is_long else "buy"
+            current_price = float(market["last_trade_price"])
+            if is_long:
+                max_price = current_price * (1 - max_slippage_percent / 100)
+            else:
+                max_price = current_price * (1 + max_slippage_percent / 100)
+            max_price = round_price(market, max_price, side)
+
+            client_order_index = allocator.allocate({
+                "market_index": p["market_id"],
+                "side": side,
+                "size": abs(size),
+                "price": max_price,
+                "type": "market",
+                "reduce_only": True,
+                "purpose": "close_all_positions",
+            })
+            sign_requests.append(("sign_create_order", {
+                "market_index": p["market_id"],
+                "client_order_index": client_order_index,
+                "base_amount": to_base_amount(market, abs(size)),
+                "price": to_price(market, max_price),
+                "is_ask": is_long,  # LONG -> SELL, SHORT -> BUY
+                "order_type": 1,  # MARKET
+                "time_in_force": 0,  # IOC
+                "reduce_only": True,
+                "order_expiry": 0,  # IOC orders carry no expiry
+            }))
+            pending.append({
+                "market": p["symbol"],
+                "market_id": p["market_id"],
+                "side": "LONG" if is_long else "SHORT",
+                "size": p["position"],
+                "entry_price": float(p["avg_entry_price"]),
+                "exit_price": f"~{current_price} (market)",
+                "unrealized_pnl_before_close": p["unrealized_pnl"],
+                "client_order_id": client_order_index,
+            })
+
+        if sign_requests:
+            try:
+                client = await get_signer(config)
+            except Exception as e:
+                return {"success": False, "error": str(e)}
+
+            sent = await send_signed_bulk(client, sign_requests)
+            for item, (tx_hash, err) in zip(pending, sent):
+                if err:
+                    allocator.update(item["client_order_id"], status="rejected", error=err)
+                    results.append({**item, "success": False, "error": err})
+                else:
+                    allocator.update(item["client_order_id"], status="submitted", tx_hash=tx_hash)
+                    results.append({**item, "success": True, "tx_hash": tx_hash})
+
+        return {
+            "success": all(r["success"] for r in results),
+            "positions_closed": sum(1 for r in results if r["success"]),
+            "results": results
+        }
+
+    result = run_sync(_close_all())
+    return json.dumps(result, indent=2)
+
+
+def _rebalance_plan(account, markets, targets, max_slippage_percent):
+    """
+    Diff target positions against the account in one pass over the targets.
+
+    Returns (orders, skipped): at most one market order per market, position
+    reductions first so they free margin for the increases.
+    """
+    current = {
+        p["market_id"]: float(p["position"]) * (1 if p["sign"] == 1 else -1)
+        for p in (account or {}).get("positions") or []
+    }
+    orders, skipped = [], []
+    for market_index, target in sorted(targets.items()):
+        market = markets.get(market_index)
+        if market is None:
+            skipped.append({"market_id": market_index, "reason": "No market data"})
+            continue
+        position = current.get(market_index, 0.0)
+        delta = target - position
+        size = round_size(market, abs(delta))
+        if size <= 0 or size < float(market.get("min_base_amount") or 0):
+            skipped.append({
+                "market_id": market_index,
+                "current": position,
+                "target": target,
+                "reason": "Difference below the market's minimum order size",
+            })
+            continue
+
+        side = "buy" if delta > 0 else "sell"
+        last_price = float(market["last_trade_price"])
+        slippage = max_slippage_percent / 100
+        max_price = last_price * (1 + slippage) if side == "buy" else last_price * (1 - slippage)
+        orders.append({
+            "market": market["symbol"],
+            "market_id": market_index,
+            "current": position,
+            "target": target,
+            "side": side,
+            "size": size,
+            "max_price": round_price(market, max_price, side),
+            # Shrinking toward flat (without flipping) can only reduce the position
+            "reduce_only": target * position >= 0 and abs(target) < abs(position),
+        })
+    orders.sort(key=lambda o: not o["reduce_only"])
+    return orders, skipped
+
+
+def rebalance_to_targets(
+    targets: Dict[str, float],
+    max_slippage_percent: float = 0.5,
+    dry_run: bool = False,
+) -> str:
+    """Move positions to target sizes with the fewest orders, in batched transactions.
+
+    Reads positions and prices once, computes one market order per market
+    from target minus current (rounded to the market's size precision) and
+    submits them together through /sendTxBatch, reductions first. Markets
+    not listed are left untouched.
+
+    Args:
+        targets: Target signed size per market ID, in base asset
+            (e.g. {"0": 1.5, "1": -0.02, "2": 0} = 1.5 long, 0.02 short, flat)
+        max_slippage_percent: Maximum slippage allowed per order (default 0.5%)
+        dry_run: If True, return the plan without sending anything
+
+    Returns:
+        JSON string with the planned orders and, unless dry_run, their results
+    """
+    try:
+        targets = {int(k): float(v) for k, v in targets.items()}
+    except (TypeError, ValueError) as e:
+        return json.dumps({"success": False, "error": f"Invalid targets: {e}"})
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+
+    async def _rebalance():
+        account, markets = await _fetch_snapshot(config)
+        if account is None:
+            return {"success": False, "error": "Account not found"}
+        orders, skipped = _rebalance_plan(account, markets, targets, max_slippage_percent)
+        if dry_run or not orders:
+            return {"success": True, "dry_run": dry_run, "orders": orders, "skipped": skipped}
+
+        try:
+            client = await get_signer(config)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+        allocator = get_allocator(config["account_index"])
+        sign_requests = []
+        for order in orders:
+            market = markets[order["market_id"]]
+            order["client_order_id"] = allocator.allocate({
+                "market_index": order["market_id"],
+                "side": order["side"],
+                "size": order["size"],
+                "price": order["max_price"],
+                "type": "market",
+                "reduce_only": order["reduce_only"],
+                "purpose": "rebalance",
+            })
+            sign_requests.append(("sign_create_order", {
+                "market_index": order["market_id"],
+                "client_order_index": order["client_order_id"],
+                "base_amount": to_base_amount(market, order["size"]),
+                "price": to_price(market, order["max_price"]),
+                "is_ask": order["side"] == "sell",
+                "order_type": 1,  # MARKET
+                "time_in_force": 0,  # IOC
+                "reduce_only": order["reduce_only"],
+                "order_expiry": 0,  # IOC orders carry no expiry
+            }))
+
+        results = []
+        sent = await send_signed_bulk(client, sign_requests)
+        for order, (tx_hash, err) in zip(orders, sent):
+            if err:
+                allocator.update(order["client_order_id"], status="rejected", error=err)
+                results.append({**order, "success": False, "error": err})
+            else:
+                allocator.update(order["client_order_id"], status="submitted", tx_hash=tx_hash)
+                results.append({**order, "success": True, "tx_hash": tx_hash})
+
+        return {
+            "success": all(r["success"] for r in results),
+            "dry_run": False,
+            "orders_sent": sum(1 for r in results if r["success"]),
+            "results": results,
+            "skipped": skipped,
+        }
+
+    result = run_sync(_rebalance())
+    return json.dumps(result, indent=2)
+
+
+def _arm_exits(engine, position, market, stop_loss_price, take_profit_price, size,
+               max_slippage_percent):
+    """Arm an OCO stop loss / take profit pair for one position; returns (triggers, error)."""
+    is_long = position["sign"] == 1
+    current_price = float(market["last_trade_price"])
+    # A long's stop sits below the price and its take profit above; mirrored for shorts
+    for name, level, fires_below in (
+        ("stop_loss_price", stop_loss_price, is_long),
+        ("take_profit_price", take_profit_price, not is_long),
+    ):
+        if level is None:
+            continue
+        if level >= current_price if fires_below else level <= current_price:
+            return [], f"{name} {level} would fire immediately (last price {current_price})"
+
+    side = "sell" if is_long else "buy"
+    size = abs(float(position["position"])) if size is None else size
+    # All exits on one position are one-cancels-other
+    group = f"{market['market_id']}:{position['sign']}"
+    triggers = []
+    for kind, price in (("stop_loss", stop_loss_price), ("take_profit", take_profit_price)):
+        if price is not None:
+            triggers.append(engine.arm(
+                kind, market, side, price, size, max_slippage_percent, group
+            ))
+    return triggers, None
+
+
+def set_protective_exits(
+    market_index: int,
+    stop_loss_price: Optional[float] = None,
+    take_profit_price: Optional[float] = None,
+    size: Optional[float] = None,
+    max_slippage_percent: float = 1.0,
+) -> str:
+    """Protect a position with a local stop loss and/or take profit.
+
+    Triggers are watched in-process against a shared live price feed. When
+    the last trade price reaches a level, a reduce-only market order is sent
+    immediately. Exits on the same position are one-cancels-other: once one
+    fires, the others are disarmed.
+
+    Args:
+        market_index: Market ID of the open position
+        stop_loss_price: Price that closes the position at a loss
+        take_profit_price: Price that closes the position at a profit
+        size: Size to close (default: the whole current position)
+        max_slippage_percent: Max distance of the exit price from the trigger tick (default 1%)
+
+    Returns:
+        JSON string with the armed triggers
+    """
+    if stop_loss_price is None and take_profit_price is None:
+        return json.dumps(
+            {"success": False, "error": "Provide stop_loss_price or take_profit_price"}
+        )
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+
+    async def _arm():
+        account, markets = await _fetch_snapshot(config, market_index)
+        position = _find_position(account, market_index)
+        if not position:
+            return {
+                "success": False,
+                "error": f"No open position found for market {market_index}"
+            }
+        if market_index not in markets:
+            return {"success": False, "error": f"No market data for market {market_index}"}
+
+        triggers, err = _arm_exits(
+            get_trigger_engine(config), position, markets[market_index],
+            stop_loss_price, take_profit_price, size, max_slippage_percent
+        )
+        if err:
+            return {"success": False, "error": err}
+        return {"success": True, "triggers": [t.to_dict() for t in triggers]}
+
+    result = run_sync(_arm())
+    return json.dumps(result, indent=2)
+
+
+def protect_all_positions(
+    stop_loss_percent: Optional[float] = None,
+    take_profit_percent: Optional[float] = None,
+    max_slippage_percent: float = 1.0,
+) -> str:
+    """Arm a stop loss and/or take profit on every open position at once.
+
+    Levels are set relative to each position's entry price, from a single
+    account snapshot. Existing armed triggers are left in place.
+
+    Args:
+        stop_loss_percent: Loss from entry (%) at which to close each position
+        take_profit_percent: Gain from entry (%) at which to close each position
+        max_slippage_percent: Max distance of the exit price from the trigger tick (default 1%)
+
+    Returns:
+        JSON string with the armed triggers per position
+    """
+    if stop_loss_percent is None and take_profit_percent is None:
+        return json.dumps(
+            {"success": False, "error": "Provide stop_loss_percent or take_profit_percent"}
+        )
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+
+    async def _arm_all():
+        account, markets = await _fetch_snapshot(config)
+        engine = get_trigger_engine(config)
+        results = []
+        for p in (account or {}).get("positions") or []:
+            if float(p["position"]) == 0 or p["market_id"] not in markets:
+                continue
+            entry = float(p["avg_entry_price"])
+            direction = 1 if p["sign"] == 1 else -1
+            stop_loss = None if stop_loss_percent is None \
+                else entry * (1 - direction * stop_loss_percent / 100)
+            take_profit = None if take_profit_percent is None \
+                else entry * (1 + direction * take_profit_percent / 100)
+
+            triggers, err = _arm_exits(
+                engine, p, markets[p["market_id"]], stop_loss, take_profit, None,
+                max_slippage_percent
+            )
+            results.append({
+                "market": p["symbol"],
+                "market_id": p["market_id"],
+                "success": err is None,
+                "error": err,
+                "triggers": [t.to_dict() for t in triggers],
+            })
+        return {
+            "success": all(r["success"] for r in results),
+            "positions_protected": sum(1 for r in results if r["success"]),
+            "results": results
+        }
+
+    result = run_sync(_arm_all())
+    return json.dumps(result, indent=2)
+
+
+def cancel_protective_exit(trigger_id: str) -> str:
+    """Disarm a local stop loss or take profit that has not fired yet.
+
+    Args:
+        trigger_id: Trigger ID returned when it was armed
+
+    Returns:
+        JSON string with the trigger's final state
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+
+    async def _cancel():
+        return get_trigger_engine(config).cancel(trigger_id)
+
+    trigger = run_sync(_cancel())
+    if trigger is None:
+        return json.dumps({"success": False, "error": f"Unknown trigger {trigger_id}"})
+    return json.dumps({"success": True, "trigger": trigger.to_dict()}, indent=2)
+
+
+def get_protective_exits(
+    market_index: Optional[int] = None,
+    active_only: bool = True,
+) -> str:
+    """List local stop losses and take profits.
+
+    Args:
+        market_index: Only list triggers for this market
+        active_only: Only list armed triggers (default True); set False to
+            include fired, failed and cancelled ones with their reaction times
+
+    Returns:
+        JSON string with triggers
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+
+    async def _list():
+        return get_trigger_engine(config).list(active_only, market_index)
+
+    triggers = run_sync(_list())
+    return json.dumps({
+        "triggers": [t.to_dict() for t in triggers],
+        "total": len(triggers)
+    }, indent=2)
+
+
+def get_position_changes(
+    since: Optional[int] = None,
+    wait_seconds: float = 0,
+) -> str:
+    """Get only the position and balance changes since a previous call.
+
+    The first call starts a background watcher that refreshes the account
+    every second and returns the full snapshot with a sequence number. Pass
+    that number back as `since` to receive just the deltas (opened, updated
+    or closed positions and changed balances) that happened after it.
+
+    Args:
+        since: Sequence number from the previous call (omit for a full snapshot)
+        wait_seconds: If nothing changed yet, wait up to this long for a change
+
+    Returns:
+        JSON string with "seq" and either "changes" or, when a resync is
+        needed, the full "positions" and "balances"
+    """
+    try:
+        config = get_config()
+    except ConfigError as e:
+        return json.dumps({"error": str(e)})
+
+    async def _changes():
+        watcher = get_position_watcher(config)
+        if not watcher.running:
+            await watcher.start()
+        return await watcher.wait_for_changes(since, wait_seconds)
+
+    return json.dumps(run_sync(_changes()), indent=2)
@@ -1,12 +1,40 @@
 """
 Trading-related tools for Lighter Exchange.
 
-Provides 4 tools for trade history and market data.
+Provides 9 tools for trade history and market data.
 """
 
+import asyncio
 import json
-from typing import Optional, Literal
-from lighter_agno.client import get_client
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Literal, Optional
+
+import numpy as np
+
+from lighter_agno.client import LighterClient, get_client
+from lighter_agno.constants import CANDLES_PER_REQUEST
+from lighter_agno.data import (
+    BackfillOrchestrator,
+    candles_to_dicts,
+    get_bar_aggregator,
+    get_funding_store,
+    get_indicator_engine,
+    get_resampled_candles,
+    get_trade_tape,
+    resolution_seconds,
+)
+from lighter_agno.market_cache import get_market_cache
+
+
+def _perp_markets(client) -> Dict[int, Dict[str, Any]]:
+    """Metadata of all perp markets, from the shared market cache."""
+    return {
+        market_id: market
+        for market_id, market in get_market_cache(client.base_url).get_markets().items()
+        if market.get("market_type", "perp") == "perp"
+    }
 
 
 def get_trades(
@@ -59,12 +87,101 @@ def get_recent_trades(
         "market_id": market_id,
         "limit": limit,
     })
+    get_trade_tape(market_id).add_trades(result.get("trades") or [])
     return json.dumps(result, indent=2)
 
 
+def get_trade_stats(
+    market_id: int,
+    window_seconds: int = 300,
+    start_timestamp: Optional[int] = None,
+    end_timestamp: Optional[int] = None,
+    refresh: bool = True,
+    authorization: Optional[str] = None
+) -> str:
+    """Get VWAP, volume and trade counts for a market over a time window.
+
+    Computed from the local trade tape, which keeps the market's most recent
+    trades in memory. With refresh, one /recentTrades poll first appends any
+    new trades (the tape deduplicates by trade ID).
+
+    Args:
+        market_id: Market ID
+        window_seconds: Window length ending at end_timestamp (ignored if start_timestamp is set)
+        start_timestamp: Window start in milliseconds
+        end_timestamp: Window end in milliseconds (default: now)
+        refresh: Poll recent trades before computing
+
+    Returns:
+        JSON string with trades, buys, sells, volume, buy/sell volume,
+        notional, vwap, first/last/high/low price, whether the tape covers
+        the whole window, and the gaps between polls that may miss trades
+    """
+    tape = get_trade_tape(market_id)
+    if refresh:
+        tape.poll(get_client(authorization))
+    if end_timestamp is None:
+        end_timestamp = int(time.time() * 1000)
+    if start_timestamp is None:
+        start_timestamp = end_timestamp - window_seconds * 1000
+
+    result = tape.stats(start_timestamp, end_timestamp)
+    result["tape_size"] = len(tape)
+    result["complete"] = tape.covers(start_timestamp, end_timestamp)
+    result["gaps"] = tape.gaps(start_timestamp, end_timestamp)
+    return json.dumps(result, indent=2)
+
+
+def get_bars(
+    market_id: int,
+    bar_type: str = "10s",
+    limit: int = 100,
+    refresh: bool = True,
+    authorization: Optional[str] = None
+) -> str:
+    """Get sub-minute time bars, volume bars or notional bars built from trades.
+
+    Bars are aggregated locally from the market's trade tape, so they need
+    no extra endpoint. An aggregator starts with the trades already on the
+    tape and then follows every new one.
+
+    Bar types:
+    - '1s', '10s', '30s', '1m': Time bars
+    - 'volume:5': A bar every 5 base units traded
+    - 'notional:100000': A bar every 100,000 quote traded
+
+    Args:
+        market_id: Market ID
+        bar_type: Bar spec (see above)
+        limit: Number of finished bars to return (newest last)
+        refresh: Poll recent trades before returning
+
+    Returns:
+        JSON string with finished bars, the bar currently being built, and
+        the gaps between polls that may leave bars short of trades
+    """
+    aggregator = get_bar_aggregator(market_id, bar_type)
+    tape = get_trade_tape(market_id)
+    if refresh:
+        tape.poll(get_client(authorization))
+    now = int(time.time() * 1000)
+    aggregator.flush(now)
+    bars = aggregator.bars(limit)
+    # Bars spanning a hole between polls are built from only part of the trades
+    gaps = tape.gaps(bars[0]["start"], now) if bars else []
+    return json.dumps({
+        "market_id": market_id,
+        "bar_type": bar_type,
+        "bars": bars,
+        "open_bar": aggregator.open_bar(),
+        "complete": not gaps,
+        "gaps": gaps,
+    }, indent=2)
+
+
 def get_candlesticks(
     market_id: int,
-    resolution: Literal["1m", "5m", "15m", "1h", "4h", "1d"],
+    resolution: str,
     start_timestamp: Optional[int] = None,
     end_timestamp: Optional[int] = None,
     count_back: Optional[int] = None,
@@ -76,26 +193,99 @@ def get_candlesticks(
     - 1m, 5m, 15m: Intraday analysis
     - 1h, 4h: Swing trading
     - 1d: Daily charts
+    - Any multiple of these, e.g. 2h, 3d or 1w (resampled locally)
 
     Args:
         market_id: Market ID
-        resolution: Candlestick time resolution (1m, 5m, 15m, 1h, 4h, 1d)
+        resolution: Candlestick time resolution (e.g. 1m, 15m, 1h, 2h, 1d, 3d, 1w)
         start_timestamp: Start timestamp in milliseconds
         end_timestamp: End timestamp in milliseconds
-        count_back: Number of candles to return
+        count_back: Number of candles to return (default 500, newest last)
+
+    Candles are served from the local candle store; only ranges it does not
+    cover yet are fetched from the exchange.
 
     Returns:
-        JSON string with candlestick data
+        JSON string with candlesticks (timestamp, open, high, low, close,
+        volume0, volume1, last_trade_id)
     """
-    client = get_client(authorization)
-    result = client.get("/candlestick", {
+    step_ms = resolution_seconds(resolution) * 1000
+    if end_timestamp is None:
+        end_timestamp = int(time.time() * 1000)
+    if start_timestamp is None:
+        start_timestamp = end_timestamp - (count_back or CANDLES_PER_REQUEST) * step_ms
+
+    columns = get_resampled_candles(
+        get_client(authorization), market_id, resolution, start_timestamp, end_timestamp
+    )
+    # Same shape and field names as the /candlesticks response this tool used to pass through
+    candles = candles_to_dicts(columns, legacy=True)
+    if count_back:
+        candles = candles[-count_back:]
+    return json.dumps({
+        "code": 200,
+        "resolution": resolution,
+        "candlesticks": candles,
+    }, indent=2)
+
+
+def _compact(values: np.ndarray, history: int) -> Any:
+    """Last `history` values rounded for output (a scalar when history is 1)."""
+    tail = [None if math.isnan(x) else round(x, 6) for x in values[-history:].tolist()]
+    return tail[-1] if history == 1 else tail
+
+
+def get_indicators(
+    market_id: int,
+    resolution: str,
+    indicators: Optional[List[str]] = None,
+    history: int = 1,
+    lookback: int = 500,
+    authorization: Optional[str] = None
+) -> str:
+    """Compute technical indicators from stored candles.
+
+    Use this instead of computing indicators from raw candlestick data.
+    Indicators are written as name[:params]:
+    - sma:20, ema:50: Simple / exponential moving average of the close
+    - rsi:14: Wilder RSI (0-100)
+    - atr:14: Wilder average true range
+    - bb:20:2: Bollinger bands (period, standard deviations)
+    - vwap:20: Rolling VWAP over 20 bars
+    - vol:20: Annualized volatility of log returns over 20 bars
+
+    Args:
+        market_id: Market ID
+        resolution: Candle resolution (e.g. 1m, 15m, 1h, 4h, 1d, or multiples like 2h)
+        indicators: Indicator specs (default: sma:20, ema:20, rsi:14, atr:14, bb:20:2)
+        history: Number of most recent values to return per indicator
+        lookback: Candles loaded for the computation (must exceed the longest period)
+
+    Returns:
+        JSON string with the latest close and each indicator's latest value(s)
+    """
+    specs = indicators or ["sma:20", "ema:20", "rsi:14", "atr:14", "bb:20:2"]
+    step_ms = resolution_seconds(resolution) * 1000
+    now = int(time.time() * 1000)
+    columns = get_resampled_candles(
+        get_client(authorization), market_id, resolution, now - lookback * step_ms, now
+    )
+    if not len(columns["t"]):
+        return json.dumps({"market_id": market_id, "resolution": resolution, "error": "No candles"})
+
+    results = get_indicator_engine(market_id, resolution, step_ms).compute(columns, specs, now)
+    return json.dumps({
         "market_id": market_id,
         "resolution": resolution,
-        "start_timestamp": start_timestamp,
-        "end_timestamp": end_timestamp,
-        "count_back": count_back,
-    })
-    return json.dumps(result, indent=2)
+        "timestamp": int(columns["t"][-1]),
+        "close": float(columns["c"][-1]),
+        "candles": len(columns["t"]),
+        "indicators": {
+            spec: {k: _compact(v, history) for k, v in value.items()}
+            if isinstance(value, dict) else _compact(value, history)
+            for spec, value in results.items()
+        },
+    }, indent=2)
 
 
 def get_funding_rates(
@@ -123,3 +313,121 @@ def get_funding_rates(
         "limit": limit,
     })
     return json.dumps(result, indent=2)
+
+
+def scan_funding(
+    lookback_hours: int = 168,
+    sort_by: Literal["current", "average", "annualized", "cumulative"] = "annualized",
+    ascending: bool = False,
+    limit: Optional[int] = 20,
+    refresh: bool = True,
+    authorization: Optional[str] = None
+) -> str:
+    """Rank all perp markets by funding rate.
+
+    Funding history is kept in a local store. With refresh, every market is
+    brought up to date concurrently (a new market gets 30 days of history,
+    known markets only the hours since their last funding), then all markets
+    are scanned in one vectorized pass. Rates are signed: positive means
+    longs pay shorts.
+
+    Args:
+        lookback_hours: Window for average and cumulative funding
+        sort_by: Column to rank by (current, average, annualized, cumulative)
+        ascending: Rank lowest first (e.g. most negative funding)
+        limit: Number of markets to return (None for all)
+        refresh: Fetch new funding before scanning
+
+    Returns:
+        JSON string with a ranked table of market_id, symbol, samples,
+        current, average, annualized and cumulative funding
+    """
+    client = get_client(authorization)
+    markets = _perp_markets(client)
+    store = get_funding_store()
+    errors = {}
+    if refresh:
+        updated = store.update_all(client, list(markets))
+        errors = {m: e for m, e in updated.items() if isinstance(e, str)}
+
+    since = int(time.time() * 1000) - lookback_hours * 3_600_000
+    scan = store.scan(list(markets), since)
+    order = np.argsort(scan[sort_by], kind="stable")
+    if not ascending:
+        order = order[::-1]
+    if limit is not None:
+        order = order[:limit]
+
+    table = [
+        {
+            "rank": rank,
+            "market_id": int(scan["market_id"][i]),
+            "symbol": markets[int(scan["market_id"][i])].get("symbol"),
+            "samples": int(scan["samples"][i]),
+            "current": float(scan["current"][i]),
+            "average": float(scan["average"][i]),
+            "annualized": float(scan["annualized"][i]),
+            "cumulative": float(scan["cumulative"][i]),
+            "last_timestamp": int(scan["last_timestamp"][i]),
+        }
+        for rank, i in enumerate(order, 1)
+    ]
+    return json.dumps({
+        "lookback_hours": lookback_hours,
+        "sort_by": sort_by,
+        "markets_scanned": len(scan["market_id"]),
+        "funding": table,
+        "errors": errors,
+    }, indent=2)
+
+
+def backfill_history(
+    market_ids: Optional[List[int]] = None,
+    days: float = 30,
+    datasets: Optional[List[Literal["candles", "funding", "trades"]]] = None,
+    resolutions: Optional[List[str]] = None,
+    authorization: Optional[str] = None
+) -> str:
+    """Load market history into the local data stores.
+
+    Plans request-sized chunks for every market and dataset and fetches them
+    concurrently under a shared rate limit. Progress is checkpointed, so a
+    repeated or interrupted backfill only fetches what is still missing.
+
+    Args:
+        market_ids: Markets to backfill (default: all perp markets)
+        days: How far back to load
+        datasets: Any of candles, funding, trades (default: candles and funding)
+        resolutions: Candle resolutions, e.g. ['1m', '1h'] (default: ['1m'])
+
+    Returns:
+        JSON string with tasks completed/failed, requests, rows, elapsed time
+        and throughput, overall and per dataset
+    """
+    client = get_client(authorization)
+    if market_ids is None:
+        market_ids = list(_perp_markets(client))
+    end = int(time.time() * 1000)
+    # A client of its own: its connection pool belongs to the worker thread's
+    # event loop and is closed with it, instead of staying cached on the shared client
+    backfill_client = LighterClient(
+        client.base_url, client.explorer_url, client.authorization, client.timeout
+    )
+    orchestrator = BackfillOrchestrator(backfill_client)
+
+    async def _backfill() -> Dict[str, Any]:
+        try:
+            return await orchestrator.backfill(
+                market_ids,
+                end - int(days * 86_400_000),
+                end,
+                datasets or ["candles", "funding"],
+                resolutions or ["1m"],
+            )
+        finally:
+            await backfill_client.aclose()
+
+    # Own event loop in a worker thread, so this also works when called from a running loop
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        report = pool.submit(asyncio.run, _backfill()).result()
+    return json.dumps({"markets": len(market_ids), **report}, indent=2)
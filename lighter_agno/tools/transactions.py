@@ -5,8 +5,111 @@ Provides 3 tools for transaction signing and submission.
 """
 
 import json
-from typing import Optional, List
-from lighter_agno.client import get_client
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, List
+
+import httpx
+
+from lighter_agno.client import LighterApiError, LighterClient, get_client
+from lighter_agno.constants import MAX_TX_BATCH_SIZE, TX_BATCH_IN_FLIGHT, TX_SUBMIT_TIMEOUT
+from lighter_agno.submission import JournaledResponse, submit_once_sync
+
+
+def _send(authorization, endpoint: str, body: dict, payloads, tx_hashes) -> Dict[str, Any]:
+    """
+    Submit through the idempotent journal and return the exchange response.
+
+    The send uses a short timeout; on timeout the exchange is asked for the
+    tx hashes before the same signed payload is sent again.
+    """
+    client = get_client(authorization)
+    sender = LighterClient(
+        base_url=client.base_url, authorization=client.authorization, timeout=TX_SUBMIT_TIMEOUT
+    )
+
+    def lookup(tx_hash: str) -> bool:
+        try:
+            client.get("/tx", {"by": "hash", "value": tx_hash})
+        except (LighterApiError, httpx.HTTPError):
+            return False
+        return True
+
+    try:
+        result = submit_once_sync(
+            payloads, tx_hashes or [],
+            lambda: sender.post(endpoint, body),
+            lookup,
+            (httpx.TimeoutException,),
+        )
+    except TimeoutError as e:
+        return {"error": str(e), "status": "unknown"}
+    if isinstance(result, JournaledResponse):
+        result = result.to_dict()
+    return result
+
+
+def _api_key_of(tx: str) -> Optional[int]:
+    """API key index a signed transaction's nonce belongs to, if it can be read."""
+    try:
+        info = json.loads(tx)
+    except ValueError:
+        return None
+    return info.get("ApiKeyIndex") if isinstance(info, dict) else None
+
+
+def _send_chunked(authorization, txs: List[str], tx_hashes: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Send a large batch as /sendTxBatch chunks, pipelined across API keys.
+
+    Transactions are grouped by API key (input order kept within a key) and
+    each key's chunks are sent one after another, so its nonces arrive in
+    order; different keys are sent concurrently. Once a chunk fails, the
+    rest of that key's chunks are skipped, as their nonces could no longer
+    be accepted.
+    """
+    lanes: Dict[Optional[int], List[int]] = {}
+    for index, tx in enumerate(txs):
+        lanes.setdefault(_api_key_of(tx), []).append(index)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(txs)
+    responses: List[Dict[str, Any]] = []
+
+    def run_lane(api_key: Optional[int], indices: List[int]) -> None:
+        error = None
+        for start in range(0, len(indices), MAX_TX_BATCH_SIZE):
+            chunk = indices[start:start + MAX_TX_BATCH_SIZE]
+            if error is not None:
+                error = f"skipped: an earlier chunk for API key {api_key} failed"
+            else:
+                chunk_txs = [txs[i] for i in chunk]
+                chunk_hashes = [tx_hashes[i] for i in chunk] if tx_hashes else []
+                try:
+                    response = _send(
+                        authorization, "/sendTxBatch", {"txs": chunk_txs}, chunk_txs, chunk_hashes
+                    )
+                except LighterApiError as e:
+                    response = {"error": str(e)}
+                responses.append({"api_key_index": api_key, "transactions": len(chunk), **response})
+                if "error" in response:
+                    error = response["error"]
+                elif response.get("code", 200) != 200:
+                    error = response.get("message") or f"code {response['code']}"
+            for i in chunk:
+                results[i] = {"index": i, "success": error is None}
+                if error is not None:
+                    results[i]["error"] = error
+
+    with ThreadPoolExecutor(max_workers=min(TX_BATCH_IN_FLIGHT, len(lanes))) as pool:
+        for future in [pool.submit(run_lane, key, indices) for key, indices in lanes.items()]:
+            future.result()
+
+    return {
+        "success": all(r["success"] for r in results),
+        "transactions": len(txs),
+        "chunks": len(responses),
+        "responses": responses,
+        "results": results,
+    }
 
 
 def get_next_nonce(
@@ -41,7 +144,8 @@ def get_next_nonce(
 
 def send_transaction(
     tx: str,
-    authorization: Optional[str] = None
+    authorization: Optional[str] = None,
+    tx_hash: Optional[str] = None
 ) -> str:
     """Send a signed transaction to the Lighter exchange.
 
@@ -52,35 +156,47 @@ def send_transaction(
     - Cancel all orders
 
     The transaction must be pre-signed using the Lighter SDK's SignerClient.
+    Submission is idempotent: sending the same signed transaction again
+    returns the recorded outcome instead of resubmitting, and if the send
+    times out, the exchange is checked for tx_hash before anything is resent.
 
     Args:
         tx: Signed transaction data (hex encoded)
+        tx_hash: Hash returned when signing, used to reconcile timeouts
 
     Returns:
         JSON string with transaction result
     """
-    client = get_client(authorization)
-    result = client.post("/sendTx", {"tx": tx})
+    result = _send(authorization, "/sendTx", {"tx": tx}, [tx], [tx_hash] if tx_hash else [])
     return json.dumps(result, indent=2)
 
 
 def send_transaction_batch(
     txs: List[str],
-    authorization: Optional[str] = None
+    authorization: Optional[str] = None,
+    tx_hashes: Optional[List[str]] = None
 ) -> str:
     """Send multiple signed transactions in a single batch.
 
-    All transactions are processed atomically. Useful for:
+    Transactions in one request are processed atomically. Useful for:
     - Submitting multiple orders at once
     - Replacing orders (cancel + create)
     - Complex trading strategies
 
+    Like send_transaction, a batch is submitted at most once and a timeout
+    is reconciled against the exchange before any resend. Lists longer than
+    the exchange's 50-transaction limit are split into chunks that keep
+    each API key's nonce order and run concurrently across keys; results
+    then come back per transaction, in input order.
+
     Args:
         txs: Array of signed transaction data (hex encoded)
+        tx_hashes: Hashes returned when signing, used to reconcile timeouts
 
     Returns:
         JSON string with batch transaction results
     """
-    client = get_client(authorization)
-    result = client.post("/sendTxBatch", {"txs": txs})
+    if len(txs) > MAX_TX_BATCH_SIZE:
+        return json.dumps(_send_chunked(authorization, txs, tx_hashes), indent=2)
+    result = _send(authorization, "/sendTxBatch", {"txs": txs}, txs, tx_hashes)
     return json.dumps(result, indent=2)
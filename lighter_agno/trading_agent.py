@@ -46,8 +46,13 @@ from lighter_agno.tools.orders import (
 from lighter_agno.tools.trading import (
     get_trades,
     get_recent_trades,
+    get_trade_stats,
+    get_bars,
     get_candlesticks,
+    get_indicators,
     get_funding_rates,
+    scan_funding,
+    backfill_history,
 )
 from lighter_agno.tools.transactions import (
     get_next_nonce,
@@ -73,7 +78,7 @@ from lighter_agno.tools.info import (
 )
 
 
-# All 40 tools
+# All 45 tools
 ALL_LIGHTER_TOOLS = [
     # Market tools (6)
     get_markets,
@@ -100,11 +105,16 @@ ALL_LIGHTER_TOOLS = [
     get_account_inactive_orders,
     get_orderbook_orders,
     export_orders,
-    # Trading tools (4)
+    # Trading tools (9)
     get_trades,
     get_recent_trades,
+    get_trade_stats,
+    get_bars,
     get_candlesticks,
+    get_indicators,
     get_funding_rates,
+    scan_funding,
+    backfill_history,
     # Transaction tools (3)
     get_next_nonce,
     send_transaction,
@@ -129,7 +139,7 @@ ALL_LIGHTER_TOOLS = [
 # Agent instructions
 INSTRUCTIONS = """You are a trading assistant for Lighter Exchange (zkSync).
 
-You have 40 tools to interact with Lighter Exchange:
+You have 45 tools to interact with Lighter Exchange:
 
 MARKET DATA:
 - get_markets: List all markets
@@ -146,6 +156,11 @@ ACCOUNT:
 TRADING:
 - get_trades: Get trade history
 - get_recent_trades: Get recent trades for a market
+- get_trade_stats: VWAP, volume and trade counts over a time window
+- get_bars: Sub-minute, volume or notional bars built from trades
+- get_indicators: SMA/EMA/RSI/ATR/Bollinger/VWAP/volatility computed locally; prefer to raw candles
+- scan_funding: Rank all perps by current, average, annualized or cumulative funding
+- backfill_history: Load candle, funding and trade history into the local stores
 
 When user asks about prices, markets, or trading - call the appropriate tools.
 Market IDs: 0=BTC-PERP, 1=ETH-PERP, etc. Use get_markets to see all.